@@ -11,14 +11,22 @@ Modules
 -------
 archivist
     Locale and weight mappings, filename generation, metadata updates, and character subset management.
+dispatch
+    Task-graph execution that starts each task on a shared process pool as soon as the inputs of the task exist.
 foundry
     Font compilation from Glyphs source files using fontmake [3] and PostScript CIDFont source files using AFDKO makeotf [4].
 go
     Assembly line orchestration and entry point.
+logbook
+    Tracing spans and profiles from every assembly-line process, combined into one trace file and one profile report.
 logistics
     File staging, asset packaging, and workbench management.
 machineShop
     Font scaling, subsetting, side bearing adjustment, and glyph merging.
+stockroom
+    Content-addressed build cache that lets assembly-line stages reuse artifacts from earlier runs.
+timekeeper
+    Benchmarks that compare implementations of assembly-line stages.
 mergeFonts
     Parallel font merging workflow combining the compiled fonts.
 
@@ -26,6 +34,8 @@ Types
 -----
 LocaleIn
     Locale identifier mapping between ASCII and Unicode representations.
+TaskIn
+    One task of a task graph with the tasks it depends on.
 WeightIn
     Weight identifier mapping across font families.
 
@@ -48,11 +58,11 @@ References
     https://adobe-type-tools.github.io/afdko/
 
 """
-from Integrated_Code_Fire._theTypes import LocaleIn as LocaleIn, WeightIn as WeightIn
+from Integrated_Code_Fire._theTypes import LocaleIn as LocaleIn, TaskIn as TaskIn, WeightIn as WeightIn
 
 # isort: split
 from Integrated_Code_Fire._theSSOT import (
-	incrementHARDCODED as incrementHARDCODED, PackageSettings as PackageSettings,
+	cacheBytesMaximumDEFAULT as cacheBytesMaximumDEFAULT, incrementHARDCODED as incrementHARDCODED, PackageSettings as PackageSettings,
 	pathFilenameFiraCodeGlyphsDEFAULT as pathFilenameFiraCodeGlyphsDEFAULT, pathRootSourceHanMonoDEFAULT as pathRootSourceHanMonoDEFAULT,
 	settingsPackage as settingsPackage, subsetOptionsDEFAULT as subsetOptionsDEFAULT,
 	widthHalfSourceHanMonoHARDCODED as widthHalfSourceHanMonoHARDCODED)
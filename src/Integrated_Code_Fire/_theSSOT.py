@@ -11,6 +11,8 @@ fontVersionHARDCODED: float = 0.014
 
 widthHalfSourceHanMonoHARDCODED: int = 667
 
+cacheBytesMaximumHARDCODED: int = 16 * 2**30
+
 subsetOptionsHARDCODED: subset.Options = subset.Options(
 	drop_tables = ['vhea', 'vmtx', 'VORG', 'vert', 'vrt2'],
 	glyph_names = False,
@@ -73,8 +75,16 @@ class PackageSettings(humpy_PackageSettings):
 		Root directory of the workspace, computed in `__post_init__`.
 	pathAssets : Path
 		Directory for output assets, computed in `__post_init__`.
+	pathCache : Path
+		Directory for the content-addressed build cache, computed in `__post_init__`.
+	pathHistory : Path
+		Directory for measurements of earlier runs that guide scheduling, computed in `__post_init__`.
+	pathTrace : Path
+		Directory for tracing spans and exported trace files, computed in `__post_init__`.
 	pathWarehouse : Path
 		Directory for persistent intermediate fonts, computed in `__post_init__`.
+	pathWOFF2 : Path
+		Directory for WOFF2 web fonts, which assembly line cleanup keeps, computed in `__post_init__`.
 	pathWorkbench : Path
 		Directory for intermediate assembly line artifacts, computed in `__post_init__`.
 	pathWorkbenchFonts : Path
@@ -102,7 +112,11 @@ class PackageSettings(humpy_PackageSettings):
 
 	pathRoot: Path = dataclasses.field(init=False)
 	pathAssets: Path = dataclasses.field(init=False)
+	pathCache: Path = dataclasses.field(init=False)
+	pathHistory: Path = dataclasses.field(init=False)
+	pathTrace: Path = dataclasses.field(init=False)
 	pathWarehouse: Path = dataclasses.field(init=False)
+	pathWOFF2: Path = dataclasses.field(init=False)
 	pathWorkbench: Path = dataclasses.field(init=False)
 	pathWorkbenchFonts: Path = dataclasses.field(init=False)
 
@@ -112,6 +126,10 @@ class PackageSettings(humpy_PackageSettings):
 		self.pathRoot = self.pathPackage.parent.parent
 		self.pathAssets = self.pathRoot / 'assets'
 		self.pathWarehouse = self.pathRoot / 'warehouse'
+		self.pathCache = self.pathWarehouse / 'cache'
+		self.pathHistory = self.pathWarehouse / 'history'
+		self.pathTrace = self.pathWarehouse / 'trace'
+		self.pathWOFF2 = self.pathWarehouse / 'woff2'
 		self.pathWorkbench = self.pathRoot / 'workbench'
 		self.pathWorkbenchFonts = self.pathWorkbench / 'fonts'
 
@@ -140,6 +158,23 @@ pathRootSourceHanMonoDEFAULT: Path = pathRootRepositories / "source-han-mono"
 
 subsetOptionsDEFAULT: subset.Options = subsetOptionsHARDCODED
 
+cacheBytesMaximumDEFAULT: int = cacheBytesMaximumHARDCODED
+"""Provide the size limit, in bytes, of the content-addressed build cache in `settingsPackage.pathCache`.
+
+(AI generated docstring)
+
+The artifacts and the SQLite records in the build cache both count toward `cacheBytesMaximumDEFAULT`. When they exceed the
+limit, `storekeeperStoresArtifact` [1] and `storekeeperStoresRecords` [2] remove the least recently used artifacts and groups of
+records, where each group holds the records that one call read or wrote, until the build cache fits.
+
+References
+----------
+[1] Integrated_Code_Fire.stockroom.storekeeperStoresArtifact
+	Internal package reference.
+[2] Integrated_Code_Fire.stockroom.storekeeperStoresRecords
+	Internal package reference.
+"""
+
 incrementHARDCODED: int = (settingsPackage.width - settingsPackage.unitsPerEm) // 2
 """Provide the per-side width increment used when widening Source Han Mono glyphs.
 
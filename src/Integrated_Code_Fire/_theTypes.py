@@ -1,4 +1,5 @@
-from typing import NamedTuple
+from collections.abc import Callable, Hashable
+from typing import Any, NamedTuple
 
 class LocaleIn(NamedTuple):
 	"""Store equivalent locale identifiers across naming systems.
@@ -72,3 +73,38 @@ class WeightIn(NamedTuple):
 	fontFamilyWestern: str
 	IntegratedCode火: str
 	SourceHanMono: str
+
+class TaskIn(NamedTuple):
+	"""Store one task of a task graph and the tasks that must finish before the task can start.
+
+	You can use this type to describe one unit of assembly-line work, such as compiling, subsetting, or merging one font, for
+	`dispatcherRunsTaskGraph`. The dispatcher calls `function(*arguments)` in a worker process after every task in `dependencies`
+	finishes. Put keyword arguments in `function` with `functools.partial`.
+
+	Parameters
+	----------
+	function : Callable[..., Any]
+		Module-level function, which a process pool can pickle by reference.
+	arguments : tuple[Any, ...] = ()
+		Positional arguments of `function`.
+	dependencies : frozenset[Hashable] = frozenset()
+		Keys of the tasks that must finish before the task can start.
+	priority : int = 0
+		Preference among tasks that can start at the same time. The dispatcher starts tasks with a larger `priority` first.
+
+	Attributes
+	----------
+	function : Callable[..., Any]
+		Module-level function, which a process pool can pickle by reference.
+	arguments : tuple[Any, ...]
+		Positional arguments of `function`.
+	dependencies : frozenset[Hashable]
+		Keys of the tasks that must finish before the task can start.
+	priority : int
+		Preference among tasks that can start at the same time. The dispatcher starts tasks with a larger `priority` first.
+
+	"""
+	function: Callable[..., Any]
+	arguments: tuple[Any, ...] = ()
+	dependencies: frozenset[Hashable] = frozenset()
+	priority: int = 0
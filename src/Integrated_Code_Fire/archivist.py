@@ -5,17 +5,19 @@
 You can use this module to access locale and weight identifier mappings, generate standardized filename stems, create
 OpenType `TTFont` [1] name record metadata, load character subset definitions, and update font file metadata. The module
 provides the core configuration and metadata management functions used throughout the Integrated Code 火 assembly line,
-using utilities from `hunterMakesPy` [2] and `glyphsLib` [3].
+using utilities from `hunterMakesPy` [2].
 
 Contents
 --------
 Functions
+	archivistCompilesSubsetCharacters
+		Compile the character subset files of a CID font family into one binary file of run-length encoded tables.
 	archivistGetsGlyphsUnicode
 		Get Unicode codepoints present in a Glyphs source file.
 	archivistGetsLocales
 		Get mapping from locale identifiers to `LocaleIn` instances.
 	archivistGetsSubsetCharacters
-		Load character subset definitions from metadata files for all locale and style combinations.
+		Load character subset definitions from the compiled subset file for all locale and style combinations.
 	archivistGetsWeights
 		Get mapping from weight identifiers to `WeightIn` instances.
 	archivistMakesAllCharacterSubsets
@@ -47,32 +49,52 @@ References
 	https://fonttools.readthedocs.io/en/latest/ttLib/ttFont.html
 [2] hunterMakesPy
 	https://context7.com/hunterhogan/huntermakespy
-[3] glyphsLib
-	https://github.com/googlefonts/glyphsLib
 
 """
 from fontTools import subset
+from fontTools.misc.fixedTools import floatToFixed
 from fontTools.ttLib import TTFont
-from humpy_cytoolz.dicttoolz import keyfilter, keymap, valfilter
-from humpy_cytoolz.functoolz import complement, compose, curry as syntacticCurry
+from humpy_cytoolz.functoolz import curry as syntacticCurry
 from hunterMakesPy import Ordinals
 from hunterMakesPy.filesystemToolkit import writeStringToHere
+from hunterMakesPy.parseParameters import defineConcurrencyLimit
 from hunterMakesPy.semiotics import ansiColorReset, AnsiColors
 from Integrated_Code_Fire import (
 	LocaleIn, PackageSettings, pathFilenameFiraCodeGlyphsDEFAULT, pathRootSourceHanMonoDEFAULT, settingsPackage, WeightIn)
-from itertools import filterfalse, product as CartesianProduct
+from Integrated_Code_Fire.machineShop import machinistReplacesTables
+from Integrated_Code_Fire.stockroom import storekeeperMakesKey, storekeeperRetrievesArtifact, storekeeperStoresArtifact
+from array import array
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import cache
+from itertools import product as CartesianProduct
 from pathlib import Path
 from typing import Literal, TYPE_CHECKING
-import glyphsLib
+import hashlib
+import json
+import os
+import re as regex
+import struct
 import sys
 
 if TYPE_CHECKING:
-	from collections.abc import Container, Iterable, Iterator
+	from collections.abc import Collection, Iterable
+	from hashlib import _Hash
+	from numpy.typing import NDArray
+	import numpy
 	from hunterMakesPy import identifierDotAttribute
 	from pathlib import Path
 
 ansiColors = AnsiColors()
 
+_patternFormatVersion: regex.Pattern[str] = regex.compile(r'^\.formatVersion = (\d+);$', regex.MULTILINE)
+"""I use this to find the format version of a Glyphs source file, which has the key only from format version 3."""
+
+_patternUnicode: regex.Pattern[str] = regex.compile(r'^unicode = (\([^)]*\)|"[^"]*"|[^;]*);$', regex.MULTILINE)
+"""I use this to find the value of each `unicode` key of a Glyphs source file, which writes every key at the start of a line."""
+
+_signatureSubsets: bytes = b'ICFsub\x00\x02'
+"""I use this signature, with the format version in the last byte, to recognize a compiled subset file."""
+
 #======== Boolean antecedents ================================================
 
 @syntacticCurry
@@ -283,8 +305,12 @@ def archivistUpdatesFontFileMetadata(pathFilename: Path, nameIDmetadata: dict[in
 
 	(AI generated docstring)
 
-	You can update OpenType name records and other metadata in a font file. The function opens the font file,
-	calls `archivistUpdatesMetadata` [1], saves the updated font, and returns the original path.
+	You can update the same metadata as `archivistUpdatesMetadata` [1] in a font file without compiling the font again. The
+	function decompiles only the `name` table, sets each name record in `nameIDmetadata`, writes `settingsPackage.fontVersion` [2]
+	into the `fontRevision` field of the raw `head` table and `settingsPackage.achVendID` into the `achVendID` field of the raw
+	`OS/2` table, and replaces the three tables with `machinistReplacesTables` [3]. The bytes of every other table do not change,
+	and the function does not change `head.modified`. Updating the metadata is idempotent, so a version bump does not need a new
+	merge: `goUpdatesMetadata` [4] updates every merged font in the workbench.
 
 	Parameters
 	----------
@@ -301,14 +327,26 @@ def archivistUpdatesFontFileMetadata(pathFilename: Path, nameIDmetadata: dict[in
 	References
 	----------
 	[1] Integrated_Code_Fire.archivist.archivistUpdatesMetadata
-	[2] fontTools.ttLib.TTFont
-		https://fonttools.readthedocs.io/en/latest/ttLib/ttFont.html
+		Internal package reference.
+	[2] Integrated_Code_Fire.settingsPackage
+		Internal package reference.
+	[3] Integrated_Code_Fire.machineShop.machinistReplacesTables
+		Internal package reference.
+	[4] Integrated_Code_Fire.go.goUpdatesMetadata
+		Internal package reference.
 
 	"""
-	with TTFont(pathFilename) as ttFont:
-		archivistUpdatesMetadata(ttFont, nameIDmetadata)
-		ttFont.save(pathFilename)
-	return pathFilename
+	with TTFont(pathFilename, lazy=True) as ttFont:
+		tableName = ttFont['name']
+		for nameID in nameIDmetadata:
+			tableName.setName(nameIDmetadata[nameID], nameID, name['platformID'], name['platEncID'], name['langID'])
+		dataName: bytes = tableName.compile(ttFont)
+		dataHead = bytearray(ttFont.reader['head'])
+		dataOS2 = bytearray(ttFont.reader['OS/2'])
+
+	struct.pack_into('>l', dataHead, 4, floatToFixed(settingsPackage.fontVersion, 16))
+	dataOS2[58:62] = settingsPackage.achVendID.encode('ascii').ljust(4, b' ')[:4]
+	return machinistReplacesTables(pathFilename, {'name': dataName, 'head': bytes(dataHead), 'OS/2': bytes(dataOS2)})
 
 def archivistUpdatesMetadata(ttFont: TTFont, nameIDmetadata: dict[int, str]) -> None:
 	"""Update OpenType metadata in an open `TTFont` instance.
@@ -410,15 +448,19 @@ def Z0Z_make_afdkoOptions(pathRoot: Path, fontFamilyCID: str = 'SourceHanMono',
 
 #======== Rarely Used Functions ========
 
-def archivistGetsSubsetCharacters(fontFamilyCID: str = 'SourceHanMono', theLocales: Iterable[str] | None = None, theStyles: Iterable[str | None] | None = None) -> dict[identifierDotAttribute, dict[str, list[int]]]:
-	# TODO At the very least, store this data in Python structures.
-	"""Load character subset definitions from metadata files for all locale and style combinations.
+def archivistGetsSubsetCharacters(fontFamilyCID: str = 'SourceHanMono', theLocales: Iterable[str] | None = None, theStyles: Iterable[str | None] | None = None) -> dict[identifierDotAttribute, dict[str, tuple[range, ...]]]:
+	"""Load character subset definitions from the compiled subset file for all locale and style combinations.
 
 	(AI generated docstring)
 
-	You can load glyph IDs and Unicode codepoints for each `fontFamilyCID` locale and style combination. The
-	function reads `.gids` and `.unicodes` files from the metadata directory and returns a nested mapping from filename stem to
-	format identifier to character identifier list.
+	You can load glyph IDs and Unicode codepoints for each `fontFamilyCID` locale and style combination. The function reads the
+	compiled subset file that `archivistCompilesSubsetCharacters` [3] writes in the `dataCenter` directory, which holds every
+	table as a few runs of consecutive identifiers, and returns a nested mapping from filename stem to format identifier to the
+	runs of the table as `range` [4] objects. If the compiled subset file does not exist, the function first compiles it from the
+	`.gids` and `.unicodes` files. Each process reads the compiled subset file only one time, so a worker process can call the
+	function for each task instead of receiving tens of thousands of identifiers with each task. The function never expands the
+	runs into tens of thousands of integers; `Subsetter.populate` [1] accepts any iterable, so a caller can pass
+	`itertools.chain.from_iterable(runs)` [5] and the subsetter expands each run directly into its own set.
 
 	Parameters
 	----------
@@ -431,41 +473,121 @@ def archivistGetsSubsetCharacters(fontFamilyCID: str = 'SourceHanMono', theLocal
 
 	Returns
 	-------
-	subsetCharacters : dict[identifierDotAttribute, dict[str, list[int]]]
-		Nested mapping from filename stem to format identifier to list of character identifiers. Format identifiers are `'gids'`
-		and `'unicodes'`. Character identifiers are integers representing glyph IDs or Unicode codepoints.
+	subsetCharacters : dict[identifierDotAttribute, dict[str, tuple[range, ...]]]
+		Nested mapping from filename stem to format identifier to the runs of character identifiers. Format identifiers are
+		`'gids'` and `'unicodes'`. Each run is a `range` of consecutive glyph IDs or Unicode codepoints, in ascending order.
 
 	References
 	----------
 	[1] fontTools.subset
 		https://fonttools.readthedocs.io/en/latest/subset/index.html
 	[2] Integrated_Code_Fire.settingsPackage
+	[3] Integrated_Code_Fire.archivist.archivistCompilesSubsetCharacters
+	[4] range - Python Standard Library
+		https://docs.python.org/3/library/stdtypes.html#range
+	[5] itertools.chain.from_iterable - Python Standard Library
+		https://docs.python.org/3/library/itertools.html#itertools.chain.from_iterable
 
 	"""
-	subsetCharacters: dict[identifierDotAttribute, dict[str, list[int]]] = {}
+	subsetCharacters: dict[identifierDotAttribute, dict[str, tuple[range, ...]]] = {}
 
-	pathDatacenter: Path = settingsPackage.pathPackage / 'dataCenter'
+	dataSubsets, index, offsetRuns = _readSubsetCharacters(fontFamilyCID)
 	dictionaryLocales: dict[str, LocaleIn] = archivistGetsLocales()
 
 	for locale, style in CartesianProduct(theLocales or settingsPackage.theLocales, theStyles or settingsPackage.theStyles):
 		filenameStem: identifierDotAttribute = archivistMakesFilenameStem(fontFamilyCID, dictionaryLocales[locale].ascii, style)
 		subsetCharacters[filenameStem] = {}
+		for formatCharacterIDs, (offset, countRuns) in index[filenameStem].items():
+			runs: array[int] = array('I')
+			runs.frombytes(dataSubsets[offsetRuns + offset:offsetRuns + offset + 8 * countRuns])
+			if sys.byteorder == 'big':
+				runs.byteswap()
+			subsetCharacters[filenameStem][formatCharacterIDs] = tuple(map(range, runs[0::2], runs[1::2], strict=True))
+
+	return subsetCharacters
 
-		formatCharacterIDs: str = 'gids'
-		pathFilename: Path = pathDatacenter / f"{filenameStem}.{formatCharacterIDs}"
-		subsetCharacters[filenameStem][formatCharacterIDs] = subset.parse_gids(','.join(pathFilename.read_text('utf-8').splitlines()))
+def archivistCompilesSubsetCharacters(fontFamilyCID: str = 'SourceHanMono') -> Path:
+	r"""Compile the character subset files of a CID font family into one binary file of run-length encoded tables.
 
-		formatCharacterIDs: str = 'unicodes'
-		pathFilename: Path = pathDatacenter / f"{filenameStem}.{formatCharacterIDs}"
-		subsetCharacters[filenameStem][formatCharacterIDs] = subset.parse_unicodes(','.join(pathFilename.read_text('utf-8').splitlines()))
+	(AI generated docstring)
 
-	return subsetCharacters
+	You can use this function to replace about 435,000 lines of `.gids` and `.unicodes` text, which each process would split and
+	parse again with `fontTools.subset` [1], with a file of a few kilobytes that `archivistGetsSubsetCharacters` [2] loads in a
+	few milliseconds. The function reads every `{fontFamilyCID}.*.gids` and `{fontFamilyCID}.*.unicodes` file in the `dataCenter`
+	directory, sorts each table, and encodes each table as runs of consecutive identifiers. The function stores each distinct
+	table one time, because many locales and styles have identical tables.
+
+	The file `{fontFamilyCID}.subsets` has the signature `b'ICFsub\x00\x02'`, the SHA-256 digest of the names and contents of the
+	`.gids` and `.unicodes` files, the length of the index as a little-endian unsigned 32-bit integer, the index as JSON, and the
+	runs. The index maps each filename stem to each format identifier to the byte offset of the runs of the table, from the end of
+	the index, and the number of runs. Each run is a pair of little-endian unsigned 32-bit integers: the first identifier of the
+	run and the identifier after the last identifier of the run, as in `range` [3]. `archivistGetsSubsetCharacters` compiles the
+	file again when the digest does not match the current `.gids` and `.unicodes` files, so an edited subset file never leaves a
+	stale table.
+
+	Parameters
+	----------
+	fontFamilyCID : str = 'SourceHanMono'
+		Font family identifier used to locate the subset files.
+
+	Returns
+	-------
+	pathFilenameSubsets : Path
+		Path to the written compiled subset file.
+
+	References
+	----------
+	[1] fontTools.subset
+		https://fonttools.readthedocs.io/en/latest/subset/index.html
+	[2] Integrated_Code_Fire.archivist.archivistGetsSubsetCharacters
+	[3] range - Python Standard Library
+		https://docs.python.org/3/library/stdtypes.html#range
+
+	"""
+	pathDatacenter: Path = settingsPackage.pathPackage / 'dataCenter'
+	index: dict[str, dict[str, tuple[int, int]]] = {}
+	dictionaryRuns: dict[bytes, int] = {}
+	listRuns: list[bytes] = []
+	offset: int = 0
+
+	for pathFilename in _getSubsetSources(fontFamilyCID):
+		text: str = ','.join(pathFilename.read_text('utf-8').split())
+		characterIDs: list[int] = sorted(set(subset.parse_gids(text) if pathFilename.suffix == '.gids' else subset.parse_unicodes(text)))
+
+		runs: array[int] = array('I')
+		for characterID in characterIDs:
+			if runs and runs[-1] == characterID:
+				runs[-1] += 1
+			else:
+				runs.extend((characterID, characterID + 1))
+		if sys.byteorder == 'big':
+			runs.byteswap()
+		dataRuns: bytes = runs.tobytes()
+
+		if dataRuns not in dictionaryRuns:
+			dictionaryRuns[dataRuns] = offset
+			listRuns.append(dataRuns)
+			offset += len(dataRuns)
+		index.setdefault(pathFilename.stem, {})[pathFilename.suffix.removeprefix('.')] = (dictionaryRuns[dataRuns], len(runs) // 2)
+
+	dataIndex: bytes = json.dumps(index, sort_keys=True, separators=(',', ':')).encode()
+	pathFilenameSubsets: Path = pathDatacenter / f"{fontFamilyCID}.subsets"
+	pathFilenameTemporary: Path = pathFilenameSubsets.with_name(f"{pathFilenameSubsets.name}.{os.getpid()}.tmp")
+	pathFilenameTemporary.write_bytes(b''.join([_signatureSubsets, _digestSubsetSources(fontFamilyCID), struct.pack('<I', len(dataIndex)), dataIndex, *listRuns]))
+	pathFilenameTemporary.replace(pathFilenameSubsets)
+	_readSubsetCharacters.cache_clear()
+	return pathFilenameSubsets
 
 def archivistGetsGlyphsUnicode(pathFilename: Path) -> frozenset[int]:
 	"""Get Unicode codepoints present in a Glyphs source file.
 
-	Load a Glyphs source file [1] from `pathFilename` and return a `frozenset` of all Unicode
-	codepoints referenced by glyphs in the file.
+	(AI generated docstring)
+
+	Read the `unicode` values of the glyphs in a Glyphs source file [1] at `pathFilename` and return a `frozenset` of all Unicode
+	codepoints referenced by glyphs in the file. Instead of building every glyph, layer, path, and anchor with `glyphsLib.load`
+	[2], the function scans the text for the `unicode` keys, which the Glyphs format writes as hexadecimal strings in format
+	version 2 and as decimal integers in format version 3. The build cache stores the codepoints under the digest of the file
+	contents, so a later call for an unchanged file reads a short list instead of scanning the file again.
 
 	Parameters
 	----------
@@ -479,20 +601,36 @@ def archivistGetsGlyphsUnicode(pathFilename: Path) -> frozenset[int]:
 
 	References
 	----------
-	[1] glyphsLib
+	[1] Glyphs 3 File Format Specification
+		https://github.com/schriftgestalt/GlyphsSDK/blob/Glyphs3/GlyphsFileFormat/GlyphsFileFormatv3.md
+	[2] glyphsLib
 		https://github.com/googlefonts/glyphsLib
+	[3] Integrated_Code_Fire.stockroom.storekeeperRetrievesArtifact
+		Internal package reference.
 
 	"""
-	return frozenset([int(unicode, 16) for glyph in glyphsLib.load(pathFilename).glyphs for unicode in glyph.unicodes])
-
-def archivistMakesCharacterSubsets(pathFilename: Path, pathWrite: Path, filenameStemWrite: str, unicodeExclude: Container[int] = frozenset(), gidsExclude: Container[str] = frozenset()) -> list[Path]:
+	keyCache: str = storekeeperMakesKey('archivistGetsGlyphsUnicode', pathFilename, versionStage=1)
+	pathFilenameUnicodes: Path = settingsPackage.pathWarehouse / 'glyphsUnicode' / f"{pathFilename.stem}.unicodes"
+	if not storekeeperRetrievesArtifact(keyCache, pathFilenameUnicodes):
+		text: str = pathFilename.read_text('utf-8')
+		matchFormatVersion: regex.Match[str] | None = _patternFormatVersion.search(text)
+		base: int = 10 if matchFormatVersion and 3 <= int(matchFormatVersion.group(1)) else 16
+		unicodeGlyphs: set[int] = {int(unicode, base) for value in _patternUnicode.findall(text)
+			for unicode in value.strip('()"').split(',') if unicode.strip()}
+		pathFilenameUnicodes.parent.mkdir(parents=True, exist_ok=True)
+		pathFilenameUnicodes.write_text('\n'.join(map(hex, sorted(unicodeGlyphs))) + '\n', encoding='utf-8')
+		storekeeperStoresArtifact(keyCache, pathFilenameUnicodes)
+	return frozenset(int(unicode, 16) for unicode in pathFilenameUnicodes.read_text('utf-8').split())
+
+def archivistMakesCharacterSubsets(pathFilename: Path, pathWrite: Path, filenameStemWrite: str, unicodeExclude: Collection[int] = frozenset(), gidsExclude: Collection[str] = frozenset()) -> list[Path]:
 	"""Generate glyph ID and Unicode subset files from a UTF-32 character map.
 
 	(AI generated docstring)
 
-	You can create `.gids` and `.unicodes` subset files from a `.UTF32-map` character map file. The function
-	filters out codepoints in `unicodeExclude` and glyph IDs in `gidsExclude`, then applies hardcoded range
-	filters to produce glyph ID and Unicode subset lists suitable for font subsetting operations.
+	You can create `.gids` and `.unicodes` subset files from a `.UTF32-map` character map file. The function parses the map into
+	one NumPy [2] array of codepoints and one array of glyph IDs without a Python loop over the lines, removes the pairs whose
+	codepoint is in `unicodeExclude` or whose glyph ID is in `gidsExclude`, then applies hardcoded range masks to produce glyph ID
+	and Unicode subset lists suitable for font subsetting operations.
 
 	Parameters
 	----------
@@ -502,9 +640,9 @@ def archivistMakesCharacterSubsets(pathFilename: Path, pathWrite: Path, filename
 		Directory path where the generated subset files are written.
 	filenameStemWrite : str
 		Filename stem for the output `.gids` and `.unicodes` files.
-	unicodeExclude : Container[int] = frozenset()
+	unicodeExclude : Collection[int] = frozenset()
 		Unicode codepoints to exclude from all subsets.
-	gidsExclude : Container[str] = frozenset()
+	gidsExclude : Collection[str] = frozenset()
 		Glyph IDs to exclude from all subsets.
 
 	Returns
@@ -516,51 +654,50 @@ def archivistMakesCharacterSubsets(pathFilename: Path, pathWrite: Path, filename
 	----------
 	[1] hunterMakesPy.filesystemToolkit.writeStringToHere
 		https://context7.com/hunterhogan/huntermakespy
+	[2] NumPy
+		https://numpy.org/doc/stable/
 
 	"""
-	def unicodesToInt(unicodeHexadecimalAsStr: str, /) -> int:
-		return int(unicodeHexadecimalAsStr.strip('<>'), 16)
+	import numpy  # noqa: PLC0415
 
 	listPathFilenames: list[Path] = []
 
-	# TODO No one in the entire universe has created a function to load these values from these super-common files?!
-	unicodeTOgid: dict[int, str] = keyfilter(complement(unicodeExclude.__contains__)
-		, keymap(unicodesToInt
-			, valfilter(complement(gidsExclude.__contains__)
-				, dict(map(compose(tuple[str, str], str.split), pathFilename.read_text('utf-8').splitlines())))))
-
-	# TODO I think tlz.keyfilter might have a bug.
-	# qq = keyfilter(lambda u: 65535 < u, unicodeTOgid)  # noqa: ERA001
-	# qq = itemfilter(lambda ug: 65535 < ug[0], unicodeTOgid)  # noqa: ERA001
-	# ww = qq.values()  # noqa: ERA001
-	# gids: list[str] = sorted(ww, key=int)  # noqa: ERA001
-	# gids: list[str] = sorted(keyfilter((65535).__ge__, unicodeTOgid).values(), key=int)  # noqa: ERA001
-	gids: list[str] = sorted({gid for unicode, gid in unicodeTOgid.items() if 0xFFFF < unicode}, key=int)  # ty:ignore[invalid-assignment]
-	gids.append('')
+	unicodes, gids = _parseCharacterMap(pathFilename.read_bytes())
+	# Like a `dict`, a codepoint that the map lists more than one time keeps its first position and its last glyph ID.
+	_unique, indicesFirst = numpy.unique(unicodes, return_index=True)
+	_unique, indicesLastReversed = numpy.unique(unicodes[::-1], return_index=True)
+	order = numpy.argsort(indicesFirst)
+	unicodes, gids = unicodes[indicesFirst[order]], gids[(unicodes.size - 1 - indicesLastReversed)[order]]
+
+	maskKeep = ~numpy.isin(unicodes, numpy.fromiter(unicodeExclude, numpy.int64, len(unicodeExclude)))
+	maskKeep &= ~numpy.isin(gids, numpy.fromiter(map(int, gidsExclude), numpy.int64, len(gidsExclude)))
+	unicodes, gids = unicodes[maskKeep], gids[maskKeep]
 
 	suffix: str = 'gids'
-	listPathFilenames.append(writeStringToHere('\n'.join(gids), pathWrite / f"{filenameStemWrite}.{suffix}"))
+	listGids: list[str] = [*map(str, numpy.unique(gids[0xFFFF < unicodes]).tolist()), '']
+	listPathFilenames.append(writeStringToHere('\n'.join(listGids), pathWrite / f"{filenameStemWrite}.{suffix}"))
 
 	# TODO These ranges need to be less hardcoded-ish and/or more semantic (e.g., what is 0x1200?)  # noqa: ERA001
 	# TODO Configuration settings.
-	unicodes: Iterator[str] = map(hex
-		, filterfalse(between吗(0x1200, 0x2E7F)
-		, filterfalse(between吗(0xFF01, 0xFF5E)
-			, filter(between吗(0x1100, 0xFFFF), unicodeTOgid.keys())
-	)))
+	maskUnicodes = (0x1100 <= unicodes) & (unicodes <= 0xFFFF)
+	maskUnicodes &= ~((0xFF01 <= unicodes) & (unicodes <= 0xFF5E))
+	maskUnicodes &= ~((0x1200 <= unicodes) & (unicodes <= 0x2E7F))
 
 	suffix: str = 'unicodes'
-	listPathFilenames.append(writeStringToHere('\n'.join(unicodes) + '\n', pathWrite / f"{filenameStemWrite}.{suffix}"))
+	listPathFilenames.append(writeStringToHere('\n'.join(map(hex, unicodes[maskUnicodes].tolist())) + '\n', pathWrite / f"{filenameStemWrite}.{suffix}"))
 
 	return listPathFilenames
 
-def archivistMakesAllCharacterSubsets(pathMetadata: Path, fontFamilyCID: str = 'SourceHanMono', theLocales: Iterable[str] | None = None, theStyles: Iterable[str | None] | None = None, unicodeExclude: frozenset[int] = frozenset()) -> list[Path]:
+def archivistMakesAllCharacterSubsets(pathMetadata: Path, fontFamilyCID: str = 'SourceHanMono', theLocales: Iterable[str] | None = None, theStyles: Iterable[str | None] | None = None, unicodeExclude: frozenset[int] = frozenset()
+		, *, CPUlimit: bool | float | int | None = 1) -> list[Path]:
 	"""Generate character subset files for all locale and style combinations.
 
 	(AI generated docstring)
 
 	You can create `.gids` and `.unicodes` subset files for all combinations of locales and styles. The
-	function invokes `archivistMakesCharacterSubsets` [1] for each `.UTF32-map` file found in the metadata directory.
+	function uses `concurrent.futures.ProcessPoolExecutor` [4] to invoke `archivistMakesCharacterSubsets` [1] for each
+	`.UTF32-map` file found in the metadata directory in parallel, and then compiles the subset files into the file that
+	`archivistGetsSubsetCharacters` reads with `archivistCompilesSubsetCharacters` [3].
 
 	Parameters
 	----------
@@ -574,16 +711,23 @@ def archivistMakesAllCharacterSubsets(pathMetadata: Path, fontFamilyCID: str = '
 		Style identifiers to process, or `None` to use `settingsPackage.theStyles` [2].
 	unicodeExclude : frozenset[int] = frozenset()
 		Unicode codepoints to exclude from all generated subsets.
+	CPUlimit : bool | float | int | None = 1
+		Concurrency limit passed to `defineConcurrencyLimit` [5].
 
 	Returns
 	-------
 	listPathFilenames : list[Path]
-		List of paths to all generated `.gids` and `.unicodes` files.
+		List of paths to all generated `.gids` and `.unicodes` files and to the compiled subset file.
 
 	References
 	----------
 	[1] Integrated_Code_Fire.archivist.archivistMakesCharacterSubsets
 	[2] Integrated_Code_Fire.settingsPackage
+	[3] Integrated_Code_Fire.archivist.archivistCompilesSubsetCharacters
+	[4] concurrent.futures.ProcessPoolExecutor
+		https://docs.python.org/3/library/concurrent.futures.html#concurrent.futures.ProcessPoolExecutor
+	[5] hunterMakesPy.parseParameters.defineConcurrencyLimit
+		https://context7.com/hunterhogan/huntermakespy
 
 	"""
 	if theLocales is None or theStyles is None:
@@ -598,17 +742,82 @@ def archivistMakesAllCharacterSubsets(pathMetadata: Path, fontFamilyCID: str = '
 	dictionaryLocales: dict[str, LocaleIn] = archivistGetsLocales()
 	# TODO Remove the hardcoding.
 	from Integrated_Code_Fire.dataCenter.SourceHanMono import cidsVerticalOnly  # pyright: ignore[reportUnusedImport] # noqa: PLC0415
-	for locale, style in CartesianProduct(theLocales, theStyles):
-		if style:
-			pathFilename: Path = pathMetadata / f"utf32-{dictionaryLocales[locale].SourceHanMono.lower()}-ital.map"
-		else:
-			pathFilename: Path = pathMetadata / f"utf32-{dictionaryLocales[locale].SourceHanMono.lower()}.map"
-		filenameStem: identifierDotAttribute = archivistMakesFilenameStem(fontFamilyCID, dictionaryLocales[locale].ascii, style)
-		listPathFilenames.extend(archivistMakesCharacterSubsets(pathFilename, pathWrite, filenameStem, unicodeExclude, cidsVerticalOnly))
-
+	listClaimTickets: list[Future[list[Path]]] = []
+	with ProcessPoolExecutor(defineConcurrencyLimit(limit=CPUlimit)) as concurrencyManager:
+		for locale, style in CartesianProduct(theLocales, theStyles):
+			if style:
+				pathFilename: Path = pathMetadata / f"utf32-{dictionaryLocales[locale].SourceHanMono.lower()}-ital.map"
+			else:
+				pathFilename: Path = pathMetadata / f"utf32-{dictionaryLocales[locale].SourceHanMono.lower()}.map"
+			filenameStem: identifierDotAttribute = archivistMakesFilenameStem(fontFamilyCID, dictionaryLocales[locale].ascii, style)
+			listClaimTickets.append(concurrencyManager.submit(archivistMakesCharacterSubsets, pathFilename, pathWrite, filenameStem, unicodeExclude, cidsVerticalOnly))
+
+		for claimTicket in listClaimTickets:
+			listPathFilenames.extend(claimTicket.result())
+
+	listPathFilenames.append(archivistCompilesSubsetCharacters(fontFamilyCID))
 	return listPathFilenames
 
+def _parseCharacterMap(dataMap: bytes) -> tuple[NDArray[numpy.int64], NDArray[numpy.int64]]:
+	"""I use this to parse the lines `<hexadecimal codepoint> decimal CID` of a `.UTF32-map` file into two arrays with only array operations.
+
+	(AI generated docstring)
+
+	Every byte that is not a hexadecimal digit separates numbers, so the angle brackets and the whitespace disappear. The value
+	of each number is the sum of each digit times the base to the power of the position of the digit from the end of the number.
+	`numpy.add.reduceat` adds the digits of all numbers at the same time. The even numbers are hexadecimal codepoints, and the
+	odd numbers are decimal CIDs.
+	"""
+	import numpy  # noqa: PLC0415
+
+	valuesDigit: NDArray[numpy.int64] = numpy.full(256, -1, numpy.int64)
+	valuesDigit[numpy.frombuffer(b'0123456789', numpy.uint8)] = numpy.arange(10)
+	valuesDigit[numpy.frombuffer(b'abcdef', numpy.uint8)] = numpy.arange(10, 16)
+	valuesDigit[numpy.frombuffer(b'ABCDEF', numpy.uint8)] = numpy.arange(10, 16)
+
+	digits: NDArray[numpy.int64] = valuesDigit[numpy.frombuffer(dataMap, numpy.uint8)]
+	isDigit: NDArray[numpy.bool_] = 0 <= digits
+	edges: NDArray[numpy.int8] = numpy.diff(isDigit.astype(numpy.int8), prepend=0, append=0)
+	starts: NDArray[numpy.intp] = numpy.flatnonzero(edges == 1)
+	stops: NDArray[numpy.intp] = numpy.flatnonzero(edges == -1)
+	if starts.size % 2:
+		message: str = f"I received a character map with {starts.size} numbers, but each line of a character map has two numbers."
+		raise ValueError(message)
+
+	indicesDigit: NDArray[numpy.intp] = numpy.flatnonzero(isDigit)
+	numberOfDigit: NDArray[numpy.intp] = numpy.repeat(numpy.arange(starts.size), stops - starts)
+	bases: NDArray[numpy.int64] = numpy.where(numpy.arange(starts.size) % 2 == 0, 16, 10)
+	values: NDArray[numpy.int64] = numpy.add.reduceat(
+		digits[indicesDigit] * bases[numberOfDigit] ** (stops[numberOfDigit] - 1 - indicesDigit), numpy.cumsum(stops - starts) - (stops - starts))
+	return values[0::2], values[1::2]
+
+def _digestSubsetSources(fontFamilyCID: str) -> bytes:
+	"""I use this to identify the current `.gids` and `.unicodes` files of `fontFamilyCID` by the SHA-256 digest of their names and contents."""
+	hasher: _Hash = hashlib.sha256()
+	for pathFilename in _getSubsetSources(fontFamilyCID):
+		hasher.update(pathFilename.name.encode() + b'\x00')
+		hasher.update(pathFilename.read_bytes())
+	return hasher.digest()
+
+def _getSubsetSources(fontFamilyCID: str) -> list[Path]:
+	"""I use this to list the `.gids` and `.unicodes` files of `fontFamilyCID` in the same order for compiling and for digesting."""
+	pathDatacenter: Path = settingsPackage.pathPackage / 'dataCenter'
+	return sorted([*pathDatacenter.glob(f"{fontFamilyCID}.*.gids"), *pathDatacenter.glob(f"{fontFamilyCID}.*.unicodes")])
+
+@cache
+def _readSubsetCharacters(fontFamilyCID: str) -> tuple[bytes, dict[str, dict[str, list[int]]], int]:
+	"""I use this to read the compiled subset file of `fontFamilyCID` one time in each process, compiling it again if it is missing or stale, and to return the runs, the index, and the offset of the runs."""
+	pathFilenameSubsets: Path = settingsPackage.pathPackage / 'dataCenter' / f"{fontFamilyCID}.subsets"
+	header: bytes = _signatureSubsets + _digestSubsetSources(fontFamilyCID)
+	dataSubsets: bytes = pathFilenameSubsets.read_bytes() if pathFilenameSubsets.exists() else b''
+	if not dataSubsets.startswith(header):
+		archivistCompilesSubsetCharacters(fontFamilyCID)
+		dataSubsets = pathFilenameSubsets.read_bytes()
+	lengthIndex: int = struct.unpack_from('<I', dataSubsets, len(header))[0]
+	offsetRuns: int = len(header) + 4 + lengthIndex
+	return dataSubsets, json.loads(dataSubsets[len(header) + 4:offsetRuns]), offsetRuns
+
 if __name__ == '__main__':
 	pathMetadata: Path = pathRootSourceHanMonoDEFAULT / 'Resources'
 	unicodeExclude: frozenset[int] = archivistGetsGlyphsUnicode(pathFilenameFiraCodeGlyphsDEFAULT)
-	archivistMakesAllCharacterSubsets(pathMetadata, unicodeExclude=unicodeExclude)
+	archivistMakesAllCharacterSubsets(pathMetadata, unicodeExclude=unicodeExclude, CPUlimit=-1)
@@ -37,49 +37,57 @@ References
 	https://github.com/adobe-fonts/source-han-mono
 
 """
-from afdko.otf2ttf import otf_to_ttf
 from collections.abc import Iterable
-from concurrent.futures import as_completed, Future, ProcessPoolExecutor
-from fontTools.ttLib import scaleUpem, TTFont
+from fontTools.ttLib import TTFont
+from functools import cache, partial
 from hunterMakesPy.parseParameters import defineConcurrencyLimit
 from Integrated_Code_Fire import (
-	LocaleIn, PackageSettings, pathFilenameFiraCodeGlyphsDEFAULT, pathRootSourceHanMonoDEFAULT, settingsPackage, subsetOptionsDEFAULT,
-	WeightIn)
+	incrementHARDCODED, LocaleIn, PackageSettings, pathFilenameFiraCodeGlyphsDEFAULT, pathRootSourceHanMonoDEFAULT, settingsPackage,
+	subsetOptionsDEFAULT, TaskIn, WeightIn, widthHalfSourceHanMonoHARDCODED)
 from Integrated_Code_Fire.archivist import (
 	archivistGetsLocales, archivistGetsSubsetCharacters, archivistGetsWeights, archivistMakesFilenameStem)
-from Integrated_Code_Fire.foundry import smithyCasts_afdko, smithyCastsFromGlyphs
+from Integrated_Code_Fire.dispatch import dispatcherRunsTaskGraph
+from Integrated_Code_Fire.foundry import smithyCasts_afdko, smithyCastsFromGlyphs, smithyCastsVariableFont
+from Integrated_Code_Fire.logbook import (
+	scribeProfilesTask, scribeRecordsSpan, scribeReportsProfiles, scribeStartsProfiling, scribeStartsTrace, scribeWritesTrace)
 from Integrated_Code_Fire.logistics import valetCopiesToWorkbench, valetRemovesFiles, valetRemovesWorkbench
-from Integrated_Code_Fire.machineShop import machinistSubsetsCID
-from itertools import product as CartesianProduct
+from Integrated_Code_Fire.machineShop import machinistSubsetsCID, machinistTransformsGlyphs
+from Integrated_Code_Fire.stockroom import storekeeperMakesKey, storekeeperRetrievesArtifact, storekeeperStoresArtifact
+from Integrated_Code_Fire.timekeeper import (
+	timekeeperGetsMemoryAvailable, timekeeperGetsPeakMemory, timekeeperReportsPeakMemory, timekeeperResetsPeakMemory)
+from itertools import chain, product as CartesianProduct
 from pathlib import Path
-from tqdm import tqdm
 from typing import TYPE_CHECKING
+import sys
 
 if TYPE_CHECKING:
 	from fontTools import subset
-	from hunterMakesPy import identifierDotAttribute
 
-def prepareGlyphs(listPathFilenamesTTFont: Iterable[Path], *, CPUlimit: bool | float | int | None = 1) -> Iterable[Path]:
+def prepareGlyphs(listPathFilenamesTTFont: Iterable[Path], *, CPUlimit: bool | float | int | None = 1, pathWrite: Path | None = None) -> Iterable[Path]:
 	"""Prepare compiled western fonts for merging.
 
 	(AI generated docstring)
 
-	You can use this function to take already compiled western font files, scale each font to `settingsPackage.unitsPerEm` when
-	necessary, and save the prepared fonts into `settingsPackage.pathWarehouse`. The function writes into `western` when the
-	target units-per-em value already equals `2000`, and writes into `scaled` otherwise. The `CPUlimit` parameter is accepted for
-	interface consistency with other assembly-line stages [1].
+	You can use this function to take already compiled western font files, scale each font to `settingsPackage.unitsPerEm` with
+	`machinistTransformsGlyphs` [4] when necessary, and save the prepared fonts into `settingsPackage.pathWarehouse`. The function
+	writes into `western` when the target units-per-em value already equals `2000`, and writes into `scaled` otherwise, unless
+	`pathWrite` names another directory. The function prepares each font in a `_prepareFont` task of `dispatcherRunsTaskGraph`
+	[5], with concurrency controlled by `CPUlimit` through `defineConcurrencyLimit` [1]. When the build cache has an artifact for
+	the same compiled font and units-per-em value, the task copies the artifact from `storekeeperRetrievesArtifact` [3].
 
 	Parameters
 	----------
 	listPathFilenamesTTFont : Iterable[Path]
 		Iterable of compiled western font paths to prepare.
 	CPUlimit : bool | float | int | None = 1
-		Concurrency limit placeholder kept for API consistency with adjacent assembly-line stages.
+		Concurrency limit passed to `defineConcurrencyLimit` [1].
+	pathWrite : Path | None = None
+		Directory for the prepared fonts, or `None` to use the directory in `settingsPackage.pathWarehouse`.
 
 	Returns
 	-------
 	pathFilenamesPrepared : frozenset[Path]
-		Prepared font file paths written into `settingsPackage.pathWarehouse`.
+		Prepared font file paths written into `pathWrite` or `settingsPackage.pathWarehouse`.
 
 	Examples
 	--------
@@ -95,36 +103,36 @@ def prepareGlyphs(listPathFilenamesTTFont: Iterable[Path], *, CPUlimit: bool | f
 		https://context7.com/hunterhogan/huntermakespy
 	[2] Integrated_Code_Fire.foundry.smithyCastsFromGlyphs
 		Internal package reference.
+	[3] Integrated_Code_Fire.stockroom.storekeeperRetrievesArtifact
+		Internal package reference.
+	[4] Integrated_Code_Fire.machineShop.machinistTransformsGlyphs
+		Internal package reference.
+	[5] Integrated_Code_Fire.dispatch.dispatcherRunsTaskGraph
+		Internal package reference.
 	"""
-	workersMaximum: int = defineConcurrencyLimit(limit=CPUlimit)  # pyright: ignore[reportUnusedVariable] # noqa: F841
-
-	listPathFilenames: Iterable[Path] = []
+	workersMaximum: int = defineConcurrencyLimit(limit=CPUlimit)
 
-	if settingsPackage.unitsPerEm == 2000:
-		pathWrite: Path = settingsPackage.pathWarehouse / 'western'
-	else:
-		pathWrite: Path = settingsPackage.pathWarehouse / 'scaled'
+	if pathWrite is None and settingsPackage.unitsPerEm == 2000:
+		pathWrite = settingsPackage.pathWarehouse / 'western'
+	elif pathWrite is None:
+		pathWrite = settingsPackage.pathWarehouse / 'scaled'
 	pathWrite.mkdir(parents=True, exist_ok=True)
 
+	dictionaryTasks: dict[Path, TaskIn] = {}
 	for pathFilename in listPathFilenamesTTFont:
-		ttFont: TTFont = TTFont(pathFilename)
-		if settingsPackage.unitsPerEm != 2000:
-			scaleUpem.scale_upem(ttFont, settingsPackage.unitsPerEm)
 		weight: str = pathFilename.stem.removeprefix(f"{pathFilename.parent.name}-")
-		pathFilenameWrite: Path = pathWrite / f"{weight}{pathFilename.suffix}"
-		ttFont.save(pathFilenameWrite)
-		listPathFilenames.append(pathFilenameWrite)
+		dictionaryTasks[pathFilename] = TaskIn(_prepareFont, (pathFilename, pathWrite / f"{weight}{pathFilename.suffix}"))
 
-	return frozenset(listPathFilenames)
+	return frozenset(dispatcherRunsTaskGraph(dictionaryTasks, workersMaximum, "Preparing western fonts").values())
 
-def castCID(pathRootCID: Path, fontFamilyCID: str = 'SourceHanMono', theLocales: Iterable[str] | None = None, theStyles: Iterable[str | None] | None = None, theWeights: Iterable[str] | None = None, *, CPUlimit: bool | float | int | None = 1) -> frozenset[Path]:
+def castCID(pathRootCID: Path, fontFamilyCID: str = 'SourceHanMono', theLocales: Iterable[str] | None = None, theStyles: Iterable[str | None] | None = None, theWeights: Iterable[str] | None = None, *, CPUlimit: bool | float | int | None = 1, bytesBudget: int | None = None) -> frozenset[Path]:
 	"""Compile Source Han Mono OTF fonts from CIDFont source for all locale, style, and weight combinations.
 
 	(AI generated docstring)
 
 	You can compile Source Han Mono OTF fonts by invoking `smithyCasts_afdko` [1] with the Cartesian product of `theLocales`,
 	`theStyles`, and `theWeights`. When any of `theLocales`, `theStyles`, or `theWeights` is `None`, the function reads all
-	three from `PackageSettings` [2]. Concurrency is bounded by `CPUlimit` using `defineConcurrencyLimit` [3].
+	three from `PackageSettings` [2]. Concurrency is bounded by `CPUlimit` using `defineConcurrencyLimit` [3] and by `bytesBudget`.
 
 	Parameters
 	----------
@@ -141,6 +149,8 @@ def castCID(pathRootCID: Path, fontFamilyCID: str = 'SourceHanMono', theLocales:
 		Weight identifiers to compile, or `None` to use the full weight set from `PackageSettings`.
 	CPUlimit : bool | float | int | None = 1
 		Concurrency limit passed to `defineConcurrencyLimit` [3].
+	bytesBudget : int | None = None
+		Memory budget passed to `smithyCasts_afdko` [1], or `None` to limit concurrency only by `CPUlimit`.
 
 	Returns
 	-------
@@ -172,20 +182,28 @@ def castCID(pathRootCID: Path, fontFamilyCID: str = 'SourceHanMono', theLocales:
 		theStyles = theStyles or settings.theStyles
 		theWeights = theWeights or settings.theWeights
 
-	return frozenset(smithyCasts_afdko(pathRootCID, theLocales, theStyles, theWeights, fontFamilyCID, CPUlimit=workersMaximum))
+	return frozenset(smithyCasts_afdko(pathRootCID, theLocales, theStyles, theWeights, fontFamilyCID, CPUlimit=workersMaximum, bytesBudget=bytesBudget))
 
 def subsetCID(subsetOptions: subset.Options, fontFamilyCID: str = 'SourceHanMono'
 			, theLocales: Iterable[str] | None = None, theStyles: Iterable[str | None] | None = None, theWeights: Iterable[str] | None = None
-			, fontFormat: str = 'ttf', *, CPUlimit: bool | float | int | None = 1) -> frozenset[Path]:
+			, fontFormat: str = 'ttf', *, CPUlimit: bool | float | int | None = 1, lowMemory: bool = False, bytesBudget: int | None = None) -> frozenset[Path]:
 	"""Subset compiled CID fonts to locale-specific glyph IDs and Unicode ranges.
 
 	(AI generated docstring)
 
 	You can subset Source Han Mono OTF fonts to locale-specific glyph IDs and Unicode codepoints using character subset
-	definitions loaded by `archivistGetsSubsetCharacters` [1]. The function dispatches parallel subset tasks to
-	`ProcessPoolExecutor` [2]: each task calls `_cidTOttf` [3] when `fontFormat` is 'ttf', or `_cid` [4] when `fontFormat`
+	definitions loaded by `archivistGetsSubsetCharacters` [1]. Each task receives only the locale and style of its subset, and the
+	worker loads the glyph IDs and Unicode codepoints of the subset itself, so no task sends tens of thousands of identifiers
+	through the pipe of the process pool. The function dispatches parallel subset tasks to
+	`dispatcherRunsTaskGraph` [2]: each task calls `_cidTOttf` [3] when `fontFormat` is 'ttf', or `_cid` [4] when `fontFormat`
 	is 'otf'. Subset output files are written to `settingsPackage.pathWarehouse / 'CID'`. When any of `theLocales`,
-	`theStyles`, or `theWeights` is `None`, the function reads all three from `PackageSettings` [5].
+	`theStyles`, or `theWeights` is `None`, the function reads all three from `PackageSettings` [5]. If `lowMemory` is `True`,
+	each task opens the CID font with lazy table loading, so tables and lookups that the subsetter never touches are never
+	decompiled. The other weights of each locale and style wait for the task of the first weight, so they subset with the glyph
+	closure that `machinistSubsetsCID` [9] stored for the first weight. If there are fewer subsets than workers, each
+	`_cidTOttf` task converts new outlines with the workers that the other tasks leave idle. The function writes the peak
+	resident memory of the subset tasks with `timekeeperReportsPeakMemory` [8]. If `bytesBudget` is not `None`, the dispatcher starts a subset task only
+	when the peak memory that earlier subset tasks needed fits in the memory that the running tasks leave in `bytesBudget`.
 
 	Parameters
 	----------
@@ -204,6 +222,10 @@ def subsetCID(subsetOptions: subset.Options, fontFamilyCID: str = 'SourceHanMono
 		Output font format. Use 'ttf' to subset and convert to TrueType outlines, or 'otf' to keep PostScript CFF outlines.
 	CPUlimit : bool | float | int | None = 1
 		Concurrency limit passed to `defineConcurrencyLimit` [7].
+	lowMemory : bool = False
+		Whether to trade speed for a smaller peak memory in each worker.
+	bytesBudget : int | None = None
+		Memory, in bytes, that the subset tasks may use at the same time, or `None` to limit concurrency only by `CPUlimit`.
 
 	Returns
 	-------
@@ -222,8 +244,8 @@ def subsetCID(subsetOptions: subset.Options, fontFamilyCID: str = 'SourceHanMono
 	----------
 	[1] Integrated_Code_Fire.archivist.archivistGetsSubsetCharacters
 		Internal package reference.
-	[2] concurrent.futures.ProcessPoolExecutor - Python Standard Library
-		https://docs.python.org/3/library/concurrent.futures.html#concurrent.futures.ProcessPoolExecutor
+	[2] Integrated_Code_Fire.dispatch.dispatcherRunsTaskGraph
+		Internal package reference.
 	[3] Integrated_Code_Fire.chopShop._cidTOttf
 		Internal package reference.
 	[4] Integrated_Code_Fire.chopShop._cid
@@ -234,6 +256,10 @@ def subsetCID(subsetOptions: subset.Options, fontFamilyCID: str = 'SourceHanMono
 		https://fonttools.readthedocs.io/en/latest/subset/index.html
 	[7] hunterMakesPy.parseParameters.defineConcurrencyLimit
 		https://context7.com/hunterhogan/huntermakespy
+	[8] Integrated_Code_Fire.timekeeper.timekeeperReportsPeakMemory
+		Internal package reference.
+	[9] Integrated_Code_Fire.machineShop.machinistSubsetsCID
+		Internal package reference.
 	"""
 	if (theLocales is None) or (theStyles is None) or (theWeights is None):
 		settings = PackageSettings(settingsPackage.identifierPackage)
@@ -241,65 +267,75 @@ def subsetCID(subsetOptions: subset.Options, fontFamilyCID: str = 'SourceHanMono
 		theStyles = theStyles or settings.theStyles
 		theWeights = theWeights or settings.theWeights
 
-	subsetCharacters: dict[identifierDotAttribute, dict[str, list[int]]] = archivistGetsSubsetCharacters(fontFamilyCID, theLocales, theStyles)
 	dictionaryLocales: dict[str, LocaleIn] = archivistGetsLocales()
 	dictionaryWeights: dict[str, WeightIn] = archivistGetsWeights()
 
 	pathCID: Path = settingsPackage.pathWarehouse / 'CID'
 	pathCID.mkdir(parents=True, exist_ok=True)
-	listClaimTickets: list[Future[Path]] = []
-	listPathFilenames: list[Path] = []
+	dictionaryTasks: dict[tuple[str, str | None, str], TaskIn] = {}
 	workersMaximum: int = defineConcurrencyLimit(limit=CPUlimit)
 
+	listSubsets: list[tuple[str, str | None, str]] = list(CartesianProduct(theLocales, theStyles, theWeights))
 	if fontFormat == 'otf':
-		functionSubsetCID = _cid
+		functionSubsetCID = partial(_cid, subsetOptions=subsetOptions, lowMemory=lowMemory)
 	else:
-		functionSubsetCID = _cidTOttf
+		functionSubsetCID = partial(_cidTOttf, subsetOptions=subsetOptions, lowMemory=lowMemory, workersMaximum=max(1, workersMaximum // len(listSubsets)))
 
-	with ProcessPoolExecutor(workersMaximum) as concurrencyManager:
-		for locale, style, weight in CartesianProduct(theLocales, theStyles, theWeights):
-			localeIn: LocaleIn = dictionaryLocales[locale]
-			weightIn: WeightIn = dictionaryWeights[weight]
+	dictionaryKeysFirst: dict[tuple[str, str | None], tuple[str, str | None, str]] = {}
+	for locale, style, weight in listSubsets:
+		localeIn: LocaleIn = dictionaryLocales[locale]
+		weightIn: WeightIn = dictionaryWeights[weight]
 
-			lookupIDs: identifierDotAttribute = archivistMakesFilenameStem(fontFamilyCID, localeIn.ascii, style)
+		keyFirst: tuple[str, str | None, str] = dictionaryKeysFirst.setdefault((locale, style), (locale, style, weight))
+		dictionaryTasks[(locale, style, weight)] = TaskIn(functionSubsetCID, (
+				settingsPackage.pathWorkbenchFonts / f"{archivistMakesFilenameStem(fontFamilyCID, localeIn.ascii, style, weightIn.fontFamilyCID)}.otf"
+				, fontFamilyCID
+				, locale
+				, style
+				, pathCID / f"{archivistMakesFilenameStem(None, localeIn.ascii, style, weightIn.fontFamilyCID)}.{fontFormat}"
+			), frozenset([keyFirst]) - {(locale, style, weight)})
 
-			listClaimTickets.append(concurrencyManager.submit(
-					functionSubsetCID
-					, settingsPackage.pathWorkbenchFonts / f"{archivistMakesFilenameStem(fontFamilyCID, localeIn.ascii, style, weightIn.fontFamilyCID)}.otf"
-					, subsetCharacters[lookupIDs]['gids']
-					, subsetCharacters[lookupIDs]['unicodes']
-					, subsetOptions
-					, pathCID / f"{archivistMakesFilenameStem(None, localeIn.ascii, style, weightIn.fontFamilyCID)}.{fontFormat}"
-				))
+	listResults: list[tuple[Path, int | None]] = list(dispatcherRunsTaskGraph(dictionaryTasks, workersMaximum, f"Subsetting {fontFamilyCID}", bytesBudget=bytesBudget).values())
 
-		for claimTicket in tqdm(as_completed(listClaimTickets), total=len(listClaimTickets), desc = f"Subsetting {fontFamilyCID}"):
-			listPathFilenames.append(claimTicket.result())  # noqa: PERF401
-	return frozenset(listPathFilenames)
+	timekeeperReportsPeakMemory(f"Subsetting {fontFamilyCID}", [bytesPeak for _pathFilename, bytesPeak in listResults])
+	return frozenset(pathFilename for pathFilename, _bytesPeak in listResults)
 
-def _cidTOttf(pathFilenameCID: Path, gids: list[int], unicodes: list[int], subsetOptions: subset.Options, pathFilenameWrite: Path) -> Path:
+@scribeProfilesTask
+def _cidTOttf(pathFilenameCID: Path, fontFamilyCID: str, locale: str, style: str | None, pathFilenameWrite: Path, *, subsetOptions: subset.Options, lowMemory: bool = False, workersMaximum: int = 1) -> tuple[Path, int | None]:
 	"""I use this worker to subset an OTF CIDFont and convert the result to TrueType outlines.
 
-	I use this as a parallel worker function dispatched by `subsetCID` [1] via `ProcessPoolExecutor`. The function calls
-	`machinistSubsetsCID` [2] to subset the font, then calls `otf_to_ttf` [3] to convert PostScript CFF outlines to
-	TrueType outlines, saves the font to `pathFilenameWrite`, and returns `pathFilenameWrite`.
+	I use this as a parallel worker function dispatched by `subsetCID` [1] via `dispatcherRunsTaskGraph`. The function calls
+	`machinistSubsetsCID` [2] with `trueType=True` to subset the font and convert PostScript CFF outlines to TrueType outlines with
+	`machinistConvertsToTrueType` [3] before scaling and widening, saves the font to `pathFilenameWrite`, and returns
+	`pathFilenameWrite`. The conversion reuses every outline that an earlier task converted, including the same outline in the
+	font of another locale. When the build cache has an artifact for the same inputs, `_keyCacheSubset` [4] and
+	`storekeeperRetrievesArtifact` [5] replace all of that work with a copy.
 
 	Parameters
 	----------
 	pathFilenameCID : Path
 		Path to the input OTF CIDFont file.
-	gids : list[int]
-		Glyph IDs to keep in the subset.
-	unicodes : list[int]
-		Unicode codepoints to keep in the subset.
-	subsetOptions : subset.Options
-		fontTools subset options.
+	fontFamilyCID : str
+		CIDFont family name used to locate the character subset data.
+	locale : str
+		Locale identifier of the subset.
+	style : str | None
+		Style identifier of the subset, or `None` for the upright style.
 	pathFilenameWrite : Path
 		Destination path for the output TTF file.
+	subsetOptions : subset.Options
+		fontTools subset options.
+	lowMemory : bool = False
+		Whether `machinistSubsetsCID` opens the CID font with lazy table loading.
+	workersMaximum : int = 1
+		Number of worker processes that convert outlines that no earlier task converted.
 
 	Returns
 	-------
 	pathFilenameWrite : Path
 		Path to the written TTF output file.
+	bytesPeak : int | None
+		Peak resident memory of the task from `timekeeperGetsPeakMemory`.
 
 	References
 	----------
@@ -307,38 +343,59 @@ def _cidTOttf(pathFilenameCID: Path, gids: list[int], unicodes: list[int], subse
 		Internal package reference.
 	[2] Integrated_Code_Fire.machineShop.machinistSubsetsCID
 		Internal package reference.
-	[3] afdko.otf2ttf.otf_to_ttf
-		https://adobe-type-tools.github.io/afdko/
+	[3] Integrated_Code_Fire.machineShop.machinistConvertsToTrueType
+		Internal package reference.
+	[4] Integrated_Code_Fire.chopShop._keyCacheSubset
+		Internal package reference.
+	[5] Integrated_Code_Fire.stockroom.storekeeperRetrievesArtifact
+		Internal package reference.
 	"""
-	fontCID: TTFont = machinistSubsetsCID(pathFilenameCID, gids, unicodes, subsetOptions)
-	otf_to_ttf(fontCID)
-	fontCID.save(pathFilenameWrite)
-	fontCID.close()
-	return pathFilenameWrite
-
-def _cid(pathFilenameCID: Path, gids: list[int], unicodes: list[int], subsetOptions: subset.Options, pathFilenameWrite: Path) -> Path:
+	timekeeperResetsPeakMemory()
+
+	with scribeRecordsSpan('_cidTOttf', font=pathFilenameWrite.name):
+		gids, unicodes = _getSubsetCharacters(fontFamilyCID, locale, style)
+		keyCache: str = _keyCacheSubset('_cidTOttf', pathFilenameCID, gids, unicodes, subsetOptions, versionStage=2)
+		if storekeeperRetrievesArtifact(keyCache, pathFilenameWrite):
+			return pathFilenameWrite, timekeeperGetsPeakMemory()
+
+		fontCID: TTFont = machinistSubsetsCID(pathFilenameCID, chain.from_iterable(gids), chain.from_iterable(unicodes), subsetOptions, lowMemory=lowMemory, trueType=True, workersMaximum=workersMaximum)
+		with scribeRecordsSpan('save', font=pathFilenameWrite.name):
+			fontCID.save(pathFilenameWrite)
+		fontCID.close()
+		return storekeeperStoresArtifact(keyCache, pathFilenameWrite), timekeeperGetsPeakMemory()
+
+@scribeProfilesTask
+def _cid(pathFilenameCID: Path, fontFamilyCID: str, locale: str, style: str | None, pathFilenameWrite: Path, *, subsetOptions: subset.Options, lowMemory: bool = False) -> tuple[Path, int | None]:
 	"""I use this worker to subset an OTF CIDFont and save the result in OTF format.
 
-	I use this as a parallel worker function dispatched by `subsetCID` [1] via `ProcessPoolExecutor`. The function calls
-	`machinistSubsetsCID` [2] to subset the font, saves the font to `pathFilenameWrite`, and returns `pathFilenameWrite`.
+	I use this as a parallel worker function dispatched by `subsetCID` [1] via `dispatcherRunsTaskGraph`. The function calls
+	`machinistSubsetsCID` [2] to subset the font, saves the font to `pathFilenameWrite`, and returns `pathFilenameWrite`. When the
+	build cache has an artifact for the same inputs, `_keyCacheSubset` [3] and `storekeeperRetrievesArtifact` [4] replace all of
+	that work with a copy.
 
 	Parameters
 	----------
 	pathFilenameCID : Path
 		Path to the input OTF CIDFont file.
-	gids : list[int]
-		Glyph IDs to keep in the subset.
-	unicodes : list[int]
-		Unicode codepoints to keep in the subset.
-	subsetOptions : subset.Options
-		fontTools subset options.
+	fontFamilyCID : str
+		CIDFont family name used to locate the character subset data.
+	locale : str
+		Locale identifier of the subset.
+	style : str | None
+		Style identifier of the subset, or `None` for the upright style.
 	pathFilenameWrite : Path
 		Destination path for the output OTF file.
+	subsetOptions : subset.Options
+		fontTools subset options.
+	lowMemory : bool = False
+		Whether `machinistSubsetsCID` opens the CID font with lazy table loading.
 
 	Returns
 	-------
 	pathFilenameWrite : Path
 		Path to the written OTF output file.
+	bytesPeak : int | None
+		Peak resident memory of the task from `timekeeperGetsPeakMemory`.
 
 	References
 	----------
@@ -346,42 +403,135 @@ def _cid(pathFilenameCID: Path, gids: list[int], unicodes: list[int], subsetOpti
 		Internal package reference.
 	[2] Integrated_Code_Fire.machineShop.machinistSubsetsCID
 		Internal package reference.
+	[3] Integrated_Code_Fire.chopShop._keyCacheSubset
+		Internal package reference.
+	[4] Integrated_Code_Fire.stockroom.storekeeperRetrievesArtifact
+		Internal package reference.
 	"""
-	fontCID: TTFont = machinistSubsetsCID(pathFilenameCID, gids, unicodes, subsetOptions)
-	fontCID.save(pathFilenameWrite)
-	fontCID.close()
-	return pathFilenameWrite
+	timekeeperResetsPeakMemory()
+
+	with scribeRecordsSpan('_cid', font=pathFilenameWrite.name):
+		gids, unicodes = _getSubsetCharacters(fontFamilyCID, locale, style)
+		keyCache: str = _keyCacheSubset('_cid', pathFilenameCID, gids, unicodes, subsetOptions, versionStage=2)
+		if storekeeperRetrievesArtifact(keyCache, pathFilenameWrite):
+			return pathFilenameWrite, timekeeperGetsPeakMemory()
+
+		fontCID: TTFont = machinistSubsetsCID(pathFilenameCID, chain.from_iterable(gids), chain.from_iterable(unicodes), subsetOptions, lowMemory=lowMemory)
+		with scribeRecordsSpan('save', font=pathFilenameWrite.name):
+			fontCID.save(pathFilenameWrite)
+		fontCID.close()
+		return storekeeperStoresArtifact(keyCache, pathFilenameWrite), timekeeperGetsPeakMemory()
+
+@cache
+def _getSubsetCharacters(fontFamilyCID: str, locale: str, style: str | None) -> tuple[tuple[range, ...], tuple[range, ...]]:
+	"""I use this in a worker to load the runs of glyph IDs and of Unicode codepoints of one locale and style one time per process."""
+	characters: dict[str, tuple[range, ...]] = archivistGetsSubsetCharacters(fontFamilyCID, [locale], [style])[
+		archivistMakesFilenameStem(fontFamilyCID, archivistGetsLocales()[locale].ascii, style)]
+	return characters['gids'], characters['unicodes']
+
+def _keyCacheSubset(stage: str, pathFilenameCID: Path, gids: tuple[range, ...], unicodes: tuple[range, ...], subsetOptions: subset.Options, *, versionStage: int) -> str:
+	"""I use this to give `_cidTOttf` and `_cid` one definition of the inputs that determine a subset font.
+
+	(AI generated docstring)
+
+	The key includes every value that `machinistSubsetsCID` reads, including the `settingsPackage` fields and hardcoded values
+	that control scaling and widening, so a change to any of them invalidates the cached subset fonts.
+
+	Parameters
+	----------
+	stage : str
+		Identifier of the worker that makes the subset font.
+	pathFilenameCID : Path
+		Path to the input OTF CIDFont file.
+	gids : tuple[range, ...]
+		Runs of glyph IDs to keep in the subset, from `archivistGetsSubsetCharacters`.
+	unicodes : tuple[range, ...]
+		Runs of Unicode codepoints to keep in the subset, from `archivistGetsSubsetCharacters`.
+	subsetOptions : subset.Options
+		fontTools subset options.
+	versionStage : int
+		Version of the code of the worker, passed to `storekeeperMakesKey` [1].
+
+	Returns
+	-------
+	keyCache : str
+		Cache key from `storekeeperMakesKey` [1].
+
+	References
+	----------
+	[1] Integrated_Code_Fire.stockroom.storekeeperMakesKey
+		Internal package reference.
+	"""
+	return storekeeperMakesKey(stage, pathFilenameCID, gids, unicodes, subsetOptions
+		, settingsPackage.unitsPerEm, settingsPackage.width, incrementHARDCODED, widthHalfSourceHanMonoHARDCODED, versionStage=versionStage)
+
+@scribeProfilesTask
+def _prepareFont(pathFilename: Path, pathFilenameWrite: Path) -> Path:
+	"""I use this worker of `prepareGlyphs` to scale one compiled western font, or to copy the scaled font from the build cache."""
+	with scribeRecordsSpan('_prepareFont', font=pathFilenameWrite.name):
+		keyCache: str = storekeeperMakesKey('prepareGlyphs', pathFilename, settingsPackage.unitsPerEm, versionStage=2)
+		if storekeeperRetrievesArtifact(keyCache, pathFilenameWrite):
+			return pathFilenameWrite
+
+		ttFont: TTFont = TTFont(pathFilename)
+		if settingsPackage.unitsPerEm != 2000:
+			machinistTransformsGlyphs(ttFont, settingsPackage.unitsPerEm)
+		ttFont.save(pathFilenameWrite)
+		ttFont.close()
+		return storekeeperStoresArtifact(keyCache, pathFilenameWrite)
 
 if __name__ == "__main__":
 	fontFormat: str = 'ttf'
 	CPUlimit: int = -2
+	bytesBudget: int | None = timekeeperGetsMemoryAvailable()
 
 	doGlyphs = True
+	doVariableFont = False
 	doCID = True
 	doSubset = True
 	doCleanUp = True
+	doProfile = False
+	doTrace = False
+
+	if doProfile:
+		scribeStartsProfiling()
+	if doTrace:
+		scribeStartsTrace()
 
 	if doGlyphs:
-		pathTTFont: Path | None = smithyCastsFromGlyphs(pathFilenameFiraCodeGlyphsDEFAULT, 1, [fontFormat])
+		if doVariableFont:
+			with scribeRecordsSpan('smithyCastsVariableFont'):
+				pathTTFont: Path | None = smithyCastsVariableFont(pathFilenameFiraCodeGlyphsDEFAULT, defineConcurrencyLimit(limit=CPUlimit))
+		else:
+			with scribeRecordsSpan('smithyCastsFromGlyphs'):
+				pathTTFont = smithyCastsFromGlyphs(pathFilenameFiraCodeGlyphsDEFAULT, defineConcurrencyLimit(limit=CPUlimit), [fontFormat])
 		listPathFilenamesTTFont: Iterable[Path] = pathTTFont.glob(f"*.{fontFormat}")
-		prepareGlyphs(listPathFilenamesTTFont, CPUlimit=CPUlimit)
+		with scribeRecordsSpan('prepareGlyphs'):
+			prepareGlyphs(listPathFilenamesTTFont, CPUlimit=CPUlimit)
 	else:
 		pathTTFont = None
 
 	if doCID:
-		listPathFilenamesCID: frozenset[Path] = castCID(pathRootSourceHanMonoDEFAULT, theStyles=[None], CPUlimit=CPUlimit)
+		with scribeRecordsSpan('castCID'):
+			listPathFilenamesCID: frozenset[Path] = castCID(pathRootSourceHanMonoDEFAULT, theStyles=[None], CPUlimit=CPUlimit, bytesBudget=bytesBudget)
 	else:
 		listPathFilenamesCID = frozenset(Path('/apps/Integrated_Code_Fire/workbench/SourceHanMono').glob('*.otf'))
 
 	if doSubset:
 		listPathFilenamesWorkbench: frozenset[Path] = valetCopiesToWorkbench(listPathFilenamesCID)
-		listPathFilenamesSubsetCID: frozenset[Path] = subsetCID(subsetOptionsDEFAULT, theStyles=[None], fontFormat=fontFormat, CPUlimit=CPUlimit)
+		with scribeRecordsSpan('subsetCID'):
+			listPathFilenamesSubsetCID: frozenset[Path] = subsetCID(subsetOptionsDEFAULT, theStyles=[None], fontFormat=fontFormat, CPUlimit=CPUlimit, bytesBudget=bytesBudget)
 	else:
 		listPathFilenamesWorkbench: frozenset[Path] = frozenset()
 
+	scribeReportsProfiles()
+
 	if doCleanUp:
 		if pathTTFont:
 			valetRemovesFiles(listPathFilenamesTTFont, pathTTFont) # pyright: ignore[reportPossiblyUnboundVariable]
 		valetRemovesFiles(listPathFilenamesCID, next(iter(listPathFilenamesCID)).parent)
 		valetRemovesFiles(listPathFilenamesWorkbench, settingsPackage.pathWorkbenchFonts)
 		valetRemovesWorkbench()
+
+	if doTrace:
+		sys.stdout.write(f"Trace written to {scribeWritesTrace()}\n")
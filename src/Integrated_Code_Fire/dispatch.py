@@ -0,0 +1,245 @@
+"""Run a graph of assembly-line tasks on one shared process pool as soon as the inputs of each task exist.
+
+(AI generated docstring)
+
+You can use this module to replace a sequence of stages, in which each stage waits for every task of the previous stage, with one
+task graph. Each `TaskIn` names the tasks that must finish first, so, for example, the merge of one locale, style, and weight
+starts as soon as the subset font of the same locale, style, and weight exists, even while other fonts are still compiling.
+Every task runs in the same `ProcessPoolExecutor` [1], so no stage waits for a pool of its own to start or to drain.
+
+The number of workers limits the tasks in the pool by processor count. A memory budget can also limit the tasks in the pool by
+memory: the dispatcher measures the peak resident memory of every task, remembers the largest peak of each kind of task in
+`settingsPackage.pathHistory`, and starts a task only if the estimated peaks of the running tasks and the new task fit the budget.
+A Han subset or merge needs far more memory than packaging a ZIP archive, so the same code runs as many tasks as a small laptop
+can hold without the kernel killing a worker, and as many tasks as the processors allow on a large build host.
+
+The dispatcher also measures the duration of every task and remembers it in `settingsPackage.pathHistory`, by the kind of the
+task and the key of the task, such as the locale, style, and weight of a subset. Among the tasks that can start, a later run
+starts the task that took the longest first, so the slowest font does not start last and run alone at the end of a stage, and
+the progress bar estimates the remaining time from the remembered durations instead of from the count of tasks.
+
+Contents
+--------
+Functions
+	dispatcherRunsTaskGraph
+		Run every task of a task graph in one process pool, starting each task when its dependencies finish.
+
+References
+----------
+[1] concurrent.futures.ProcessPoolExecutor - Python Standard Library
+	https://docs.python.org/3/library/concurrent.futures.html#concurrent.futures.ProcessPoolExecutor
+[2] Integrated_Code_Fire.TaskIn
+	Internal package reference.
+[3] Integrated_Code_Fire.timekeeper.timekeeperGetsPeakMemory
+	Internal package reference.
+
+"""
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from functools import partial
+from Integrated_Code_Fire import settingsPackage
+from Integrated_Code_Fire.timekeeper import timekeeperGetsPeakMemory, timekeeperResetsPeakMemory
+from pathlib import Path
+from tqdm import tqdm
+from typing import Any, TYPE_CHECKING
+import heapq
+import json
+import time
+
+if TYPE_CHECKING:
+	from collections.abc import Callable, Hashable, Mapping
+	from Integrated_Code_Fire import TaskIn
+
+_pathFilenameBytesPeak: Path = settingsPackage.pathHistory / 'bytesPeak.json'
+"""I use this file to remember the largest peak resident memory of each kind of task from the latest run of each kind."""
+
+_pathFilenameSeconds: Path = settingsPackage.pathHistory / 'seconds.json'
+"""I use this file to remember the duration of each task, by kind and by the `repr` of the task key, from the latest run of each task."""
+
+def dispatcherRunsTaskGraph[键: Hashable](dictionaryTasks: Mapping[键, TaskIn], workersMaximum: int, description: str = "Running tasks"
+		, *, initializer: Callable[..., object] | None = None, initargs: tuple[Any, ...] = (), bytesBudget: int | None = None) -> dict[键, Any]:
+	"""Run every task of a task graph in one process pool, starting each task when its dependencies finish.
+
+	(AI generated docstring)
+
+	You can use this function to run tasks that depend on each other without a barrier between stages. The function submits a
+	task to the `ProcessPoolExecutor` [1] as soon as every task in `TaskIn.dependencies` [2] finishes. The function never has
+	more than `workersMaximum` tasks in the pool, so when a worker becomes free, the function chooses the next task from every
+	task that can start at that moment: the task with the largest `TaskIn.priority`, and among equal priorities, the task with
+	the longest estimated duration, and among equal estimates, the task that became ready first. If you give later stages a
+	larger priority, each font flows to the end of the assembly line before the pool starts more work at the beginning of the
+	assembly line. Starting the longest task first shortens the time until the last task of a stage finishes.
+
+	Each worker measures the duration of each task, and after the last task, the function writes the duration of each task, by
+	kind and by key, to `settingsPackage.pathHistory`. The estimated duration of a task is the duration of the same kind and key
+	in the latest earlier run, or the mean of the earlier durations of the kind, or, if no run has measured the kind, 1 second.
+	The progress bar counts estimated seconds of work instead of tasks, so the remaining time that `tqdm` [3] shows comes from the
+	estimates.
+
+	Each worker measures the peak resident memory of each task with `timekeeperGetsPeakMemory` [4]. The kind of a task is the name
+	of `TaskIn.function`, or of the function inside a `functools.partial`. After the last task, the function writes the largest
+	peak of each kind of task to `settingsPackage.pathHistory`. If `bytesBudget` is not `None`, the function also admits a task to
+	the pool only if the sum of the estimated peaks of the tasks in the pool and of the task fits in `bytesBudget`. The estimated
+	peak of a kind of task is the largest peak of the kind in the current run, or in the latest earlier run, or, if no run has
+	measured the kind, `bytesBudget // workersMaximum`. The function always admits a task if the pool is empty, so a task that is
+	larger than the budget still runs, alone. The function never starts a later task before a task that does not fit, so a large
+	task does not wait forever behind small tasks.
+
+	If a task raises an exception, the function submits no more tasks, waits for the tasks in the pool, and raises the exception.
+
+	Parameters
+	----------
+	dictionaryTasks : Mapping[键, TaskIn]
+		Mapping from a key that identifies each task to the task.
+	workersMaximum : int
+		Number of worker processes in the pool.
+	description : str = "Running tasks"
+		Description of the progress bar from `tqdm` [3].
+	initializer : Callable[..., object] | None = None
+		Function that each worker process calls one time before the first task, as in `ProcessPoolExecutor`.
+	initargs : tuple[Any, ...] = ()
+		Arguments of `initializer`.
+	bytesBudget : int | None = None
+		Memory, in bytes, that the tasks in the pool may use at the same time, or `None` to limit the tasks only by
+		`workersMaximum`. `timekeeperGetsMemoryAvailable` [5] measures the memory that the current machine has available.
+
+	Returns
+	-------
+	dictionaryResults : dict[键, Any]
+		Mapping from the key of each task to the value that the task returned, in the order of `dictionaryTasks`.
+
+	Raises
+	------
+	ValueError
+		If a task depends on a key that is not in `dictionaryTasks`, or if the dependencies of some tasks form a cycle.
+
+	Examples
+	--------
+	`goAssemblyLine` [6] merges each font as soon as its subset font exists.
+
+	>>> dictionaryTasks[('_cidTOttf', locale, style, weight)] = TaskIn(partial(_cidTOttf, subsetOptions=subsetOptions), (pathFilenameCID, fontFamilyCID, locale, style, pathFilenameHan), frozenset([keyMakeotf]), 1)
+	>>> dictionaryTasks[('_mergeFont', locale, style, weight)] = TaskIn(_mergeFont, (...), frozenset([keySubset]), 2)
+	>>> dictionaryResults = dispatcherRunsTaskGraph(dictionaryTasks, workersMaximum, "Making fonts")
+
+	References
+	----------
+	[1] concurrent.futures.ProcessPoolExecutor - Python Standard Library
+		https://docs.python.org/3/library/concurrent.futures.html#concurrent.futures.ProcessPoolExecutor
+	[2] Integrated_Code_Fire.TaskIn
+		Internal package reference.
+	[3] tqdm
+		https://tqdm.github.io/
+	[4] Integrated_Code_Fire.timekeeper.timekeeperGetsPeakMemory
+		Internal package reference.
+	[5] Integrated_Code_Fire.timekeeper.timekeeperGetsMemoryAvailable
+		Internal package reference.
+	[6] Integrated_Code_Fire.go.goAssemblyLine
+		Internal package reference.
+	"""
+	dictionaryDependents: dict[Hashable, list[键]] = {key: [] for key in dictionaryTasks}
+	dictionaryWaiting: dict[键, int] = {}
+	for key, task in dictionaryTasks.items():
+		for dependency in task.dependencies:
+			if dependency not in dictionaryTasks:
+				message: str = f"I received task {key!r}, which depends on {dependency!r}, but I did not receive task {dependency!r}."
+				raise ValueError(message)
+			dictionaryDependents[dependency].append(key)
+		dictionaryWaiting[key] = len(task.dependencies)
+
+	dictionarySecondsEarlier: dict[str, dict[str, float]] = {}
+	if _pathFilenameSeconds.exists():
+		dictionarySecondsEarlier = json.loads(_pathFilenameSeconds.read_text(encoding='utf-8'))
+	dictionarySeconds: dict[str, dict[str, float]] = {}
+
+	def estimateSeconds(key: 键) -> float:
+		secondsKind: dict[str, float] = dictionarySecondsEarlier.get(_getKind(dictionaryTasks[key].function), {})
+		if repr(key) in secondsKind:
+			return secondsKind[repr(key)]
+		if secondsKind:
+			return sum(secondsKind.values()) / len(secondsKind)
+		return 1.0
+
+	dictionarySecondsEstimate: dict[键, float] = {key: estimateSeconds(key) for key in dictionaryTasks}
+
+	listReady: list[tuple[int, float, int, 键]] = []
+	countReady: int = 0
+
+	def makeReady(key: 键) -> None:
+		nonlocal countReady
+		heapq.heappush(listReady, (-dictionaryTasks[key].priority, -dictionarySecondsEstimate[key], countReady, key))
+		countReady += 1
+
+	for key, countWaiting in dictionaryWaiting.items():
+		if countWaiting == 0:
+			makeReady(key)
+
+	dictionaryBytesPeakEarlier: dict[str, int] = {}
+	if _pathFilenameBytesPeak.exists():
+		dictionaryBytesPeakEarlier = json.loads(_pathFilenameBytesPeak.read_text(encoding='utf-8'))
+	dictionaryBytesPeak: dict[str, int] = {}
+
+	def estimateBytesPeak(kind: str) -> int:
+		return dictionaryBytesPeak.get(kind) or dictionaryBytesPeakEarlier.get(kind) or (bytesBudget or 0) // workersMaximum
+
+	dictionaryResults: dict[键, Any] = {}
+	dictionaryClaimTickets: dict[Future[tuple[Any, int | None, float]], tuple[键, str, int]] = {}
+	bytesAdmitted: int = 0
+
+	with ProcessPoolExecutor(workersMaximum, initializer=initializer, initargs=initargs) as concurrencyManager, tqdm(
+			total=sum(dictionarySecondsEstimate.values()), desc=description, bar_format='{l_bar}{bar}| [{elapsed}<{remaining}{postfix}]'
+			, postfix=f"0/{len(dictionaryTasks)} tasks") as progressBar:
+		while listReady or dictionaryClaimTickets:
+			while listReady and len(dictionaryClaimTickets) < workersMaximum:
+				key = listReady[0][-1]
+				task: TaskIn = dictionaryTasks[key]
+				kind: str = _getKind(task.function)
+				bytesEstimate: int = estimateBytesPeak(kind)
+				if bytesBudget is not None and dictionaryClaimTickets and bytesAdmitted + bytesEstimate > bytesBudget:
+					break
+				heapq.heappop(listReady)
+				bytesAdmitted += bytesEstimate
+				dictionaryClaimTickets[concurrencyManager.submit(_runTask, task.function, *task.arguments)] = (key, kind, bytesEstimate)
+
+			setDone, _setNotDone = wait(dictionaryClaimTickets, return_when=FIRST_COMPLETED)
+			for claimTicket in setDone:
+				key, kind, bytesEstimate = dictionaryClaimTickets.pop(claimTicket)
+				bytesAdmitted -= bytesEstimate
+				if claimTicket.exception() is not None:
+					listReady.clear()
+					wait(dictionaryClaimTickets)
+				dictionaryResults[key], bytesPeak, seconds = claimTicket.result()
+				if bytesPeak is not None:
+					dictionaryBytesPeak[kind] = max(bytesPeak, dictionaryBytesPeak.get(kind, 0))
+				dictionarySeconds.setdefault(kind, {})[repr(key)] = seconds
+				progressBar.set_postfix_str(f"{len(dictionaryResults)}/{len(dictionaryTasks)} tasks", refresh=False)
+				progressBar.update(dictionarySecondsEstimate[key])
+				for dependent in dictionaryDependents[key]:
+					dictionaryWaiting[dependent] -= 1
+					if dictionaryWaiting[dependent] == 0:
+						makeReady(dependent)
+
+	if len(dictionaryResults) < len(dictionaryTasks):
+		message = f"I could not start {len(dictionaryTasks) - len(dictionaryResults)} tasks because their dependencies form a cycle."
+		raise ValueError(message)
+
+	if dictionaryBytesPeak:
+		_pathFilenameBytesPeak.parent.mkdir(parents=True, exist_ok=True)
+		_pathFilenameBytesPeak.write_text(json.dumps(dictionaryBytesPeakEarlier | dictionaryBytesPeak, indent=1, sort_keys=True), encoding='utf-8')
+
+	_pathFilenameSeconds.parent.mkdir(parents=True, exist_ok=True)
+	_pathFilenameSeconds.write_text(json.dumps(dictionarySecondsEarlier | {kind: dictionarySecondsEarlier.get(kind, {}) | secondsKind
+		for kind, secondsKind in dictionarySeconds.items()}, indent=1, sort_keys=True), encoding='utf-8')
+
+	return {key: dictionaryResults[key] for key in dictionaryTasks}
+
+def _getKind(function: Callable[..., Any]) -> str:
+	"""I use this to name the kind of a task, which identifies the memory measurements of similar tasks."""
+	while isinstance(function, partial):
+		function = function.func
+	return getattr(function, '__qualname__', repr(function))
+
+def _runTask(function: Callable[..., Any], *arguments: Any) -> tuple[Any, int | None, float]:
+	"""I use this worker to run one task and to measure the peak resident memory and the duration of the task."""
+	timekeeperResetsPeakMemory()
+	timeStart: float = time.perf_counter()
+	result: Any = function(*arguments)
+	return result, timekeeperGetsPeakMemory(), time.perf_counter() - timeStart
@@ -1,20 +1,28 @@
 """Compile fonts from source files using fontmake and AFDKO makeotf.
 
 You can compile fonts from Glyphs and CIDFont source files. The module compiles fonts from Glyphs source files using `fontmake`
-[1] and compiles fonts from PostScript CIDFont source files using AFDKO `makeotf` [2]. The module uses `multiprocessing.Pool` [3]
-for parallel compilation of multiple font variants.
+[1] and compiles fonts from PostScript CIDFont source files using AFDKO `makeotf` [2]. The module converts a Glyphs source file to
+master UFOs and a designspace [3] one time, and uses `dispatcherRunsTaskGraph` [4] for parallel compilation of the instances of
+the designspace and of multiple CID font variants. Instead of compiling each instance, the module can also compile one
+variable font and instantiate each weight from the variable font with `fontTools.varLib.instancer` [5].
 
 Contents
 --------
 Functions
 	smithy_makeotf
 		Compile a single CID font variant using AFDKO makeotf.
+	smithyBuildsMasters
+		Convert a Glyphs source file to master UFOs and a designspace, or copy them from the build cache.
 	smithyCasts_afdko
 		Compile all CID font variants across locales, weights, and styles.
 	smithyCastsFromGlyphs
 		Compile fonts in OTF and TTF formats from Glyphs source.
+	smithyCastsVariableFont
+		Compile a Glyphs source file one time as a variable font and instantiate a static TrueType font for each weight.
 	smithyFontProject
-		Compile fonts from Glyphs source in a specified format using fontmake.
+		Compile instances of a designspace in the specified formats using fontmake.
+	smithyInstantiatesVariableFont
+		Instantiate one static font from a variable font at one location of the design space.
 
 References
 ----------
@@ -22,32 +30,46 @@ References
 	https://github.com/googlefonts/fontmake
 [2] AFDKO (Adobe Font Development Kit for OpenType)
 	https://adobe-type-tools.github.io/afdko/
-[3] multiprocessing.Pool - Python Standard Library
-	https://docs.python.org/3/library/multiprocessing.html#multiprocessing.pool.Pool
+[3] fontTools.designspaceLib
+	https://fonttools.readthedocs.io/en/latest/designspaceLib/index.html
+[4] Integrated_Code_Fire.dispatch.dispatcherRunsTaskGraph
+	Internal package reference.
+[5] fontTools.varLib.instancer
+	https://fonttools.readthedocs.io/en/latest/varLib/instancer.html
 
 """
 from afdko.makeotf import main as afdko_makeotf
 from fontmake.font_project import FontProject
+from fontTools.designspaceLib import DesignSpaceDocument
+from fontTools.ttLib import TTFont
+from fontTools.varLib import instancer
 from hunterMakesPy.parseParameters import defineConcurrencyLimit
-from Integrated_Code_Fire import LocaleIn, settingsPackage, WeightIn
+from Integrated_Code_Fire import LocaleIn, settingsPackage, TaskIn, WeightIn
 from Integrated_Code_Fire.archivist import archivistGetsLocales, archivistGetsWeights, archivistMakesFilenameStem, Z0Z_make_afdkoOptions
-from itertools import product as CartesianProduct, repeat, starmap
-from multiprocessing import Pool
-from typing import Literal, TYPE_CHECKING
+from Integrated_Code_Fire.dispatch import dispatcherRunsTaskGraph
+from Integrated_Code_Fire.logbook import scribeProfilesTask, scribeRecordsSpan
+from Integrated_Code_Fire.stockroom import storekeeperMakesKey, storekeeperRetrievesArtifact, storekeeperStoresArtifact
+from itertools import product as CartesianProduct
+from pathlib import Path
+from typing import TYPE_CHECKING
+import re as regex
+import shutil
+import tempfile
 
 if TYPE_CHECKING:
-	from collections.abc import Iterable, Iterator
-	from pathlib import Path
+	from collections.abc import Iterable
 
-def smithyCasts_afdko(pathRoot: Path, theLocales: Iterable[str], theStyles: Iterable[str | None], theWeights: Iterable[str], fontFamilyCID: str = 'SourceHanMono', *, CPUlimit: bool | float | int | None = 1) -> list[Path]:
+def smithyCasts_afdko(pathRoot: Path, theLocales: Iterable[str], theStyles: Iterable[str | None], theWeights: Iterable[str], fontFamilyCID: str = 'SourceHanMono', *, CPUlimit: bool | float | int | None = 1, bytesBudget: int | None = None) -> list[Path]:
 	"""Compile all CID font variants across locales, weights, and styles.
 
 	(AI generated docstring)
 
 	You can compile multiple CID font variants in parallel using AFDKO `makeotf` [1]. The function generates AFDKO option
 	tuples using `archivistMakesFilenameStem` [2] and `Z0Z_make_afdkoOptions` [2] for each combination of `theLocales`,
-	`theStyles`, and `theWeights`. The function uses `multiprocessing.Pool` [3] to invoke `smithy_makeotf` in parallel
-	for each variant, with concurrency controlled by `CPUlimit` processed through `defineConcurrencyLimit` [4].
+	`theStyles`, and `theWeights`. The function uses `dispatcherRunsTaskGraph` [3] to invoke `smithy_makeotf` in parallel
+	for each variant, with concurrency controlled by `CPUlimit` processed through `defineConcurrencyLimit` [4]. If `bytesBudget`
+	is not `None`, the dispatcher also starts a compilation only when the peak memory that earlier compilations needed fits in
+	the memory that the running compilations leave in `bytesBudget`.
 
 	Parameters
 	----------
@@ -63,6 +85,8 @@ def smithyCasts_afdko(pathRoot: Path, theLocales: Iterable[str], theStyles: Iter
 		Font family name for CIDFont source files.
 	CPUlimit : bool | float | int | None = 1
 		Maximum concurrency limit passed to `defineConcurrencyLimit` [4].
+	bytesBudget : int | None = None
+		Memory, in bytes, that the compilations may use at the same time, or `None` to limit concurrency only by `CPUlimit`.
 
 	Returns
 	-------
@@ -86,39 +110,37 @@ def smithyCasts_afdko(pathRoot: Path, theLocales: Iterable[str], theStyles: Iter
 	[1] AFDKO (Adobe Font Development Kit for OpenType)
 		https://adobe-type-tools.github.io/afdko/
 	[2] Integrated_Code_Fire.archivist
-	[3] multiprocessing.Pool - Python Standard Library
-		https://docs.python.org/3/library/multiprocessing.html#multiprocessing.pool.Pool
+	[3] Integrated_Code_Fire.dispatch.dispatcherRunsTaskGraph
+		Internal package reference.
 	[4] hunterMakesPy.parseParameters.defineConcurrencyLimit - Context7
 		https://context7.com/hunterhogan/huntermakespy
 
 	"""
 	workersMaximum: int = defineConcurrencyLimit(limit=CPUlimit)
 
-	optionsValues: Iterator[tuple[str, ...]] = starmap(Z0Z_make_afdkoOptions, CartesianProduct([pathRoot], [fontFamilyCID], theLocales, theStyles, theWeights))
-
 	dictionaryLocales: dict[str, LocaleIn] = archivistGetsLocales()
 	dictionaryWeights: dict[str, WeightIn] = archivistGetsWeights()
 
-	listPathFilenamesWrite: list[Path] = []
+	dictionaryTasks: dict[tuple[str, str | None, str], TaskIn] = {}
 
 	pathWrite: Path = settingsPackage.pathWorkbench / fontFamilyCID
 	pathWrite.mkdir(parents=True, exist_ok=True)
 	for locale, style, weight in CartesianProduct(theLocales, theStyles, theWeights):
 		filenameStemWrite: str = archivistMakesFilenameStem(fontFamilyCID, dictionaryLocales[locale].ascii, style, dictionaryWeights[weight].fontFamilyCID)
 		pathFilenameWrite: Path = pathWrite / f"{filenameStemWrite}.otf"
-		listPathFilenamesWrite.append(pathFilenameWrite)
-
-	with Pool(processes=workersMaximum) as concurrencyManager:
-		listPathFilenames: list[Path] = concurrencyManager.starmap(smithy_makeotf, zip(optionsValues, listPathFilenamesWrite, strict=True))
+		dictionaryTasks[(locale, style, weight)] = TaskIn(smithy_makeotf, (Z0Z_make_afdkoOptions(pathRoot, fontFamilyCID, locale, style, weight), pathFilenameWrite))
 
-	return listPathFilenames
+	return list(dispatcherRunsTaskGraph(dictionaryTasks, workersMaximum, f"Compiling {fontFamilyCID}", bytesBudget=bytesBudget).values())
 
+@scribeProfilesTask
 def smithy_makeotf(optionsValues: tuple[str, ...], pathFilenameWrite: Path) -> Path:
 	"""Compile a single CID font variant using AFDKO makeotf.
 
 	(AI generated docstring)
 
-	You can compile a CID font by invoking AFDKO `makeotf` [1] with command-line options.
+	You can compile a CID font by invoking AFDKO `makeotf` [1] with command-line options. When the build cache already has an
+	artifact for the same option values, source file contents, and tool versions, the function copies the cached font from
+	`storekeeperRetrievesArtifact` [3] instead of invoking `makeotf`.
 
 	Parameters
 	----------
@@ -137,39 +159,106 @@ def smithy_makeotf(optionsValues: tuple[str, ...], pathFilenameWrite: Path) -> P
 	[1] AFDKO (Adobe Font Development Kit for OpenType)
 		https://adobe-type-tools.github.io/afdko/
 	[2] Integrated_Code_Fire.archivist.Z0Z_make_afdkoOptions
+	[3] Integrated_Code_Fire.stockroom.storekeeperRetrievesArtifact
+		Internal package reference.
 	"""
-	pathFilenameWrite.parent.mkdir(parents=True, exist_ok=True)
-
-	# TODO is this REALLY the only API? No class? No function?
-	afdko_makeotf([
-		*optionsValues
-		, '-omitMacNames'
-		, '-r'
-		, '-nS'
-		, '-ncn'
-		, '-nshw'
-		, '-o', str(pathFilenameWrite)
-	])
-
-	return pathFilenameWrite
-
-def smithyCastsFromGlyphs(pathFilename: Path, workersMaximum: int = 2, fontFormats: Iterable[str] = frozenset(['otf', 'ttf'])) -> Path:
+	with scribeRecordsSpan('smithy_makeotf', font=pathFilenameWrite.name):
+		optionsFixed: tuple[str, ...] = ('-omitMacNames', '-r', '-nS', '-ncn', '-nshw')
+
+		keyCache: str = storekeeperMakesKey('smithy_makeotf'
+			, [Path(optionValue) if Path(optionValue).is_file() else optionValue for optionValue in optionsValues], optionsFixed, versionStage=1)
+		if storekeeperRetrievesArtifact(keyCache, pathFilenameWrite):
+			return pathFilenameWrite
+
+		pathFilenameWrite.parent.mkdir(parents=True, exist_ok=True)
+
+		# TODO is this REALLY the only API? No class? No function?
+		afdko_makeotf([
+			*optionsValues
+			, *optionsFixed
+			, '-o', str(pathFilenameWrite)
+		])
+
+		return storekeeperStoresArtifact(keyCache, pathFilenameWrite)
+
+def smithyBuildsMasters(pathFilename: Path, pathWrite: Path) -> Path:
+	"""Convert a Glyphs source file to master UFOs and a designspace, or copy them from the build cache.
+
+	(AI generated docstring)
+
+	You can use this function to parse a Glyphs source file one time for every format and instance that fontmake compiles. The
+	function converts `pathFilename` with `FontProject.build_master_ufos` [1], which writes one UFO for each master and one
+	designspace file [2] that describes the masters and the instances, into `pathWrite`. A ZIP archive of `pathWrite` is the build
+	cache artifact [3], keyed by the contents of `pathFilename`, so a later run with the same Glyphs source unpacks the archive
+	instead of parsing the source.
+
+	Parameters
+	----------
+	pathFilename : Path
+		Path to Glyphs source file.
+	pathWrite : Path
+		Directory for the master UFOs and the designspace file. The function removes an earlier directory.
+
+	Returns
+	-------
+	pathFilenameDesignspace : Path
+		Path to the designspace file in `pathWrite`.
+
+	References
+	----------
+	[1] fontmake.font_project.FontProject - Google Fonts
+		https://github.com/googlefonts/fontmake
+	[2] fontTools.designspaceLib
+		https://fonttools.readthedocs.io/en/latest/designspaceLib/index.html
+	[3] Integrated_Code_Fire.stockroom.storekeeperRetrievesArtifact
+		Internal package reference.
+	"""
+	with scribeRecordsSpan('smithyBuildsMasters', font=pathFilename.name):
+		pathFilenameDesignspace: Path = pathWrite / f"{pathFilename.stem}.designspace"
+		pathFilenameArchive: Path = pathWrite.with_name(f"{pathWrite.name}.zip")
+		shutil.rmtree(pathWrite, ignore_errors=True)
+
+		keyCache: str = storekeeperMakesKey('smithyBuildsMasters', pathFilename, versionStage=1)
+		if storekeeperRetrievesArtifact(keyCache, pathFilenameArchive):
+			shutil.unpack_archive(pathFilenameArchive, pathWrite, 'zip')
+			pathFilenameArchive.unlink()
+			return pathFilenameDesignspace
+
+		pathWrite.mkdir(parents=True, exist_ok=True)
+		FontProject().build_master_ufos(
+			glyphs_path=pathFilename
+			, designspace_path=pathFilenameDesignspace
+			, master_dir=pathWrite
+			, instance_dir=pathWrite / 'instance_ufo'
+		)
+
+		storekeeperStoresArtifact(keyCache, Path(shutil.make_archive(str(pathWrite), 'zip', pathWrite)))
+		pathFilenameArchive.unlink()
+		return pathFilenameDesignspace
+
+def smithyCastsFromGlyphs(pathFilename: Path, workersMaximum: int = 2, fontFormats: Iterable[str] = frozenset(['otf', 'ttf']), theWeights: Iterable[str] | None = None) -> Path:
 	"""Compile fonts in OTF and TTF formats from Glyphs source files.
 
 	(AI generated docstring)
 
-	You can compile fonts from a Glyphs source file by invoking `smithyFontProject` in parallel using `multiprocessing.Pool` [1].
-	The function reads the Glyphs source file from `pathFilename`, compiles each format in `fontFormats` using separate worker
-	processes, and writes compiled font files to directories under `settingsPackage.pathWorkbench` [2].
+	You can compile fonts from a Glyphs source file in every format in `fontFormats`. The function parses the Glyphs source file
+	and writes master UFOs and a designspace one time with `smithyBuildsMasters` [1], which reuses the masters of an earlier run
+	from the build cache, into a temporary directory that the function removes after the last task. Then the function dispatches
+	one `smithyFontProject` [2] task for each instance of the designspace whose style name is the Fira Code name,
+	`WeightIn.FiraCode` [6], of a weight in `theWeights` to `dispatcherRunsTaskGraph` [3], and each task interpolates its instance
+	one time and compiles the instance in every format in `fontFormats`. The function never interpolates the other instances. The
+	function writes compiled font files to a directory under `settingsPackage.pathWorkbench` [4].
 
 	Parameters
 	----------
 	pathFilename : Path
 		Path to Glyphs source file.
 	workersMaximum : int = 2
-		Maximum number of parallel worker processes for compiling font formats.
+		Maximum number of parallel worker processes for compiling font instances.
 	fontFormats : Iterable[str] = frozenset(['otf', 'ttf'])
 		Output font formats to compile, where each format is either `'otf'` for OpenType CFF or `'ttf'` for TrueType.
+	theWeights : Iterable[str] | None = None
+		Weight identifiers to compile, or `None` to use `settingsPackage.theWeights`.
 
 	Returns
 	-------
@@ -187,49 +276,214 @@ def smithyCastsFromGlyphs(pathFilename: Path, workersMaximum: int = 2, fontForma
 
 	References
 	----------
-	[1] multiprocessing.Pool - Python Standard Library
-		https://docs.python.org/3/library/multiprocessing.html#multiprocessing.pool.Pool
-	[2] Integrated_Code_Fire.settingsPackage
-	[3] fontmake - Google Fonts
+	[1] Integrated_Code_Fire.foundry.smithyBuildsMasters
+		Internal package reference.
+	[2] Integrated_Code_Fire.foundry.smithyFontProject
+		Internal package reference.
+	[3] Integrated_Code_Fire.dispatch.dispatcherRunsTaskGraph
+		Internal package reference.
+	[4] Integrated_Code_Fire.settingsPackage
+	[5] fontmake - Google Fonts
 		https://github.com/googlefonts/fontmake
+	[6] Integrated_Code_Fire.WeightIn
+		Internal package reference.
 	"""
-	with Pool(processes=workersMaximum) as concurrencyManager:
-		listPaths: list[Path] = concurrencyManager.starmap(smithyFontProject, zip(repeat(pathFilename), fontFormats))
-	return listPaths.pop()
+	if theWeights is None:
+		theWeights = settingsPackage.theWeights
+	dictionaryWeights: dict[str, WeightIn] = archivistGetsWeights()
+	setStyleNames: set[str] = {dictionaryWeights[weight].FiraCode for weight in theWeights} - {''}
 
-def smithyFontProject(pathFilename: Path, fontFormat: Literal['otf', 'ttf']) -> Path:
-	"""Compile fonts from Glyphs source in a specified output format.
+	pathWrite: Path = settingsPackage.pathWorkbench / pathFilename.stem
+	pathWrite.mkdir(parents=True, exist_ok=True)
+	fontFormats = tuple(sorted(fontFormats))
+
+	with tempfile.TemporaryDirectory(prefix=f"{pathFilename.stem}_master_ufo") as pathTemporary:
+		pathFilenameDesignspace: Path = smithyBuildsMasters(pathFilename, Path(pathTemporary) / 'master_ufo')
+		dictionaryTasks: dict[str, TaskIn] = {instance.name: TaskIn(smithyFontProject, (pathFilenameDesignspace, fontFormats, pathWrite, instance.name))
+			for instance in DesignSpaceDocument.fromfile(pathFilenameDesignspace).instances if instance.name and instance.styleName in setStyleNames}
+		dispatcherRunsTaskGraph(dictionaryTasks, workersMaximum, f"Compiling {pathFilename.stem}")
+	return pathWrite
+
+def smithyCastsVariableFont(pathFilename: Path, workersMaximum: int = 2, theWeights: Iterable[str] | None = None) -> Path:
+	"""Compile a Glyphs source file one time as a variable font and instantiate a static TrueType font for each weight.
+
+	(AI generated docstring)
+
+	You can use this function instead of `smithyCastsFromGlyphs` [1] to make the western TrueType fonts. fontmake [2] compiles the
+	master UFOs from `smithyBuildsMasters` [3] one time as a variable TrueType font, which the build cache [4] keeps for later runs
+	with the same Glyphs source. Then the function dispatches one `smithyInstantiatesVariableFont` [5] task for each weight in
+	`theWeights` to `dispatcherRunsTaskGraph` [6]. Instancing a compiled variable font is much faster than interpolating and
+	compiling each instance with fontmake. The masters and the variable font live in a temporary directory that the function
+	removes after the last task. The location of each weight is the location of the designspace instance whose style
+	name is the Fira Code name, `WeightIn.FiraCode` [7], of the weight, so the instances have the same design as the fonts from
+	`smithyCastsFromGlyphs`. Weights without a Fira Code name are skipped.
 
-	You can compile fonts from a Glyphs source file using `fontmake.font_project.FontProject` [1]. The function interpolates font
-	instances, disables autohinting, and writes the compiled font files to an output directory under
-	`settingsPackage.pathWorkbench` [2].
+	The function writes each instance as `{pathFilename.stem}-{WeightIn.FiraCode}.ttf` into the directory that
+	`smithyCastsFromGlyphs` uses, so `prepareGlyphs` [8] scales the instances in the same way.
 
 	Parameters
 	----------
 	pathFilename : Path
 		Path to Glyphs source file.
-	fontFormat : Literal['otf', 'ttf']
-		Output font format, either `'otf'` for OpenType CFF or `'ttf'` for TrueType.
+	workersMaximum : int = 2
+		Maximum number of parallel worker processes for instantiating fonts.
+	theWeights : Iterable[str] | None = None
+		Weight identifiers to instantiate, or `None` to use `settingsPackage.theWeights`.
+
+	Returns
+	-------
+	pathWorkbench : Path
+		Path to directory containing the instantiated font files.
+
+	Raises
+	------
+	ValueError
+		If the designspace has no instance for the Fira Code name of a weight in `theWeights`.
+
+	Examples
+	--------
+	>>> from Integrated_Code_Fire import pathFilenameFiraCodeGlyphsDEFAULT
+	>>> pathTTFont = smithyCastsVariableFont(pathFilenameFiraCodeGlyphsDEFAULT, 4)
+	>>> prepareGlyphs(pathTTFont.glob('*.ttf'), CPUlimit=4)
+
+	References
+	----------
+	[1] Integrated_Code_Fire.foundry.smithyCastsFromGlyphs
+		Internal package reference.
+	[2] fontmake - Google Fonts
+		https://github.com/googlefonts/fontmake
+	[3] Integrated_Code_Fire.foundry.smithyBuildsMasters
+		Internal package reference.
+	[4] Integrated_Code_Fire.stockroom.storekeeperRetrievesArtifact
+		Internal package reference.
+	[5] Integrated_Code_Fire.foundry.smithyInstantiatesVariableFont
+		Internal package reference.
+	[6] Integrated_Code_Fire.dispatch.dispatcherRunsTaskGraph
+		Internal package reference.
+	[7] Integrated_Code_Fire.WeightIn
+		Internal package reference.
+	[8] Integrated_Code_Fire.chopShop.prepareGlyphs
+		Internal package reference.
+	"""
+	if theWeights is None:
+		theWeights = settingsPackage.theWeights
+	dictionaryWeights: dict[str, WeightIn] = archivistGetsWeights()
+
+	pathWrite: Path = settingsPackage.pathWorkbench / pathFilename.stem
+	pathWrite.mkdir(parents=True, exist_ok=True)
+
+	with tempfile.TemporaryDirectory(prefix=f"{pathFilename.stem}_variable") as pathTemporary:
+		pathFilenameDesignspace: Path = smithyBuildsMasters(pathFilename, Path(pathTemporary) / 'master_ufo')
+		designspace: DesignSpaceDocument = DesignSpaceDocument.fromfile(pathFilenameDesignspace)
+
+		pathFilenameVariable: Path = Path(pathTemporary) / f"{pathFilename.stem}-VF.ttf"
+		keyCache: str = storekeeperMakesKey('smithyCastsVariableFont', pathFilename, versionStage=1)
+		if not storekeeperRetrievesArtifact(keyCache, pathFilenameVariable):
+			with scribeRecordsSpan('smithyCastsVariableFont', font=pathFilename.name):
+				pathVariable: Path = Path(pathTemporary) / 'fontmake'
+				FontProject().run_from_designspace(
+					designspace=pathFilenameDesignspace
+					, output=('variable',)
+					, output_dir=pathVariable
+					, autohint=False
+				)
+				next(pathVariable.glob('*.ttf')).replace(pathFilenameVariable)
+				storekeeperStoresArtifact(keyCache, pathFilenameVariable)
+
+		dictionaryTags: dict[str, str] = {axis.name: axis.tag for axis in designspace.axes}
+		dictionaryLocations: dict[str, dict[str, float]] = {instance.styleName: {dictionaryTags[axisName]: value
+				for axisName, value in instance.getFullUserLocation(designspace).items()}
+			for instance in designspace.instances if instance.styleName}
+
+		dictionaryTasks: dict[str, TaskIn] = {}
+		for weight in theWeights:
+			styleName: str = dictionaryWeights[weight].FiraCode
+			if not styleName:
+				continue
+			if styleName not in dictionaryLocations:
+				message: str = f"I received weight {weight!r}, but the designspace of {pathFilename.name} has no instance named {styleName!r}."
+				raise ValueError(message)
+			dictionaryTasks[weight] = TaskIn(smithyInstantiatesVariableFont
+				, (pathFilenameVariable, dictionaryLocations[styleName], pathWrite / f"{pathFilename.stem}-{styleName}.ttf"))
+		dispatcherRunsTaskGraph(dictionaryTasks, workersMaximum, f"Instantiating {pathFilename.stem}")
+	return pathWrite
+
+@scribeProfilesTask
+def smithyFontProject(pathFilenameDesignspace: Path, fontFormats: Iterable[str], pathWrite: Path, instanceName: str | None = None) -> Path:
+	"""Compile instances of a designspace in the specified formats using fontmake.
+
+	You can compile fonts from a designspace that `smithyBuildsMasters` [2] wrote using `fontmake.font_project.FontProject` [1].
+	The function interpolates the instance named `instanceName`, or every instance if `instanceName` is `None`, disables
+	autohinting, and writes each instance in every format in `fontFormats` to `pathWrite`. fontmake interpolates each instance one
+	time and compiles the interpolated instance in every format.
+
+	Parameters
+	----------
+	pathFilenameDesignspace : Path
+		Path to designspace file with master UFOs.
+	fontFormats : Iterable[str]
+		Output font formats, where each format is either `'otf'` for OpenType CFF or `'ttf'` for TrueType.
+	pathWrite : Path
+		Directory for the compiled font files.
+	instanceName : str | None = None
+		Name of the designspace instance to compile, or `None` to compile every instance.
 
 	Returns
 	-------
-	pathDirectory : Path
+	pathWrite : Path
 		Path to directory containing compiled font files.
 
 	References
 	----------
 	[1] fontmake.font_project.FontProject - Google Fonts
 		https://github.com/googlefonts/fontmake
-	[2] Integrated_Code_Fire.settingsPackage
+	[2] Integrated_Code_Fire.foundry.smithyBuildsMasters
+		Internal package reference.
 	"""
-	output_dir: Path = settingsPackage.pathWorkbench / pathFilename.stem
-	output_dir.mkdir(parents=True, exist_ok=True)
-	FontProject().run_from_glyphs(
-		glyphs_path=pathFilename
-		, output=(fontFormat,)
-		, output_dir=output_dir
-		, interpolate=True
-		, autohint=False
-	)
-	return output_dir
+	with scribeRecordsSpan('smithyFontProject', font=instanceName or pathFilenameDesignspace.name):
+		pathWrite.mkdir(parents=True, exist_ok=True)
+		FontProject().run_from_designspace(
+			designspace=pathFilenameDesignspace
+			, output=tuple(fontFormats)
+			, output_dir=pathWrite
+			, interpolate=True if instanceName is None else f"^{regex.escape(instanceName)}$"
+			, autohint=False
+		)
+		return pathWrite
+
+@scribeProfilesTask
+def smithyInstantiatesVariableFont(pathFilenameVariable: Path, axisLocations: dict[str, float], pathFilenameWrite: Path) -> Path:
+	"""Instantiate one static font from a variable font at one location of the design space.
+
+	(AI generated docstring)
+
+	You can use this function to make one static font from a compiled variable font with
+	`fontTools.varLib.instancer.instantiateVariableFont` [1], which pins every axis at `axisLocations` and removes the variation
+	tables. The function keeps overlapping contours and sets the overlap flags, as the instancer does by default.
+
+	Parameters
+	----------
+	pathFilenameVariable : Path
+		Path to the variable font file.
+	axisLocations : dict[str, float]
+		Mapping from the tag of each axis to the user-space coordinate of the instance, such as `{'wght': 400}`.
+	pathFilenameWrite : Path
+		Path to the static font file to write.
+
+	Returns
+	-------
+	pathFilenameWrite : Path
+		Path to the written static font file.
 
+	References
+	----------
+	[1] fontTools.varLib.instancer
+		https://fonttools.readthedocs.io/en/latest/varLib/instancer.html
+	"""
+	with scribeRecordsSpan('smithyInstantiatesVariableFont', font=pathFilenameWrite.name):
+		ttFont: TTFont = TTFont(pathFilenameVariable)
+		instancer.instantiateVariableFont(ttFont, axisLocations, inplace=True, static=True)
+		pathFilenameWrite.parent.mkdir(parents=True, exist_ok=True)
+		ttFont.save(pathFilenameWrite)
+		ttFont.close()
+		return pathFilenameWrite
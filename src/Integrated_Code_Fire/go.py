@@ -2,15 +2,20 @@
 
 You can use this module to merge prepared western fonts with subsetted CID fonts, update OpenType metadata, package locale
 archives, and remove temporary assembly-line artifacts. The module provides the merge stage in `goMerge` and the packaging and
-cleanup stage in `goAssets`.
+cleanup stage in `goAssets`. `goAssemblyLine` runs the CID compile, subset, merge, and packaging stages as one task graph in one
+process pool, so each font moves to its next stage without waiting for the other fonts.
 
 Contents
 --------
 Functions
+	goAssemblyLine
+		Compile, subset, merge, and package every font in one task graph, so each font moves to its next stage as soon as possible.
 	goAssets
 		Package merged fonts into locale archives and remove temporary artifacts.
 	goMerge
 		Merge prepared western fonts with subsetted CID fonts.
+	goUpdatesMetadata
+		Update the OpenType metadata of every merged font in the workbench without merging or compiling the fonts again.
 
 References
 ----------
@@ -22,37 +27,68 @@ References
 	Internal package reference.
 
 """
-from concurrent.futures import as_completed, Future, ProcessPoolExecutor
+from functools import partial
 from hunterMakesPy.parseParameters import defineConcurrencyLimit
 from hunterMakesPy.semiotics import ansiColorReset, AnsiColors
-from Integrated_Code_Fire import LocaleIn, settingsPackage, WeightIn
+from Integrated_Code_Fire import (
+	LocaleIn, pathRootSourceHanMonoDEFAULT, settingsPackage, subsetOptionsDEFAULT, TaskIn, WeightIn)
 from Integrated_Code_Fire.archivist import (
-	archivistGetsLocales, archivistGetsWeights, archivistMakesFilenameStem, archivistMakesNameIDMetadata, archivistUpdatesMetadata)
-from Integrated_Code_Fire.logistics import packerMakesAssets, valetGetsWesternFontPathFilename, valetRemovesFiles, valetRemovesWorkbench
-from Integrated_Code_Fire.machineShop import machinistMergesTTFFonts
+	archivistGetsLocales, archivistGetsWeights, archivistMakesFilenameStem,
+	archivistMakesNameIDMetadata, archivistUpdatesFontFileMetadata, archivistUpdatesMetadata, Z0Z_make_afdkoOptions)
+from Integrated_Code_Fire.chopShop import _cid, _cidTOttf
+from Integrated_Code_Fire.dispatch import dispatcherRunsTaskGraph
+from Integrated_Code_Fire.foundry import smithy_makeotf
+from Integrated_Code_Fire.logbook import (
+	scribeProfilesTask, scribeRecordsSpan, scribeReportsProfiles, scribeStartsProfiling, scribeStartsTrace, scribeWritesTrace)
+from Integrated_Code_Fire.logistics import (
+	packerMakesAssets, packerMakesAssetsLocale, packerMakesCollections, valetGetsWesternFontPathFilename, valetRemovesFiles,
+	valetRemovesWorkbench)
+from Integrated_Code_Fire.machineShop import (
+	machinistCompressesWOFF2, machinistMergesWesternHan, machinistSavesTTFont, machinistSerializesTTFont)
+from Integrated_Code_Fire.stockroom import storekeeperMakesKey, storekeeperRetrievesArtifact, storekeeperStoresArtifact
+from Integrated_Code_Fire.timekeeper import (
+	timekeeperGetsMemoryAvailable, timekeeperGetsPeakMemory, timekeeperReportsCompression, timekeeperReportsPeakMemory)
 from itertools import product as CartesianProduct
 from pathlib import Path
-from tqdm import tqdm
-from typing import TYPE_CHECKING
+from typing import Any, TYPE_CHECKING
 import sys
 import time
 
 if TYPE_CHECKING:
 	from collections.abc import Iterable
+	from fontTools import subset
 	from fontTools.ttLib import TTFont
 	from pathlib import Path
 
 ansiColors = AnsiColors()
 
-def goMerge(fontFormat: str = 'ttf', *, CPUlimit: bool | float | int | None = 1) -> Iterable[Path]:
+_dictionaryFontsWesternSerialized: dict[str, bytes] = {}
+"""I use this per-process mapping from western weight identifiers to serialized western fonts in `_mergeFont` workers."""
+
+def goMerge(fontFormat: str = 'ttf', *, CPUlimit: bool | float | int | None = 1, lowMemory: bool = False, bytesBudget: int | None = None, woff2: bool = False) -> Iterable[Path]:
 	"""Merge prepared western fonts with subsetted CID fonts.
 
 	(AI generated docstring)
 
 	You can use this function to merge prepared western fonts with subsetted CID fonts for every configured locale, style, and
-	weight combination. The function loads western font paths from `valetGetsWesternFontPathFilename` [1], derives name-table
-	metadata with `archivistMakesNameIDMetadata` [2], dispatches `_mergeFont` workers in parallel, and writes merged fonts into
-	`settingsPackage.pathWorkbenchFonts`.
+	weight combination. The function loads western font paths from `valetGetsWesternFontPathFilename` [1], decompiles each western
+	weight one time with `machinistSerializesTTFont` [5], derives name-table metadata with `archivistMakesNameIDMetadata` [2],
+	dispatches `_mergeFont` workers in parallel with `dispatcherRunsTaskGraph` [9], and writes merged fonts into
+	`settingsPackage.pathWorkbenchFonts`. Each worker process receives the serialized western fonts one time, so every locale that
+	shares a western weight reuses the same decompiled tables. The cache key of each merge depends only on the western and Han font
+	contents, so a release that changes only metadata reuses every merged font from the build cache [6].
+
+	If `lowMemory` is `True`, each worker instead opens its western font file, decompiles only the tables that the merge changes,
+	and writes the merged font with `machinistSavesTTFont` [7], which releases each table as soon as the table is written, so no
+	worker holds every western weight or a second copy of the merged font. Whether or not `lowMemory` is `True`, the function
+	writes the peak resident memory of the merge tasks with `timekeeperReportsPeakMemory` [8]. If `bytesBudget` is not `None`, the
+	dispatcher starts a merge only when the peak memory that earlier merges needed fits in the memory that the running merges leave
+	in `bytesBudget`.
+
+	If `woff2` is `True`, the same process pool also compresses each merged font to a WOFF2 web font [10] in
+	`settingsPackage.pathWOFF2` as soon as the merge finishes, and the function writes the compression ratio and time of each font
+	with `timekeeperReportsCompression` [11]. The function does not return the WOFF2 fonts, so `goAssets` neither packages nor
+	removes them.
 
 	Parameters
 	----------
@@ -60,6 +96,12 @@ def goMerge(fontFormat: str = 'ttf', *, CPUlimit: bool | float | int | None = 1)
 		Font file format used for both western input files and subsetted CID input files.
 	CPUlimit : bool | float | int | None = 1
 		Concurrency limit passed to `defineConcurrencyLimit` [3].
+	lowMemory : bool = False
+		Whether to trade speed for a smaller peak memory in each worker.
+	bytesBudget : int | None = None
+		Memory, in bytes, that the merges may use at the same time, or `None` to limit concurrency only by `CPUlimit`.
+	woff2 : bool = False
+		Whether to also write a WOFF2 web font for each merged font into `settingsPackage.pathWOFF2`.
 
 	Returns
 	-------
@@ -82,6 +124,20 @@ def goMerge(fontFormat: str = 'ttf', *, CPUlimit: bool | float | int | None = 1)
 		https://context7.com/hunterhogan/huntermakespy
 	[4] Integrated_Code_Fire.go.goAssets
 		Internal package reference.
+	[5] Integrated_Code_Fire.machineShop.machinistSerializesTTFont
+		Internal package reference.
+	[6] Integrated_Code_Fire.stockroom
+		Internal package reference.
+	[7] Integrated_Code_Fire.machineShop.machinistSavesTTFont
+		Internal package reference.
+	[8] Integrated_Code_Fire.timekeeper.timekeeperReportsPeakMemory
+		Internal package reference.
+	[9] Integrated_Code_Fire.dispatch.dispatcherRunsTaskGraph
+		Internal package reference.
+	[10] Integrated_Code_Fire.go._compressFont
+		Internal package reference.
+	[11] Integrated_Code_Fire.timekeeper.timekeeperReportsCompression
+		Internal package reference.
 
 	"""
 	workersMaximum: int = defineConcurrencyLimit(limit=CPUlimit)
@@ -89,84 +145,261 @@ def goMerge(fontFormat: str = 'ttf', *, CPUlimit: bool | float | int | None = 1)
 	dictionaryLocales: dict[str, LocaleIn] = archivistGetsLocales()
 	dictionaryWeights: dict[str, WeightIn] = archivistGetsWeights()
 
-	dictionaryFontsWestern: dict[str, Path] = valetGetsWesternFontPathFilename(fontFormat)
+	dictionaryPathFilenamesWestern: dict[str, Path] = valetGetsWesternFontPathFilename(fontFormat)
+	dictionaryFontsWestern: dict[str, bytes] = {}
+	if not lowMemory:
+		dictionaryFontsWestern = {weightWestern: machinistSerializesTTFont(pathFilename)
+			for weightWestern, pathFilename in dictionaryPathFilenamesWestern.items()}
 
 	pathCID: Path = settingsPackage.pathWarehouse / 'CID'
 
-	listPathFilenames: Iterable[Path] = []
-	listClaimTickets: list[Future[Path]] = []
+	dictionaryTasks: dict[tuple[str, str, str | None, str], TaskIn] = {}
 
-	with ProcessPoolExecutor(workersMaximum) as concurrencyManager:
+	for locale, style, weight in CartesianProduct(settingsPackage.theLocales, settingsPackage.theStyles, settingsPackage.theWeights):
+		localeIn: LocaleIn = dictionaryLocales[locale]
+		weightIn: WeightIn = dictionaryWeights[weight]
 
-		for locale, style, weight in CartesianProduct(settingsPackage.theLocales, settingsPackage.theStyles, settingsPackage.theWeights):
-			localeIn: LocaleIn = dictionaryLocales[locale]
-			weightIn: WeightIn = dictionaryWeights[weight]
+		fontFamily: str = archivistMakesFilenameStem(settingsPackage.fontFamily, localeIn.IntegratedCode火, separator=' ')
+		pathFilenameHan: Path = pathCID / f"{archivistMakesFilenameStem(None, localeIn.ascii, style, weightIn.fontFamilyCID)}.{fontFormat}"
+		pathFilenameMerged: Path = settingsPackage.pathWorkbenchFonts / f"{archivistMakesFilenameStem(settingsPackage.fontFamily.replace(' ', ''), localeIn.IntegratedCode火, style, weightIn.IntegratedCode火, '')}.{fontFormat}"
+
+		dictionaryTasks[('_mergeFont', locale, style, weight)] = TaskIn(partial(_mergeFont, lowMemory=lowMemory), (
+			dictionaryPathFilenamesWestern[weightIn.fontFamilyWestern]
+			, pathFilenameHan
+			, archivistMakesNameIDMetadata(weightIn.IntegratedCode火, fontFamily.replace(' ', ''), fontFamily)
+			, pathFilenameMerged
+		))
+		if woff2:
+			dictionaryTasks[('_compressFont', locale, style, weight)] = TaskIn(_compressFont
+				, (pathFilenameMerged, settingsPackage.pathWOFF2 / f"{pathFilenameMerged.stem}.woff2"), frozenset([('_mergeFont', locale, style, weight)]), 1)
+
+	dictionaryResults: dict[tuple[str, str, str | None, str], Any] = dispatcherRunsTaskGraph(dictionaryTasks, workersMaximum, "Merging fonts"
+		, initializer=_initializeWorker, initargs=(dictionaryFontsWestern,), bytesBudget=bytesBudget)
+
+	listResultsMerge: list[tuple[Path, int | None]] = [result for key, result in dictionaryResults.items() if key[0] == '_mergeFont']
+	listResultsCompress: list[tuple[Path, int, int, float]] = [result for key, result in dictionaryResults.items() if key[0] == '_compressFont']
+	timekeeperReportsPeakMemory("Merging fonts", [bytesPeak for _pathFilename, bytesPeak in listResultsMerge])
+	timekeeperReportsCompression("WOFF2", listResultsCompress)
+	return [pathFilename for pathFilename, _bytesPeak in listResultsMerge]
+
+@scribeProfilesTask
+def _compressFont(pathFilename: Path, pathFilenameWrite: Path) -> tuple[Path, int, int, float]:
+	"""I use this worker to compress one merged font to a WOFF2 web font and to measure the compression.
+
+	(AI generated docstring)
+
+	I use this function as the parallel worker that `goMerge` [1] and `goAssemblyLine` [2] dispatch after `_mergeFont` writes the
+	merged font. The function writes the WOFF2 font with `machinistCompressesWOFF2` [3]. When the build cache has a WOFF2 font for
+	the same merged font, I copy the WOFF2 font with `storekeeperRetrievesArtifact` [4] instead.
 
-			fontFamily: str = archivistMakesFilenameStem(settingsPackage.fontFamily, localeIn.IntegratedCode火, separator=' ')
+	Parameters
+	----------
+	pathFilename : Path
+		Path to the merged font file.
+	pathFilenameWrite : Path
+		Destination path for the WOFF2 font file in `settingsPackage.pathWOFF2`.
 
-			listClaimTickets.append(concurrencyManager.submit(
-				_mergeFont
-				, dictionaryFontsWestern[weightIn.fontFamilyWestern]
-				, pathCID / f"{archivistMakesFilenameStem(None, localeIn.ascii, style, weightIn.fontFamilyCID)}.{fontFormat}"
-				, archivistMakesNameIDMetadata(weightIn.IntegratedCode火, fontFamily.replace(' ', ''), fontFamily)
-				, settingsPackage.pathWorkbenchFonts / f"{archivistMakesFilenameStem(settingsPackage.fontFamily.replace(' ', ''), localeIn.IntegratedCode火, style, weightIn.IntegratedCode火, '')}.{fontFormat}"
-			))
+	Returns
+	-------
+	pathFilenameWrite : Path
+		Path to the written WOFF2 font file.
+	bytesFont : int
+		Size of the merged font file.
+	bytesWOFF2 : int
+		Size of the WOFF2 font file.
+	seconds : float
+		Wall-clock time of the task.
 
-		for claimTicket in tqdm(as_completed(listClaimTickets), total=len(listClaimTickets), desc = "Merging fonts"):
-			listPathFilenames.append(claimTicket.result())
+	References
+	----------
+	[1] Integrated_Code_Fire.go.goMerge
+		Internal package reference.
+	[2] Integrated_Code_Fire.go.goAssemblyLine
+		Internal package reference.
+	[3] Integrated_Code_Fire.machineShop.machinistCompressesWOFF2
+		Internal package reference.
+	[4] Integrated_Code_Fire.stockroom.storekeeperRetrievesArtifact
+		Internal package reference.
+	"""
+	timeStart: float = time.perf_counter()
+	with scribeRecordsSpan('_compressFont', font=pathFilenameWrite.name):
+		keyCache: str = storekeeperMakesKey('machinistCompressesWOFF2', pathFilename, versionStage=1)
+		if not storekeeperRetrievesArtifact(keyCache, pathFilenameWrite):
+			storekeeperStoresArtifact(keyCache, machinistCompressesWOFF2(pathFilename, pathFilenameWrite))
+	return pathFilenameWrite, pathFilename.stat().st_size, pathFilenameWrite.stat().st_size, time.perf_counter() - timeStart
 
-	return listPathFilenames
+def _initializeWorker(dictionaryFontsWestern: dict[str, bytes]) -> None:
+	"""I use this `ProcessPoolExecutor` initializer to give each `goMerge` worker process the serialized western fonts one time.
 
-def _mergeFont(pathFilenameWestern: Path, pathFilenameHan: Path, nameIDmetadata: dict[int, str], pathFilenameWrite: Path) -> Path:
+	(AI generated docstring)
+
+	Parameters
+	----------
+	dictionaryFontsWestern : dict[str, bytes]
+		Mapping from western weight identifiers to fonts serialized by `machinistSerializesTTFont` [1].
+
+	References
+	----------
+	[1] Integrated_Code_Fire.machineShop.machinistSerializesTTFont
+		Internal package reference.
+	"""
+	_dictionaryFontsWesternSerialized.update(dictionaryFontsWestern)
+
+@scribeProfilesTask
+def _mergeFont(pathFilenameWestern: Path, pathFilenameHan: Path, nameIDmetadata: dict[int, str], pathFilenameWrite: Path, *, lowMemory: bool = False) -> tuple[Path, int | None]:
 	"""I use this worker to merge one western font with one subsetted CID font.
 
 	(AI generated docstring)
 
-	I use this function as the parallel worker dispatched by `goMerge` [1]. The function merges `pathFilenameWestern` and
-	`pathFilenameHan` with `machinistMergesTTFFonts` [2], updates OpenType metadata with `archivistUpdatesMetadata` [3], writes
-	the merged font to `pathFilenameWrite`, and returns `pathFilenameWrite`.
+	I use this function as the parallel worker dispatched by `goMerge` [1]. The function merges the western font and
+	`pathFilenameHan` with `machinistMergesWesternHan` [2], updates OpenType metadata with `archivistUpdatesMetadata` [3], writes
+	the merged font to `pathFilenameWrite`, and returns `pathFilenameWrite` with the peak resident memory of the task [6]. The cache
+	key of the merge depends only on the contents of `pathFilenameWestern` and `pathFilenameHan`, and I make the key in the worker,
+	so `goAssemblyLine` [8] can submit the merge before the Han font exists. When the build cache has a merged font for the key, I
+	copy the merged font with `storekeeperRetrievesArtifact` [4] and only update the metadata with
+	`archivistUpdatesFontFileMetadata` [5]. Updating the metadata is idempotent, so the metadata of the cached artifact does not
+	matter.
 
 	Parameters
 	----------
 	pathFilenameWestern : Path
-		Path to the prepared western font file.
+		Path to the western font file. The stem of the path is the western weight identifier, and when `_initializeWorker`
+		stored the serialized western font of the weight, I merge the serialized font instead of reading the file.
 	pathFilenameHan : Path
 		Path to the subsetted CID-derived font file.
 	nameIDmetadata : dict[int, str]
 		Name-table values written into the merged font.
 	pathFilenameWrite : Path
 		Destination path for the merged font file.
+	lowMemory : bool = False
+		Whether to write the merged font with `machinistSavesTTFont` [7].
 
 	Returns
 	-------
 	pathFilenameWrite : Path
 		Path to the written merged font file.
+	bytesPeak : int | None
+		Peak resident memory of the task from `timekeeperGetsPeakMemory` [6].
 
 	References
 	----------
 	[1] Integrated_Code_Fire.go.goMerge
 		Internal package reference.
-	[2] Integrated_Code_Fire.machineShop.machinistMergesTTFFonts
+	[2] Integrated_Code_Fire.machineShop.machinistMergesWesternHan
 		Internal package reference.
 	[3] Integrated_Code_Fire.archivist.archivistUpdatesMetadata
 		Internal package reference.
+	[4] Integrated_Code_Fire.stockroom.storekeeperRetrievesArtifact
+		Internal package reference.
+	[5] Integrated_Code_Fire.archivist.archivistUpdatesFontFileMetadata
+		Internal package reference.
+	[6] Integrated_Code_Fire.timekeeper.timekeeperGetsPeakMemory
+		Internal package reference.
+	[7] Integrated_Code_Fire.machineShop.machinistSavesTTFont
+		Internal package reference.
+	[8] Integrated_Code_Fire.go.goAssemblyLine
+		Internal package reference.
 	"""
-	ttFont: TTFont = machinistMergesTTFFonts(pathFilenameWestern, pathFilenameHan)
+	with scribeRecordsSpan('_mergeFont', font=pathFilenameWrite.name):
+		keyCache: str = storekeeperMakesKey('machinistMergesWesternHan', pathFilenameWestern, pathFilenameHan, versionStage=1)
+		if storekeeperRetrievesArtifact(keyCache, pathFilenameWrite):
+			with scribeRecordsSpan('metadata', font=pathFilenameWrite.name):
+				archivistUpdatesFontFileMetadata(pathFilenameWrite, nameIDmetadata)
+			return pathFilenameWrite, timekeeperGetsPeakMemory()
 
-	archivistUpdatesMetadata(ttFont, nameIDmetadata)
+		with scribeRecordsSpan('merge', font=pathFilenameWrite.name):
+			ttFont: TTFont = machinistMergesWesternHan(_dictionaryFontsWesternSerialized.get(pathFilenameWestern.stem, pathFilenameWestern), pathFilenameHan)
 
-	pathFilenameWrite.parent.mkdir(parents=True, exist_ok=True)
-	ttFont.save(pathFilenameWrite)
-	ttFont.close()
+		with scribeRecordsSpan('metadata', font=pathFilenameWrite.name):
+			archivistUpdatesMetadata(ttFont, nameIDmetadata)
 
-	return pathFilenameWrite
+		with scribeRecordsSpan('save', font=pathFilenameWrite.name):
+			if lowMemory:
+				machinistSavesTTFont(ttFont, pathFilenameWrite)
+			else:
+				pathFilenameWrite.parent.mkdir(parents=True, exist_ok=True)
+				ttFont.save(pathFilenameWrite)
+				ttFont.close()
 
-def goAssets(listPathFilenames: Iterable[Path], *, CPUlimit: bool | float | int | None = 1) -> None:
-	"""Package merged fonts into locale archives and remove temporary artifacts.
+		return storekeeperStoresArtifact(keyCache, pathFilenameWrite), timekeeperGetsPeakMemory()
+
+def goUpdatesMetadata(fontFormat: str = 'ttf', *, CPUlimit: bool | float | int | None = 1, woff2: bool = False) -> list[Path]:
+	"""Update the OpenType metadata of every merged font in the workbench without merging or compiling the fonts again.
+
+	(AI generated docstring)
+
+	You can use this function after you change `settingsPackage.fontVersion` or `settingsPackage.achVendID` to update the merged
+	fonts that `goMerge` [1] wrote. For each configured locale, style, and weight, the function makes the same name records as
+	`goMerge` with `archivistMakesNameIDMetadata` [2] and updates the merged font with `archivistUpdatesFontFileMetadata` [3],
+	which replaces only the `name`, `head`, and `OS/2` tables in the font file. The function skips merged fonts that do not exist.
+	A WOFF2 font is not updated in place, so if `woff2` is `True`, the function compresses each updated font again with
+	`_compressFont` [4].
+
+	Parameters
+	----------
+	fontFormat : str = 'ttf'
+		File extension of the merged fonts.
+	CPUlimit : bool | float | int | None = 1
+		Concurrency limit passed to `defineConcurrencyLimit` [5].
+	woff2 : bool = False
+		Whether to compress each updated font to a WOFF2 web font again.
+
+	Returns
+	-------
+	listPathFilenames : list[Path]
+		Paths to the updated merged fonts and, if `woff2` is `True`, to the WOFF2 fonts.
+
+	References
+	----------
+	[1] Integrated_Code_Fire.go.goMerge
+		Internal package reference.
+	[2] Integrated_Code_Fire.archivist.archivistMakesNameIDMetadata
+		Internal package reference.
+	[3] Integrated_Code_Fire.archivist.archivistUpdatesFontFileMetadata
+		Internal package reference.
+	[4] Integrated_Code_Fire.go._compressFont
+		Internal package reference.
+	[5] hunterMakesPy.parseParameters.defineConcurrencyLimit
+		https://context7.com/hunterhogan/huntermakespy
+	"""
+	workersMaximum: int = defineConcurrencyLimit(limit=CPUlimit)
+
+	dictionaryLocales: dict[str, LocaleIn] = archivistGetsLocales()
+	dictionaryWeights: dict[str, WeightIn] = archivistGetsWeights()
+
+	dictionaryTasks: dict[tuple[str, str, str | None, str], TaskIn] = {}
+
+	for locale, style, weight in CartesianProduct(settingsPackage.theLocales, settingsPackage.theStyles, settingsPackage.theWeights):
+		localeIn: LocaleIn = dictionaryLocales[locale]
+		weightIn: WeightIn = dictionaryWeights[weight]
+
+		fontFamily: str = archivistMakesFilenameStem(settingsPackage.fontFamily, localeIn.IntegratedCode火, separator=' ')
+		pathFilenameMerged: Path = settingsPackage.pathWorkbenchFonts / f"{archivistMakesFilenameStem(settingsPackage.fontFamily.replace(' ', ''), localeIn.IntegratedCode火, style, weightIn.IntegratedCode火, '')}.{fontFormat}"
+		if not pathFilenameMerged.exists():
+			continue
+
+		dictionaryTasks[('archivistUpdatesFontFileMetadata', locale, style, weight)] = TaskIn(archivistUpdatesFontFileMetadata
+			, (pathFilenameMerged, archivistMakesNameIDMetadata(weightIn.IntegratedCode火, fontFamily.replace(' ', ''), fontFamily)))
+		if woff2:
+			dictionaryTasks[('_compressFont', locale, style, weight)] = TaskIn(_compressFont
+				, (pathFilenameMerged, settingsPackage.pathWOFF2 / f"{pathFilenameMerged.stem}.woff2"), frozenset([('archivistUpdatesFontFileMetadata', locale, style, weight)]), 1)
+
+	dictionaryResults: dict[tuple[str, str, str | None, str], Any] = dispatcherRunsTaskGraph(dictionaryTasks, workersMaximum, "Updating metadata")
+
+	listResultsCompress: list[tuple[Path, int, int, float]] = [result for key, result in dictionaryResults.items() if key[0] == '_compressFont']
+	timekeeperReportsCompression("WOFF2", listResultsCompress)
+	return [*(pathFilename for key, pathFilename in dictionaryResults.items() if key[0] == 'archivistUpdatesFontFileMetadata')
+		, *(result[0] for result in listResultsCompress)]
+
+def goAssets(listPathFilenames: Iterable[Path], *, CPUlimit: bool | float | int | None = 1, collections: bool = False, compressionZIP: str = 'deflate') -> None:
+	"""Package merged fonts into locale archives or font collections and remove temporary artifacts.
 
 	You can use this function to package the merged font files produced by `goMerge` [1] into locale-specific ZIP archives with
-	`packerMakesAssets` [2]. After packaging, the function removes `settingsPackage.pathWorkbenchFonts` and `settingsPackage.pathWorkbench`
-	to leave only warehouse and asset outputs.
+	`packerMakesAssets` [2]. If `collections` is `True`, the function instead packages the merged font files into one font
+	collection for each style and weight with `packerMakesCollections` [4], and the locales of each collection share their
+	identical glyphs and tables. After packaging, the function removes `settingsPackage.pathWorkbenchFonts` and
+	`settingsPackage.pathWorkbench` to leave only warehouse and asset outputs. If profiling is on, the function first writes the
+	combined profile report with `scribeReportsProfiles` [5], because the profiles are in the workbench.
 
 	Parameters
 	----------
@@ -174,6 +407,10 @@ def goAssets(listPathFilenames: Iterable[Path], *, CPUlimit: bool | float | int
 		Merged font file paths to package.
 	CPUlimit : bool | float | int | None = 1
 		Concurrency limit passed to `defineConcurrencyLimit` [3].
+	collections : bool = False
+		Whether to package font collections instead of locale ZIP archives.
+	compressionZIP : str = 'deflate'
+		Compression method of the members of the locale ZIP archives. See `packerWritesZIP` [6].
 
 	References
 	----------
@@ -183,25 +420,212 @@ def goAssets(listPathFilenames: Iterable[Path], *, CPUlimit: bool | float | int
 		Internal package reference.
 	[3] hunterMakesPy.parseParameters.defineConcurrencyLimit
 		https://context7.com/hunterhogan/huntermakespy
+	[4] Integrated_Code_Fire.logistics.packerMakesCollections
+		Internal package reference.
+	[5] Integrated_Code_Fire.logbook.scribeReportsProfiles
+		Internal package reference.
+	[6] Integrated_Code_Fire.logistics.packerWritesZIP
+		Internal package reference.
+	"""
+	workersMaximum: int = defineConcurrencyLimit(limit=CPUlimit)
+	if collections:
+		listPathFilenames = packerMakesCollections(listPathFilenames, workersMaximum)
+	else:
+		listPathFilenames = packerMakesAssets(listPathFilenames, workersMaximum, compressionZIP)
+
+	scribeReportsProfiles()
+	valetRemovesFiles(pathRemove=settingsPackage.pathWorkbenchFonts)
+	valetRemovesWorkbench()
+
+def goAssemblyLine(pathRootCID: Path, subsetOptions: subset.Options, fontFamilyCID: str = 'SourceHanMono', fontFormat: str = 'ttf'
+		, *, CPUlimit: bool | float | int | None = 1, lowMemory: bool = False, bytesBudget: int | None = None, woff2: bool = False
+		, compressionZIP: str = 'deflate') -> frozenset[Path]:
+	"""Compile, subset, merge, and package every font in one task graph, so each font moves to its next stage as soon as possible.
+
+	(AI generated docstring)
+
+	You can use this function instead of running `castCID`, `subsetCID`, `goMerge` [1], and `goAssets` [2] one after another. Those
+	functions each open a process pool and wait for every task before the next function starts, so, for example, no merge starts
+	until the last subset finishes. This function instead gives every task to `dispatcherRunsTaskGraph` [3], which runs the tasks in
+	one shared process pool. For each locale, style, and weight, `smithy_makeotf` [4] compiles the CID font, `_cidTOttf` or `_cid`
+	[5] subsets the compiled font as soon as the compiled font exists, and `_mergeFont` merges the subset font with the western
+	font and updates the metadata as soon as the subset font exists. `packerMakesAssetsLocale` [6] packages each locale as soon as
+	the last font of the locale exists. Later stages have a larger `TaskIn.priority` [7], so a free worker finishes the fonts in
+	progress before the worker compiles another font. The subset tasks of the other weights of each locale and style wait for the
+	subset task of the first weight, so they reuse the glyph closure that the first weight stored in the build cache.
+
+	Each task still uses the build cache, and `lowMemory` and `bytesBudget` have the same meaning as in `subsetCID` and `goMerge`,
+	except that one budget covers the tasks of every stage. If `woff2` is `True`, `_compressFont` also compresses each merged font
+	to a WOFF2 web font in `settingsPackage.pathWOFF2` as soon as the merge finishes; the ZIP archives do not include the WOFF2
+	fonts, and the cleanup keeps them. The function writes the peak resident memory of the subset and merge tasks with
+	`timekeeperReportsPeakMemory` [8]. After packaging, the function removes the compiled CID fonts,
+	`settingsPackage.pathWorkbenchFonts`, and `settingsPackage.pathWorkbench`, as `goAssets` does. The prepared western fonts must
+	already exist; see `prepareGlyphs`.
+
+	Parameters
+	----------
+	pathRootCID : Path
+		Root directory containing CIDFont source files.
+	subsetOptions : subset.Options
+		fontTools subset options for the CID fonts.
+	fontFamilyCID : str = 'SourceHanMono'
+		CIDFont family name used to locate source files and character subset data.
+	fontFormat : str = 'ttf'
+		Font file format of the subset fonts and the merged fonts.
+	CPUlimit : bool | float | int | None = 1
+		Concurrency limit passed to `defineConcurrencyLimit` [9].
+	lowMemory : bool = False
+		Whether to trade speed for a smaller peak memory in each worker.
+	bytesBudget : int | None = None
+		Memory, in bytes, that the tasks may use at the same time, or `None` to limit concurrency only by `CPUlimit`.
+	woff2 : bool = False
+		Whether to also write a WOFF2 web font for each merged font into `settingsPackage.pathWOFF2`.
+	compressionZIP : str = 'deflate'
+		Compression method of the members of the locale ZIP archives. See `packerWritesZIP`.
+
+	Returns
+	-------
+	listPathFilenamesAssets : frozenset[Path]
+		Paths to the locale archives written to `settingsPackage.pathAssets`.
+
+	Examples
+	--------
+	The `__main__` block runs the whole assembly line after the western fonts are prepared.
+
+	>>> goAssemblyLine(pathRootSourceHanMonoDEFAULT, subsetOptionsDEFAULT, CPUlimit=CPUlimit, bytesBudget=bytesBudget)
+
+	References
+	----------
+	[1] Integrated_Code_Fire.go.goMerge
+		Internal package reference.
+	[2] Integrated_Code_Fire.go.goAssets
+		Internal package reference.
+	[3] Integrated_Code_Fire.dispatch.dispatcherRunsTaskGraph
+		Internal package reference.
+	[4] Integrated_Code_Fire.foundry.smithy_makeotf
+		Internal package reference.
+	[5] Integrated_Code_Fire.chopShop._cidTOttf
+		Internal package reference.
+	[6] Integrated_Code_Fire.logistics.packerMakesAssetsLocale
+		Internal package reference.
+	[7] Integrated_Code_Fire.TaskIn
+		Internal package reference.
+	[8] Integrated_Code_Fire.timekeeper.timekeeperReportsPeakMemory
+		Internal package reference.
+	[9] hunterMakesPy.parseParameters.defineConcurrencyLimit
+		https://context7.com/hunterhogan/huntermakespy
 	"""
 	workersMaximum: int = defineConcurrencyLimit(limit=CPUlimit)
-	listPathFilenames = packerMakesAssets(listPathFilenames, workersMaximum)
 
+	dictionaryLocales: dict[str, LocaleIn] = archivistGetsLocales()
+	dictionaryWeights: dict[str, WeightIn] = archivistGetsWeights()
+
+	dictionaryPathFilenamesWestern: dict[str, Path] = valetGetsWesternFontPathFilename(fontFormat)
+	dictionaryFontsWestern: dict[str, bytes] = {}
+	if not lowMemory:
+		dictionaryFontsWestern = {weightWestern: machinistSerializesTTFont(pathFilename)
+			for weightWestern, pathFilename in dictionaryPathFilenamesWestern.items()}
+
+	if fontFormat == 'otf':
+		functionSubsetCID = _cid
+	else:
+		functionSubsetCID = _cidTOttf
+
+	pathCIDCompiled: Path = settingsPackage.pathWorkbench / fontFamilyCID
+	pathCIDCompiled.mkdir(parents=True, exist_ok=True)
+	pathCID: Path = settingsPackage.pathWarehouse / 'CID'
+	pathCID.mkdir(parents=True, exist_ok=True)
+	settingsPackage.pathWorkbenchFonts.mkdir(parents=True, exist_ok=True)
+
+	dictionaryTasks: dict[tuple[str | None, ...], TaskIn] = {}
+	for locale in settingsPackage.theLocales:
+		localeIn: LocaleIn = dictionaryLocales[locale]
+		fontFamily: str = archivistMakesFilenameStem(settingsPackage.fontFamily, localeIn.IntegratedCode火, separator=' ')
+		listKeysMerge: list[tuple[str | None, ...]] = []
+		listPathFilenamesMerged: list[Path] = []
+		dictionaryKeysSubsetFirst: dict[str | None, tuple[str | None, ...]] = {}
+
+		for style, weight in CartesianProduct(settingsPackage.theStyles, settingsPackage.theWeights):
+			weightIn: WeightIn = dictionaryWeights[weight]
+			pathFilenameCompiled: Path = pathCIDCompiled / f"{archivistMakesFilenameStem(fontFamilyCID, localeIn.ascii, style, weightIn.fontFamilyCID)}.otf"
+			pathFilenameHan: Path = pathCID / f"{archivistMakesFilenameStem(None, localeIn.ascii, style, weightIn.fontFamilyCID)}.{fontFormat}"
+			pathFilenameMerged: Path = settingsPackage.pathWorkbenchFonts / f"{archivistMakesFilenameStem(settingsPackage.fontFamily.replace(' ', ''), localeIn.IntegratedCode火, style, weightIn.IntegratedCode火, '')}.{fontFormat}"
+
+			keyMakeotf: tuple[str | None, ...] = ('smithy_makeotf', locale, style, weight)
+			dictionaryTasks[keyMakeotf] = TaskIn(smithy_makeotf
+				, (Z0Z_make_afdkoOptions(pathRootCID, fontFamilyCID, locale, style, weight), pathFilenameCompiled))
+
+			keySubset: tuple[str | None, ...] = (functionSubsetCID.__name__, locale, style, weight)
+			keySubsetFirst: tuple[str | None, ...] = dictionaryKeysSubsetFirst.setdefault(style, keySubset)
+			dictionaryTasks[keySubset] = TaskIn(partial(functionSubsetCID, subsetOptions=subsetOptions, lowMemory=lowMemory)
+				, (pathFilenameCompiled, fontFamilyCID, locale, style, pathFilenameHan)
+				, frozenset([keyMakeotf, keySubsetFirst]) - {keySubset}, 1)
+
+			keyMerge: tuple[str | None, ...] = ('_mergeFont', locale, style, weight)
+			dictionaryTasks[keyMerge] = TaskIn(partial(_mergeFont, lowMemory=lowMemory)
+				, (dictionaryPathFilenamesWestern[weightIn.fontFamilyWestern]
+					, pathFilenameHan
+					, archivistMakesNameIDMetadata(weightIn.IntegratedCode火, fontFamily.replace(' ', ''), fontFamily)
+					, pathFilenameMerged)
+				, frozenset([keySubset]), 2)
+			listKeysMerge.append(keyMerge)
+			listPathFilenamesMerged.append(pathFilenameMerged)
+
+			if woff2:
+				keyCompress: tuple[str | None, ...] = ('_compressFont', locale, style, weight)
+				dictionaryTasks[keyCompress] = TaskIn(_compressFont
+					, (pathFilenameMerged, settingsPackage.pathWOFF2 / f"{pathFilenameMerged.stem}.woff2"), frozenset([keyMerge]), 3)
+
+		pathFilenameZIP: Path = settingsPackage.pathAssets / f"{settingsPackage.fontFamilyASCII.replace(' ', '')}_{localeIn.ascii}.zip"
+		dictionaryTasks[('packerMakesAssetsLocale', locale)] = TaskIn(packerMakesAssetsLocale
+			, (listPathFilenamesMerged, pathFilenameZIP, localeIn, compressionZIP), frozenset(listKeysMerge), 4)
+
+	dictionaryResults: dict[tuple[str | None, ...], Any] = dispatcherRunsTaskGraph(dictionaryTasks, workersMaximum, "Making fonts"
+		, initializer=_initializeWorker, initargs=(dictionaryFontsWestern,), bytesBudget=bytesBudget)
+
+	timekeeperReportsPeakMemory(f"Subsetting {fontFamilyCID}", [result[1] for key, result in dictionaryResults.items() if key[0] == functionSubsetCID.__name__])
+	timekeeperReportsPeakMemory("Merging fonts", [result[1] for key, result in dictionaryResults.items() if key[0] == '_mergeFont'])
+	timekeeperReportsCompression("WOFF2", [result for key, result in dictionaryResults.items() if key[0] == '_compressFont'])
+
+	listPathFilenamesAssets: list[Path] = []
+	for key, result in dictionaryResults.items():
+		if key[0] == 'packerMakesAssetsLocale':
+			listPathFilenamesAssets.extend(result)
+
+	scribeReportsProfiles()
+	valetRemovesFiles(pathRemove=pathCIDCompiled)
 	valetRemovesFiles(pathRemove=settingsPackage.pathWorkbenchFonts)
 	valetRemovesWorkbench()
+	return frozenset(listPathFilenamesAssets)
 
 if __name__ == '__main__':
 	CPUlimit: int = -1
+	bytesBudget: int | None = timekeeperGetsMemoryAvailable()
+	doAssemblyLine = True
+	doWOFF2 = False
+	compressionZIP = 'deflate'
+	doProfile = False
+	doTrace = False
 
 	timeStart: float = time.perf_counter()
-
-	listPathFilenames: Iterable[Path] = goMerge(CPUlimit=CPUlimit)
-	goAssets(listPathFilenames, CPUlimit=CPUlimit)
+	if doProfile:
+		scribeStartsProfiling()
+	if doTrace:
+		scribeStartsTrace()
+
+	if doAssemblyLine:
+		with scribeRecordsSpan('goAssemblyLine'):
+			goAssemblyLine(pathRootSourceHanMonoDEFAULT, subsetOptionsDEFAULT, CPUlimit=CPUlimit, bytesBudget=bytesBudget, woff2=doWOFF2, compressionZIP=compressionZIP)
+	else:
+		with scribeRecordsSpan('goMerge'):
+			listPathFilenames: Iterable[Path] = goMerge(CPUlimit=CPUlimit, bytesBudget=bytesBudget, woff2=doWOFF2)
+		with scribeRecordsSpan('goAssets'):
+			goAssets(listPathFilenames, CPUlimit=CPUlimit, compressionZIP=compressionZIP)
 
 	sys.stdout.write(f"{ansiColors.BlackOnYellow}Done in {time.perf_counter() - timeStart:.2f} seconds.{ansiColorReset}\n")
+	if doTrace:
+		sys.stdout.write(f"Trace written to {scribeWritesTrace()}\n")
 
 # cid-keyed to name-keyed _in-place_
 # merge.
 # don't create assets.
-# sfntedit to share tables.
-# otf2otc.
@@ -0,0 +1,247 @@
+"""Record tracing spans and profiles in every assembly-line process and combine them after the run.
+
+(AI generated docstring)
+
+You can use this module to see where the assembly line spends time, where the processor cores sit idle, and which locale, style,
+and weight combination finishes last. `scribeStartsTrace` turns tracing on. While tracing is on, each `scribeRecordsSpan` block,
+in the main process or in any worker process, appends one complete event in the Chrome trace-event format [1] to a file for the
+process. `scribeWritesTrace` merges the files of all processes into one JSON file that Perfetto [2] opens, and turns tracing
+off.
+
+You can also use this module to see which functions inside the worker processes use the time. `scribeStartsProfiling` turns
+profiling on. While profiling is on, every call of a function decorated with `scribeProfilesTask`, which marks the functions
+that the stages submit to process pools, runs under `cProfile` [3] and writes its statistics to the workbench.
+`scribeReportsProfiles` writes one report of the functions with the largest cumulative time across every task, and turns
+profiling off.
+
+Tracing is on while the directory `settingsPackage.pathTrace / 'spans'` exists, and profiling is on while the directory
+`settingsPackage.pathWorkbench / 'profiles'` exists, so worker processes see each switch no matter which `multiprocessing` start
+method created them. While a switch is off, a span or a decorated task costs one `stat` call.
+
+Contents
+--------
+Functions
+	scribeProfilesTask
+		Decorate a pool-task function so that each call runs under `cProfile` while profiling is on.
+	scribeRecordsSpan
+		Record the duration of a block of code as a tracing span.
+	scribeReportsProfiles
+		Write one report of the functions with the largest cumulative time across every profiled task and turn profiling off.
+	scribeStartsProfiling
+		Turn profiling on and discard the statistics of an earlier run.
+	scribeStartsTrace
+		Turn tracing on and discard the spans of an earlier trace.
+	scribeWritesTrace
+		Merge the spans of every process into one Chrome trace-event file and turn tracing off.
+
+References
+----------
+[1] Trace Event Format
+	https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU
+[2] Perfetto UI
+	https://ui.perfetto.dev/
+[3] The Python Profilers - Python Standard Library
+	https://docs.python.org/3/library/profile.html
+
+"""
+from contextlib import contextmanager
+from functools import wraps
+from Integrated_Code_Fire import settingsPackage
+from pathlib import Path
+from typing import TYPE_CHECKING
+import cProfile
+import json
+import multiprocessing
+import os
+import pstats
+import shutil
+import sys
+import threading
+import time
+
+if TYPE_CHECKING:
+	from collections.abc import Callable, Iterator
+
+_pathSpans: Path = settingsPackage.pathTrace / 'spans'
+"""I use this directory as the switch that turns tracing on and as the place where each process writes its spans."""
+
+_pathProfiles: Path = settingsPackage.pathWorkbench / 'profiles'
+"""I use this directory as the switch that turns profiling on and as the place where each task writes its statistics."""
+
+def scribeProfilesTask[**P, R](function: Callable[P, R]) -> Callable[P, R]:
+	"""Decorate a pool-task function so that each call runs under `cProfile` while profiling is on.
+
+	(AI generated docstring)
+
+	While profiling is on, the decorated function runs under `cProfile.Profile` [1] and writes the statistics of the call to a
+	file in `settingsPackage.pathWorkbench / 'profiles'`, even if the call raises an exception. The decorated function keeps the
+	module and the name of `function`, so process pools can still pickle the decorated function by reference.
+
+	Parameters
+	----------
+	function : Callable[P, R]
+		Function that a stage submits to a process pool.
+
+	Returns
+	-------
+	functionProfiled : Callable[P, R]
+		Function that profiles each call of `function` while profiling is on.
+
+	References
+	----------
+	[1] cProfile.Profile - Python Standard Library
+		https://docs.python.org/3/library/profile.html#profile.Profile
+	"""
+	@wraps(function)
+	def functionProfiled(*arguments: P.args, **keywordArguments: P.kwargs) -> R:
+		if not _pathProfiles.is_dir():
+			return function(*arguments, **keywordArguments)
+		profiler = cProfile.Profile()
+		try:
+			return profiler.runcall(function, *arguments, **keywordArguments)
+		finally:
+			profiler.dump_stats(_pathProfiles / f"{function.__name__}_{os.getpid()}_{time.time_ns()}.prof")
+	return functionProfiled
+
+@contextmanager
+def scribeRecordsSpan(name: str, **args: object) -> Iterator[None]:
+	"""Record the duration of a block of code as a tracing span.
+
+	(AI generated docstring)
+
+	If tracing is on, the context manager writes one complete event, phase 'X' in the Chrome trace-event format [1], with the
+	process ID and the native thread ID of the worker, after the block finishes, even if the block raises an exception. Spans
+	that nest in the same thread appear nested in Perfetto [2].
+
+	Parameters
+	----------
+	name : str
+		Name of the span, usually the name of the stage or the function.
+	**args : object
+		Values that identify the work of the span, such as the font file name. Perfetto shows the values in the details of the
+		span.
+
+	Examples
+	--------
+	>>> with scribeRecordsSpan('_mergeFont', font=pathFilenameWrite.name):
+	...     ttFont = machinistMergesWesternHan(fontWestern, pathFilenameHan)
+
+	References
+	----------
+	[1] Trace Event Format
+		https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU
+	[2] Perfetto UI
+		https://ui.perfetto.dev/
+	"""
+	if not _pathSpans.is_dir():
+		yield
+		return
+
+	timeStart: int = time.time_ns()
+	try:
+		yield
+	finally:
+		timeStop: int = time.time_ns()
+		_writeEvents([{'name': name, 'cat': settingsPackage.identifierPackage, 'ph': 'X', 'ts': timeStart / 1000
+			, 'dur': (timeStop - timeStart) / 1000, 'pid': os.getpid(), 'tid': threading.get_native_id(), 'args': args}])
+
+def scribeReportsProfiles(countFunctions: int = 40) -> None:
+	"""Write one report of the functions with the largest cumulative time across every profiled task and turn profiling off.
+
+	(AI generated docstring)
+
+	The function combines the statistics of every task that `scribeProfilesTask` profiled with `pstats.Stats` [1], writes the
+	`countFunctions` functions with the largest cumulative time to `sys.stdout`, and removes the statistics. If profiling is
+	off, the function does nothing. Call this function before `valetRemovesWorkbench`, which cannot remove subdirectories.
+
+	Parameters
+	----------
+	countFunctions : int = 40
+		Number of functions in the report.
+
+	References
+	----------
+	[1] pstats.Stats - Python Standard Library
+		https://docs.python.org/3/library/profile.html#pstats.Stats
+	"""
+	if not _pathProfiles.is_dir():
+		return
+	listPathFilenames: list[Path] = sorted(_pathProfiles.glob('*.prof'))
+	if listPathFilenames:
+		sys.stdout.write(f"Profile of {len(listPathFilenames)} tasks:\n")
+		pstats.Stats(*map(str, listPathFilenames), stream=sys.stdout).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(countFunctions)
+	shutil.rmtree(_pathProfiles, ignore_errors=True)
+
+def scribeStartsProfiling() -> None:
+	"""Turn profiling on and discard the statistics of an earlier run.
+
+	(AI generated docstring)
+
+	Call this function before the first stage of the assembly line, so that every task that the stages submit to process pools
+	writes statistics.
+	"""
+	shutil.rmtree(_pathProfiles, ignore_errors=True)
+	_pathProfiles.mkdir(parents=True, exist_ok=True)
+
+def scribeStartsTrace() -> None:
+	"""Turn tracing on and discard the spans of an earlier trace.
+
+	(AI generated docstring)
+
+	Call this function before the first stage of the assembly line, so that every worker process that the stages start records
+	spans.
+	"""
+	shutil.rmtree(_pathSpans, ignore_errors=True)
+	_pathSpans.mkdir(parents=True, exist_ok=True)
+
+def scribeWritesTrace(pathFilenameTrace: Path | None = None) -> Path:
+	"""Merge the spans of every process into one Chrome trace-event file and turn tracing off.
+
+	(AI generated docstring)
+
+	The function reads the spans that each process wrote after `scribeStartsTrace`, writes the spans in the JSON object format
+	of the Chrome trace-event format [1], and removes the spans. The span timestamps come from `time.time_ns`, so the spans of
+	different processes share one time axis. You can open the file in Perfetto [2].
+
+	Parameters
+	----------
+	pathFilenameTrace : Path | None = None
+		Path to the trace file to write, or `None` to write `settingsPackage.pathTrace / 'trace.json'`.
+
+	Returns
+	-------
+	pathFilenameTrace : Path
+		Path to the written trace file.
+
+	References
+	----------
+	[1] Trace Event Format
+		https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU
+	[2] Perfetto UI
+		https://ui.perfetto.dev/
+	"""
+	if pathFilenameTrace is None:
+		pathFilenameTrace = settingsPackage.pathTrace / 'trace.json'
+
+	listEvents: list[dict[str, object]] = []
+	for pathFilenameSpans in sorted(_pathSpans.glob('*.jsonl')):
+		listEvents.extend(json.loads(line) for line in pathFilenameSpans.read_text(encoding='utf-8').splitlines())
+	shutil.rmtree(_pathSpans, ignore_errors=True)
+
+	pathFilenameTrace.parent.mkdir(parents=True, exist_ok=True)
+	pathFilenameTrace.write_text(json.dumps({'traceEvents': listEvents, 'displayTimeUnit': 'ms'}), encoding='utf-8')
+	return pathFilenameTrace
+
+def _writeEvents(listEvents: list[dict[str, object]]) -> None:
+	"""I use this to append events to the spans file of the current process and to name the process the first time.
+
+	(AI generated docstring)
+
+	The metadata events name each process track in Perfetto with `multiprocessing.current_process().name`, such as
+	'ForkServerProcess-3', which identifies the worker.
+	"""
+	pathFilenameSpans: Path = _pathSpans / f"{os.getpid()}.jsonl"
+	if not pathFilenameSpans.exists():
+		listEvents = [{'name': 'process_name', 'ph': 'M', 'pid': os.getpid(), 'args': {'name': multiprocessing.current_process().name}}, *listEvents]
+	with pathFilenameSpans.open('a', encoding='utf-8') as writeStream:
+		writeStream.writelines(f"{json.dumps(event, default=str)}\n" for event in listEvents)
@@ -4,7 +4,11 @@
 
 You can use this module to copy compiled font files to the workbench directory, package merged fonts into locale-specific ZIP
 archives, retrieve prepared western font paths, and remove temporary assembly line artifacts. The module provides the file
-staging and cleanup operations used in the Integrated Code 火 assembly line, including packaging with `zipfile.ZipFile` [3].
+staging and cleanup operations used in the Integrated Code 火 assembly line.
+
+`packerWritesZIP` compresses the members of one archive in parallel threads and then writes the archive itself, so the archive is
+byte-for-byte reproducible: the members are in filename order, every member has the same timestamp, and no field depends on the
+machine or the time of the run. Identical fonts therefore make identical archives, and an artifact store can deduplicate them.
 
 Contents
 --------
@@ -13,6 +17,12 @@ Functions
 		Package merged fonts into locale-specific ZIP archives.
 	packerMakesAssetsLocale
 		Package merged fonts for a single locale into a ZIP archive.
+	packerMakesCollection
+		Package the merged fonts of every locale for one style and weight into one font collection.
+	packerMakesCollections
+		Package merged fonts into one font collection for each style and weight.
+	packerWritesZIP
+		Write a reproducible ZIP archive, compressing the members in parallel.
 	valetCopiesToWorkbench
 		Copy font files to the workbench directory.
 	valetGetsWesternFontPathFilename
@@ -28,23 +38,47 @@ References
 	Internal package reference.
 [2] pathlib.Path
 	https://docs.python.org/3/library/pathlib.html
-[3] zipfile.ZipFile
-	https://docs.python.org/3/library/zipfile.html
+[3] ZIP File Format Specification (APPNOTE.TXT)
+	https://pkware.cachefly.net/webdocs/casestudies/APPNOTE.TXT
 
 """
-from concurrent.futures import as_completed, Future, ProcessPoolExecutor
+from concurrent.futures import as_completed, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import suppress
 from Integrated_Code_Fire import LocaleIn, settingsPackage, WeightIn
-from Integrated_Code_Fire.archivist import archivistGetsLocales, archivistGetsWeights
+from Integrated_Code_Fire.archivist import archivistGetsLocales, archivistGetsWeights, archivistMakesFilenameStem
+from Integrated_Code_Fire.logbook import scribeProfilesTask, scribeRecordsSpan
+from Integrated_Code_Fire.machineShop import machinistMakesCollection
+from Integrated_Code_Fire.stockroom import (
+	identifierEnvironmentCacheBypass, storekeeperMakesKey, storekeeperRetrievesArtifact, storekeeperStoresArtifact)
+from itertools import product as CartesianProduct
 from pathlib import Path, PurePath
 from tqdm import tqdm
-from typing import TYPE_CHECKING
-from zipfile import ZIP_DEFLATED, ZipFile
+from typing import NamedTuple, TYPE_CHECKING
+from zipfile import BadZipFile, ZIP_DEFLATED, ZIP_STORED, ZIP_ZSTANDARD, ZipFile
+import os
+import struct
+import zlib
 
 if TYPE_CHECKING:
 	from collections.abc import Iterable
 
+_compressionsZIP: frozenset[str] = frozenset(['deflate', 'zopfli', 'zstandard'])
+"""I use these identifiers of the compression methods of `packerWritesZIP` to validate `compressionZIP`."""
+
+_dateTimeDOS: tuple[int, int] = (0, (1 << 5) | 1)
+"""I use this MS-DOS time and date, 00:00:00 on 1980-01-01, the earliest ZIP timestamp, for every member of every archive."""
+
+class _MemberZIP(NamedTuple):
+	"""I use this to carry one compressed member from a worker thread to the function that writes the archive."""
+
+	name: str
+	method: int
+	crc: int
+	bytesFile: int
+	data: bytes
+
 # SEMIOTICS `packer`.
-def packerMakesAssets(listPathFilenames: Iterable[Path], workersMaximum: int) -> frozenset[Path]:
+def packerMakesAssets(listPathFilenames: Iterable[Path], workersMaximum: int, compressionZIP: str = 'deflate') -> frozenset[Path]:
 	"""Package merged fonts into locale-specific ZIP archives.
 
 	(AI generated docstring)
@@ -59,6 +93,8 @@ def packerMakesAssets(listPathFilenames: Iterable[Path], workersMaximum: int) ->
 		Iterable of paths to merged font files.
 	workersMaximum : int
 		Maximum number of parallel worker processes for packaging operations.
+	compressionZIP : str = 'deflate'
+		Compression method of the archive members. See `packerWritesZIP` [4].
 
 	Returns
 	-------
@@ -71,6 +107,7 @@ def packerMakesAssets(listPathFilenames: Iterable[Path], workersMaximum: int) ->
 	[2] concurrent.futures.ProcessPoolExecutor
 		https://docs.python.org/3/library/concurrent.futures.html#concurrent.futures.ProcessPoolExecutor
 	[3] Integrated_Code_Fire.logistics.packerMakesAssetsLocale
+	[4] Integrated_Code_Fire.logistics.packerWritesZIP
 
 	"""
 	listPathFilenamesAssets: list[Path] = []
@@ -82,7 +119,7 @@ def packerMakesAssets(listPathFilenames: Iterable[Path], workersMaximum: int) ->
 		for locale in settingsPackage.theLocales:
 			localeIn: LocaleIn = dictionaryLocales[locale]
 			pathFilenameZIP: Path = settingsPackage.pathAssets / f"{settingsPackage.fontFamilyASCII.replace(' ', '')}_{localeIn.ascii}.zip"
-			listClaimTickets.append(concurrencyManager.submit(packerMakesAssetsLocale, listPathFilenames, pathFilenameZIP, localeIn))
+			listClaimTickets.append(concurrencyManager.submit(packerMakesAssetsLocale, listPathFilenames, pathFilenameZIP, localeIn, compressionZIP))
 
 		for claimTicket in tqdm(as_completed(listClaimTickets), total = len(listClaimTickets), desc = "Making assets"):
 			listPathFilenamesAssets.extend(claimTicket.result())
@@ -90,14 +127,16 @@ def packerMakesAssets(listPathFilenames: Iterable[Path], workersMaximum: int) ->
 	return frozenset(listPathFilenamesAssets)
 
 # TODO Learn how to create one family with all locales and weights.
-def packerMakesAssetsLocale(listPathFilenames: Iterable[Path], pathFilenameZIP: Path, localeIn: LocaleIn) -> frozenset[Path]:
+@scribeProfilesTask
+def packerMakesAssetsLocale(listPathFilenames: Iterable[Path], pathFilenameZIP: Path, localeIn: LocaleIn, compressionZIP: str = 'deflate') -> frozenset[Path]:
 	"""Package merged fonts for a single locale into a ZIP archive.
 
 	(AI generated docstring)
 
 	You can create a ZIP archive containing all merged font files for a specific locale. The function ensures
 	`settingsPackage.pathAssets` [1] exists, filters `listPathFilenames` to include only files whose stems contain
-	`localeIn.IntegratedCode火`, and writes the filtered files to `pathFilenameZIP` using `ZipFile` [2].
+	`localeIn.IntegratedCode火`, and writes the filtered files to `pathFilenameZIP` using `packerWritesZIP` [2], which skips
+	writing an unchanged archive and copies an archive with the same member names and member contents from the build cache [3].
 
 	Parameters
 	----------
@@ -107,6 +146,8 @@ def packerMakesAssetsLocale(listPathFilenames: Iterable[Path], pathFilenameZIP:
 		Path to ZIP archive file to create.
 	localeIn : LocaleIn
 		Locale identifier instance used to filter font files.
+	compressionZIP : str = 'deflate'
+		Compression method of the archive members. See `packerWritesZIP` [2].
 
 	Returns
 	-------
@@ -116,16 +157,198 @@ def packerMakesAssetsLocale(listPathFilenames: Iterable[Path], pathFilenameZIP:
 	References
 	----------
 	[1] Integrated_Code_Fire.settingsPackage.pathAssets
-	[2] zipfile.ZipFile
-		https://docs.python.org/3/library/zipfile.html
+	[2] Integrated_Code_Fire.logistics.packerWritesZIP
+		Internal package reference.
+	[3] Integrated_Code_Fire.stockroom.storekeeperRetrievesArtifact
+		Internal package reference.
 
 	"""
-	settingsPackage.pathAssets.mkdir(parents=True, exist_ok=True)
-	with ZipFile(pathFilenameZIP, mode = 'w', compression = ZIP_DEFLATED, compresslevel = 9) as zipWrite:
-		for pathFilename in filter(lambda pathFilename: localeIn.IntegratedCode火 in pathFilename.stem, listPathFilenames):
-			zipWrite.write(pathFilename, arcname = pathFilename.name)
+	with scribeRecordsSpan('packerMakesAssetsLocale', archive=pathFilenameZIP.name):
+		settingsPackage.pathAssets.mkdir(parents=True, exist_ok=True)
+		listPathFilenamesLocale: list[Path] = list(filter(lambda pathFilename: localeIn.IntegratedCode火 in pathFilename.stem, listPathFilenames))
+		packerWritesZIP(listPathFilenamesLocale, pathFilenameZIP, compressionZIP)
+		return frozenset([pathFilenameZIP]) # NOTE In the future, there may be more than one asset.
 
-	return frozenset([pathFilenameZIP]) # NOTE In the future, there may be more than one asset.
+def packerMakesCollections(listPathFilenames: Iterable[Path], workersMaximum: int) -> frozenset[Path]:
+	"""Package merged fonts into one font collection for each style and weight.
+
+	(AI generated docstring)
+
+	You can use this function instead of `packerMakesAssets` [1] to package the merged Integrated Code 火 fonts as font collections
+	[2]. The fonts of one style and weight are nearly identical in every locale, so one collection per style and weight stores
+	the western glyphs, the Han glyphs that the locales share, and the identical tables only one time. The function creates
+	`settingsPackage.pathAssets` [3], uses `concurrent.futures.ProcessPoolExecutor` [4] to invoke `packerMakesCollection` [5] for
+	each style and weight in parallel, and returns the set of created collection paths.
+
+	Parameters
+	----------
+	listPathFilenames : Iterable[Path]
+		Iterable of paths to merged font files.
+	workersMaximum : int
+		Maximum number of parallel worker processes for packaging operations.
+
+	Returns
+	-------
+	listPathFilenamesAssets : frozenset[Path]
+		Frozen set of paths to created collection files.
+
+	References
+	----------
+	[1] Integrated_Code_Fire.logistics.packerMakesAssets
+		Internal package reference.
+	[2] Font Collections - OpenType specification
+		https://learn.microsoft.com/en-us/typography/opentype/spec/otff#font-collections
+	[3] Integrated_Code_Fire.settingsPackage.pathAssets
+	[4] concurrent.futures.ProcessPoolExecutor
+		https://docs.python.org/3/library/concurrent.futures.html#concurrent.futures.ProcessPoolExecutor
+	[5] Integrated_Code_Fire.logistics.packerMakesCollection
+		Internal package reference.
+
+	"""
+	listPathFilenamesAssets: list[Path] = []
+	listClaimTickets: list[Future[Iterable[Path]]] = []
+
+	dictionaryLocales: dict[str, LocaleIn] = archivistGetsLocales()
+	dictionaryWeights: dict[str, WeightIn] = archivistGetsWeights()
+	dictionaryPathFilenames: dict[str, Path] = {pathFilename.stem: pathFilename for pathFilename in listPathFilenames}
+
+	with ProcessPoolExecutor(workersMaximum) as concurrencyManager:
+		for style, weight in CartesianProduct(settingsPackage.theStyles, settingsPackage.theWeights):
+			weightIn: WeightIn = dictionaryWeights[weight]
+			listPathFilenamesCollection: list[Path] = []
+			for locale in sorted(settingsPackage.theLocales):
+				filenameStem: str = archivistMakesFilenameStem(settingsPackage.fontFamily.replace(' ', ''), dictionaryLocales[locale].IntegratedCode火, style, weightIn.IntegratedCode火, '')
+				if filenameStem in dictionaryPathFilenames:
+					listPathFilenamesCollection.append(dictionaryPathFilenames[filenameStem])
+			if not listPathFilenamesCollection:
+				continue
+			fontFormatCollection: str = 'ttc' if listPathFilenamesCollection[0].suffix == '.ttf' else 'otc'
+			pathFilenameCollection: Path = settingsPackage.pathAssets / f"{settingsPackage.fontFamilyASCII.replace(' ', '')}_{archivistMakesFilenameStem(None, None, style, weightIn.IntegratedCode火)}.{fontFormatCollection}"
+			listClaimTickets.append(concurrencyManager.submit(packerMakesCollection, listPathFilenamesCollection, pathFilenameCollection))
+
+		for claimTicket in tqdm(as_completed(listClaimTickets), total = len(listClaimTickets), desc = "Making collections"):
+			listPathFilenamesAssets.extend(claimTicket.result())
+
+	return frozenset(listPathFilenamesAssets)
+
+@scribeProfilesTask
+def packerMakesCollection(listPathFilenames: list[Path], pathFilenameCollection: Path) -> frozenset[Path]:
+	"""Package the merged fonts of every locale for one style and weight into one font collection.
+
+	(AI generated docstring)
+
+	You can create one font collection from the merged fonts in `listPathFilenames` with `machinistMakesCollection` [1]. The
+	order of `listPathFilenames` is the order of the fonts in the collection. When the build cache has a collection with the same
+	member names and member contents, the function copies the collection from `storekeeperRetrievesArtifact` [2] instead of
+	making the collection again.
+
+	Parameters
+	----------
+	listPathFilenames : list[Path]
+		Paths to the merged fonts of one style and weight, one font for each locale.
+	pathFilenameCollection : Path
+		Path to the collection file to create.
+
+	Returns
+	-------
+	listPathFilenamesAssets : frozenset[Path]
+		Frozen set containing the path to the created collection file.
+
+	References
+	----------
+	[1] Integrated_Code_Fire.machineShop.machinistMakesCollection
+		Internal package reference.
+	[2] Integrated_Code_Fire.stockroom.storekeeperRetrievesArtifact
+		Internal package reference.
+
+	"""
+	with scribeRecordsSpan('packerMakesCollection', collection=pathFilenameCollection.name):
+		keyCache: str = storekeeperMakesKey('machinistMakesCollection', [(pathFilename.name, pathFilename) for pathFilename in listPathFilenames], versionStage=1)
+		if storekeeperRetrievesArtifact(keyCache, pathFilenameCollection):
+			return frozenset([pathFilenameCollection])
+
+		machinistMakesCollection(listPathFilenames, pathFilenameCollection)
+
+		storekeeperStoresArtifact(keyCache, pathFilenameCollection)
+		return frozenset([pathFilenameCollection])
+
+def packerWritesZIP(listPathFilenames: Iterable[Path], pathFilenameZIP: Path, compressionZIP: str = 'deflate', workersMaximum: int | None = None) -> Path:
+	"""Write a reproducible ZIP archive, compressing the members in parallel.
+
+	(AI generated docstring)
+
+	You can use this function to package files into a ZIP archive [1] faster and more compactly than `zipfile.ZipFile` [2], which
+	compresses one member at a time. The function compresses each member in a `ThreadPoolExecutor` [3], and the compressors
+	release the GIL while they compress, so the members compress at the same time. The function then writes the archive with the
+	members in filename order, with the timestamp 1980-01-01 00:00:00 and the permissions 0644 for every member, so the same
+	files always make the same bytes. A member that does not get smaller, such as a WOFF2 font, is stored without compression.
+
+	The archive comment is the cache key of the member names, the member contents, and `compressionZIP`. If `pathFilenameZIP`
+	already has the same comment, the function does not write the archive again. Otherwise, when the build cache has an archive
+	for the cache key, the function copies the archive from `storekeeperRetrievesArtifact` [4] instead of compressing the members
+	again. The environment variable `identifierEnvironmentCacheBypass` turns off both shortcuts.
+
+	Parameters
+	----------
+	listPathFilenames : Iterable[Path]
+		Paths to the member files. Each member of the archive has the name of its file, without the directory.
+	pathFilenameZIP : Path
+		Path to the ZIP archive file to write.
+	compressionZIP : str = 'deflate'
+		Compression method of the members: 'deflate' for deflate at level 9 with `zlib` [5], 'zopfli' for deflate with Zopfli [6],
+		which makes deflate streams about 5% smaller and takes about 100 times longer, or 'zstandard' for Zstandard at level 19
+		with `compression.zstd` [7]. Every ZIP tool can read deflate members, but only recent ZIP tools can read Zstandard members.
+	workersMaximum : int | None = None
+		Number of threads that compress members, or `None` for the number of processors available to the process.
+
+	Returns
+	-------
+	pathFilenameZIP : Path
+		Path to the written ZIP archive file.
+
+	Raises
+	------
+	ValueError
+		If `compressionZIP` is not a compression method of the function, or if the archive needs ZIP64 extensions.
+
+	References
+	----------
+	[1] ZIP File Format Specification (APPNOTE.TXT)
+		https://pkware.cachefly.net/webdocs/casestudies/APPNOTE.TXT
+	[2] zipfile.ZipFile - Python Standard Library
+		https://docs.python.org/3/library/zipfile.html#zipfile.ZipFile
+	[3] concurrent.futures.ThreadPoolExecutor - Python Standard Library
+		https://docs.python.org/3/library/concurrent.futures.html#concurrent.futures.ThreadPoolExecutor
+	[4] Integrated_Code_Fire.stockroom.storekeeperRetrievesArtifact
+		Internal package reference.
+	[5] zlib - Python Standard Library
+		https://docs.python.org/3/library/zlib.html
+	[6] zopfli - Python bindings for Zopfli
+		https://github.com/fonttools/py-zopfli
+	[7] compression.zstd - Python Standard Library
+		https://docs.python.org/3/library/compression.zstd.html
+	"""
+	if compressionZIP not in _compressionsZIP:
+		message: str = f"I received `{compressionZIP = }`, but I only know the compression methods {sorted(_compressionsZIP)}."
+		raise ValueError(message)
+
+	listPathFilenamesMembers: list[Path] = sorted(listPathFilenames, key=lambda pathFilename: pathFilename.name)
+	keyCache: str = storekeeperMakesKey('packerWritesZIP', [(pathFilename.name, pathFilename) for pathFilename in listPathFilenamesMembers], compressionZIP, versionStage=1)
+
+	if not os.environ.get(identifierEnvironmentCacheBypass) and pathFilenameZIP.exists():
+		with suppress(BadZipFile), ZipFile(pathFilenameZIP) as zipRead:
+			if zipRead.comment == keyCache.encode():
+				return pathFilenameZIP
+	if storekeeperRetrievesArtifact(keyCache, pathFilenameZIP):
+		return pathFilenameZIP
+
+	with ThreadPoolExecutor(workersMaximum or os.process_cpu_count()) as concurrencyManager:
+		listMembers: list[_MemberZIP] = list(concurrencyManager.map(_compressMember, listPathFilenamesMembers, [compressionZIP] * len(listPathFilenamesMembers)))
+
+	pathFilenameZIP.parent.mkdir(parents=True, exist_ok=True)
+	_writeZIP(pathFilenameZIP, listMembers, keyCache.encode())
+	storekeeperStoresArtifact(keyCache, pathFilenameZIP)
+	return pathFilenameZIP
 
 # SEMIOTICS `valet`.
 def valetCopiesToWorkbench(listPathFilenames: Iterable[Path] | None = None, pathRoot: PurePath | None = None, theGlob: str = '*.*') -> frozenset[Path]:
@@ -269,3 +492,53 @@ def valetRemovesWorkbench() -> None:
 		pathFilename.unlink()
 
 	settingsPackage.pathWorkbench.rmdir()
+
+def _compressMember(pathFilename: Path, compressionZIP: str) -> _MemberZIP:
+	"""I use this worker thread to compress one member of a ZIP archive with the compression method `compressionZIP`."""
+	data: bytes = pathFilename.read_bytes()
+	method: int = ZIP_DEFLATED
+	match compressionZIP:
+		case 'zopfli':
+			from zopfli.zopfli import compress  # noqa: PLC0415
+			# Zopfli writes a zlib stream; ZIP members are raw deflate streams without the 2-byte header and the 4-byte Adler-32.
+			dataCompressed: bytes = compress(data)[2:-4]
+		case 'zstandard':
+			from compression import zstd  # noqa: PLC0415
+			dataCompressed = zstd.compress(data, level=19)
+			method = ZIP_ZSTANDARD
+		case _:
+			compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+			dataCompressed = compressor.compress(data) + compressor.flush()
+	if len(dataCompressed) >= len(data):
+		dataCompressed, method = data, ZIP_STORED
+	return _MemberZIP(pathFilename.name, method, zlib.crc32(data), len(data), dataCompressed)
+
+def _writeZIP(pathFilenameZIP: Path, listMembers: list[_MemberZIP], comment: bytes) -> None:
+	"""I use this to write compressed members to a ZIP archive in which no field depends on the machine or the time of the run.
+
+	(AI generated docstring)
+
+	Each member has a local file header, the compressed data, and a central directory header, as in sections 4.3.7 and 4.3.12 of
+	APPNOTE.TXT, and no extra fields. General purpose bit 11 marks a member name that is not ASCII as UTF-8.
+	"""
+	dictionaryVersionNeeded: dict[int, int] = {ZIP_STORED: 10, ZIP_DEFLATED: 20, ZIP_ZSTANDARD: 63}
+	timeDOS, dateDOS = _dateTimeDOS
+	listCentralDirectory: list[bytes] = []
+	with pathFilenameZIP.open('wb') as writeStream:
+		for member in listMembers:
+			offset: int = writeStream.tell()
+			if max(offset, member.bytesFile, len(member.data)) > 0xFFFFFFFF:
+				message: str = f"I cannot write `{member.name}` to `{pathFilenameZIP}` because the archive would need ZIP64 extensions."
+				raise ValueError(message)
+			name: bytes = member.name.encode()
+			flags: int = 0 if member.name.isascii() else 0x800
+			versionNeeded: int = dictionaryVersionNeeded[member.method]
+			writeStream.write(struct.pack('<IHHHHHIIIHH', 0x04034B50, versionNeeded, flags, member.method, timeDOS, dateDOS
+				, member.crc, len(member.data), member.bytesFile, len(name), 0) + name)
+			writeStream.write(member.data)
+			listCentralDirectory.append(struct.pack('<IHHHHHHIIIHHHHHII', 0x02014B50, (3 << 8) | versionNeeded, versionNeeded, flags
+				, member.method, timeDOS, dateDOS, member.crc, len(member.data), member.bytesFile, len(name), 0, 0, 0, 0, 0o100644 << 16, offset) + name)
+		offsetCentralDirectory: int = writeStream.tell()
+		writeStream.writelines(listCentralDirectory)
+		writeStream.write(struct.pack('<IHHHHIIH', 0x06054B50, 0, 0, len(listMembers), len(listMembers)
+			, writeStream.tell() - offsetCentralDirectory, offsetCentralDirectory, len(comment)) + comment)
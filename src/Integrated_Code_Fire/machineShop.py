@@ -4,17 +4,33 @@
 
 You can use this module to perform font manipulation operations in the Integrated Code 火 assembly line. The module provides
 functions that operate on `fontTools.ttLib.TTFont` [3] instances, including CID subsetting with `fontTools.subset.Subsetter` [1]
-and multi-font merging with `fontTools.merge.Merger` [2].
+multi-font merging with `fontTools.merge.Merger` [2], a specialized merge of one western font with one Han font, and font collections [4] that share glyphs and tables.
 
 Contents
 --------
 Functions
+	machinistCompressesWOFF2
+		Compress a font file to a WOFF2 web font.
+	machinistConvertsToTrueType
+		Convert the CFF outlines of a font to TrueType outlines and reuse each outline that an earlier conversion converted.
+	machinistMakesCollection
+		Write one font collection that stores the glyphs and tables that its fonts share only one time.
 	machinistMergesTTFFonts
 		Merge multiple TrueType font files into one `TTFont` instance.
+	machinistMergesWesternHan
+		Merge one western TrueType font and one Han TrueType font without the generic `Merger` passes.
 	machinistModifiesSideBearings
 		Modify horizontal side bearings for all glyphs in a font.
+	machinistReplacesTables
+		Replace the data of some tables in a font file without decompiling or rewriting the other tables.
+	machinistSavesTTFont
+		Write a font directly to a file and release each table as soon as no other table needs the table.
+	machinistSerializesTTFont
+		Decompile every table of a font file once and serialize the decompiled `TTFont`.
 	machinistSubsetsCID
 		Subset a CID font and widen retained glyphs.
+	machinistTransformsGlyphs
+		Scale a TrueType font to a new units-per-em value and widen its glyphs in one pass over the glyph coordinates.
 
 References
 ----------
@@ -24,36 +40,86 @@ References
 	https://fonttools.readthedocs.io/en/latest/merge.html
 [3] fontTools.ttLib.TTFont
 	https://fonttools.readthedocs.io/en/latest/ttLib/ttFont.html
+[4] Font Collections - OpenType specification
+	https://learn.microsoft.com/en-us/typography/opentype/spec/otff#font-collections
+[5] Table Directory - OpenType specification
+	https://learn.microsoft.com/en-us/typography/opentype/spec/otff#table-directory
 
 """
+from afdko.otf2ttf import MAX_ERR, REVERSE_DIRECTION
+from concurrent.futures import ProcessPoolExecutor
 from fontTools import subset
 from fontTools.merge import Merger
-from fontTools.pens.t2CharStringPen import T2CharStringPen
-from fontTools.pens.transformPen import TransformPen
-from fontTools.ttLib import scaleUpem, TTFont
+from fontTools.misc.roundTools import otRound
+from fontTools.pens.cu2quPen import Cu2QuPen
+from fontTools.pens.recordingPen import RecordingPen, replayRecording
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.ttLib import getTableClass, newTable, scaleUpem, TTCollection, TTFont, woff2
+from fontTools.ttLib.sfnt import calcChecksum, SFNTWriter
+from fontTools.ttLib.tables import otTables
+from fontTools.ttLib.tables._c_m_a_p import cmap_classes
+from fontTools.ttLib.tables._g_l_y_f import Glyph
+from fontTools.ttLib.tables.DefaultTable import DefaultTable
+from functools import partial
 from Integrated_Code_Fire import incrementHARDCODED, settingsPackage, widthHalfSourceHanMonoHARDCODED
-from typing import TYPE_CHECKING
+from Integrated_Code_Fire.logbook import scribeRecordsSpan
+from Integrated_Code_Fire.stockroom import (
+	storekeeperMakesKey, storekeeperRetrievesArtifact, storekeeperRetrievesRecords, storekeeperStoresArtifact,
+	storekeeperStoresRecords)
+from itertools import batched
+from math import ceil
+from pathlib import Path
+from typing import Any, NamedTuple, TYPE_CHECKING
+import bisect
+import copy
+import hashlib
+import os
+import pickle
+import struct
+import tempfile
 
 if TYPE_CHECKING:
-	from fontTools.ttLib.ttGlyphSet import _TTGlyphSet
-	from pathlib import Path
+	from collections.abc import Iterable, Mapping, Sequence
+	from fontTools.cffLib import CFFFontSet, CharStrings, PrivateDict, TopDict
+	from fontTools.misc.psCharStrings import T2CharString
+	from fontTools.ttLib.tables._c_m_a_p import CmapSubtable
+	from fontTools.ttLib.tables._g_l_y_f import table__g_l_y_f
+	from numpy.typing import NDArray
+	import numpy
 
-def machinistSubsetsCID(pathFilename: Path, gids: list[int], unicodes: list[int], subsetOptions: subset.Options) -> TTFont:
+def machinistSubsetsCID(pathFilename: Path, gids: Iterable[int], unicodes: Iterable[int], subsetOptions: subset.Options, *, lowMemory: bool = False, trueType: bool = False, workersMaximum: int = 1) -> TTFont:
 	"""Subset a CID font and widen retained glyphs.
 
 	You can load a CID font file, subset the CID font to `gids` and `unicodes` with `fontTools.subset.Subsetter` [1], scale the
-	CID font to `settingsPackage.unitsPerEm` when needed, and widen retained glyphs with `machinistModifiesSideBearings` [2].
+	CID font to `settingsPackage.unitsPerEm` when needed, and widen retained glyphs with `machinistModifiesSideBearings` [2]. If
+	`lowMemory` is `True`, the function opens the CID font with lazy table loading, so tables and lookups that the subsetter never
+	touches are never decompiled.
+
+	The weights of one locale and style have the same glyphs and layout, so the glyph closure over `cmap` and `GSUB` of each weight
+	is the same. The function computes the closure once for the first weight, stores the closure in the build cache [4], and
+	subsets every other weight with the stored closure.
+
+	If `trueType` is `True`, the function converts the subset CFF outlines to TrueType outlines with
+	`machinistConvertsToTrueType` [5] before it scales the font, and scales and widens the TrueType glyphs in one pass with `machinistTransformsGlyphs` [6]. The function
+	divides the error tolerance of the conversion by the scale factor, so the converted outlines have the same tolerance, in
+	units of the em, as outlines converted after scaling.
 
 	Parameters
 	----------
 	pathFilename : Path
 		Path to CID font file to subset.
-	gids : list[int]
-		List of glyph IDs to retain in the subset.
-	unicodes : list[int]
-		List of Unicode codepoints to retain in the subset.
+	gids : Iterable[int]
+		Glyph IDs to retain in the subset.
+	unicodes : Iterable[int]
+		Unicode codepoints to retain in the subset.
 	subsetOptions : subset.Options
 		Subsetting options passed to `fontTools.subset.Subsetter` [1].
+	lowMemory : bool = False
+		Whether to open the CID font with `TTFont(lazy=True)` [3].
+	trueType : bool = False
+		Whether to convert the subset font to TrueType outlines.
+	workersMaximum : int = 1
+		Number of worker processes that convert outlines that no earlier conversion converted, if `trueType` is `True`.
 
 	Returns
 	-------
@@ -66,14 +132,32 @@ def machinistSubsetsCID(pathFilename: Path, gids: list[int], unicodes: list[int]
 		https://fonttools.readthedocs.io/en/latest/subset/index.html
 	[2] Integrated_Code_Fire.machineShop.machinistModifiesSideBearings
 		Internal package reference.
+	[3] fontTools.ttLib.TTFont
+		https://fonttools.readthedocs.io/en/latest/ttLib/ttFont.html
+	[4] Integrated_Code_Fire.stockroom
+		Internal package reference.
+	[5] Integrated_Code_Fire.machineShop.machinistConvertsToTrueType
+		Internal package reference.
+	[6] Integrated_Code_Fire.machineShop.machinistTransformsGlyphs
+		Internal package reference.
 	"""
-	ttFont: TTFont = TTFont(pathFilename)
-	subsetter = subset.Subsetter(subsetOptions)
-	subsetter.populate(gids = gids, unicodes = unicodes)
-	subsetter.subset(ttFont)
+	with scribeRecordsSpan('load', font=pathFilename.name):
+		ttFont: TTFont = TTFont(pathFilename, lazy=lowMemory or None)
+	with scribeRecordsSpan('subset', font=pathFilename.name):
+		subsetter = _SubsetterReusesClosure(subsetOptions)
+		subsetter.populate(gids = gids, unicodes = unicodes)
+		subsetter.subset(ttFont)
+	if trueType:
+		with scribeRecordsSpan('otf_to_ttf', font=pathFilename.name):
+			machinistConvertsToTrueType(ttFont, MAX_ERR * ttFont['head'].unitsPerEm / settingsPackage.unitsPerEm, workersMaximum=workersMaximum)  # ty:ignore[unresolved-attribute]
+		with scribeRecordsSpan('transform', font=pathFilename.name):
+			machinistTransformsGlyphs(ttFont, settingsPackage.unitsPerEm, incrementHARDCODED)
+		return ttFont
 	if settingsPackage.unitsPerEm != 1000:
-		scaleUpem.scale_upem(ttFont, settingsPackage.unitsPerEm)
-	machinistModifiesSideBearings(ttFont, incrementHARDCODED)
+		with scribeRecordsSpan('scale', font=pathFilename.name):
+			scaleUpem.scale_upem(ttFont, settingsPackage.unitsPerEm)
+	with scribeRecordsSpan('sidebearing', font=pathFilename.name):
+		machinistModifiesSideBearings(ttFont, incrementHARDCODED)
 	return ttFont
 
 def machinistModifiesSideBearings(ttFont: TTFont, modifyPerSide: int) -> None:
@@ -86,6 +170,12 @@ def machinistModifiesSideBearings(ttFont: TTFont, modifyPerSide: int) -> None:
 	side bearing for each glyph by `modifyPerSide`, except for half-width glyphs which
 	receive half the modification increment.
 
+	If the font has a `'CFF '` table, the function also moves each outline to the right without drawing the outline. In a Type 2
+	charstring [2], only the width, the first edge of each group of vertical stem hints, and the first moveto are relative to the
+	glyph origin, and every later coordinate is relative to the previous point, so the function changes only those operands in
+	the decompiled charstring program. Subroutines can share those operands between glyphs, so if the font has subroutines, the
+	function first removes the subroutines.
+
 	Parameters
 	----------
 	ttFont : fontTools.ttLib.TTFont
@@ -97,32 +187,341 @@ def machinistModifiesSideBearings(ttFont: TTFont, modifyPerSide: int) -> None:
 	----------
 	[1] fontTools.ttLib.TTFont
 		https://fonttools.readthedocs.io/en/latest/ttLib/ttFont.html
+	[2] The Type 2 Charstring Format - Adobe Technical Note #5177
+		https://adobe-type-tools.github.io/font-tech-notes/pdfs/5177.Type2.pdf
 	"""
-	glyphSet: _TTGlyphSet = ttFont.getGlyphSet()
-	# TODO This doesn't seem to modify the 'CFF ' table, so I'm not sure it really works on CID-keyed fonts.
-	for glyphName, glyph in glyphSet.items():
-		if glyph.width == 0:
+	charStrings: CharStrings | None = None
+	if 'CFF ' in ttFont:
+		cff: CFFFontSet = ttFont['CFF '].cff  # ty:ignore[unresolved-attribute]
+		topDict: TopDict = cff.topDictIndex[0]
+		listPrivates: list[PrivateDict] = [fontDict.Private for fontDict in topDict.FDArray] if hasattr(topDict, 'FDArray') else [topDict.Private]
+		if len(cff.GlobalSubrs) or any(getattr(private, 'Subrs', None) for private in listPrivates):
+			cff.desubroutinize()
+		charStrings = topDict.CharStrings
+
+	tableHmtx = ttFont['hmtx']
+	for glyphName, (width, lsb) in tableHmtx.metrics.items():  # ty:ignore[unresolved-attribute]
+		if width == 0:
 			continue
 
 		addend: int = modifyPerSide
-		if glyph.width == widthHalfSourceHanMonoHARDCODED:
+		if width == widthHalfSourceHanMonoHARDCODED:
 			addend //= 2
 
-		ttFont['hmtx'][glyphName] = (glyph.width + (addend * 2), glyph.lsb + addend)
+		tableHmtx[glyphName] = (width + (addend * 2), lsb + addend)
+		if charStrings is not None:
+			_shiftCharString(charStrings[glyphName], addend)
+
+def machinistTransformsGlyphs(ttFont: TTFont, unitsPerEm: int, modifyPerSide: int = 0) -> None:
+	"""Scale a TrueType font to a new units-per-em value and widen its glyphs in one pass over the glyph coordinates.
+
+	(AI generated docstring)
+
+	You can use this function instead of `fontTools.ttLib.scaleUpem.scale_upem` [1] followed by `machinistModifiesSideBearings`
+	[2] on a font with a `glyf` table. `scale_upem` rounds each coordinate of each glyph in a Python loop, and
+	`machinistModifiesSideBearings` visits each glyph again. This function lets `scale_upem` scale every table except `glyf`,
+	then applies the combined transform, scale to `unitsPerEm` and move right by the added left side bearing, to the coordinates
+	of all simple glyphs at once with NumPy [3], and computes the bounding box of every simple glyph from the transformed
+	coordinates. The function moves the offset of each component of a composite glyph by the difference between the side
+	bearing added to the composite glyph and the side bearing added to the component glyph.
+
+	As in `machinistModifiesSideBearings`, each glyph with a nonzero advance width gets `modifyPerSide` on each side, except
+	half-width glyphs, which get half of `modifyPerSide`. If the font has a `gvar` table, which `scale_upem` scales together with
+	`glyf`, the function scales the whole font with `scale_upem` first and then only widens the glyphs.
+
+	Parameters
+	----------
+	ttFont : fontTools.ttLib.TTFont
+		The font instance to transform.
+	unitsPerEm : int
+		New units-per-em value of the font.
+	modifyPerSide : int = 0
+		The amount to add to each side bearing, in units of the new units-per-em value.
+
+	References
+	----------
+	[1] fontTools.ttLib.scaleUpem
+		https://fonttools.readthedocs.io/en/latest/ttLib/scaleUpem.html
+	[2] Integrated_Code_Fire.machineShop.machinistModifiesSideBearings
+		Internal package reference.
+	[3] NumPy
+		https://numpy.org/doc/stable/
+	"""
+	import numpy  # noqa: PLC0415
+
+	scaleFactor: float = unitsPerEm / ttFont['head'].unitsPerEm  # ty:ignore[unresolved-attribute]
+	if scaleFactor != 1 and 'gvar' in ttFont:
+		scaleUpem.scale_upem(ttFont, unitsPerEm)
+		scaleFactor = 1
+	elif scaleFactor != 1:
+		glyf: table__g_l_y_f = ttFont['glyf']  # pyright: ignore[reportAssignmentType]
+		del ttFont['glyf']
+		scaleUpem.scale_upem(ttFont, unitsPerEm)
+		ttFont['glyf'] = glyf
+	elif modifyPerSide == 0:
+		return
+
+	tableHmtx = ttFont['hmtx']
+	dictionaryAddends: dict[str, int] = {}
+	for glyphName, (width, lsb) in tableHmtx.metrics.items():  # ty:ignore[unresolved-attribute]
+		if width == 0 or modifyPerSide == 0:
+			continue
+		addend: int = modifyPerSide
+		if width == widthHalfSourceHanMonoHARDCODED:
+			addend //= 2
+		tableHmtx[glyphName] = (width + (addend * 2), lsb + addend)
+		dictionaryAddends[glyphName] = addend
+
+	glyf = ttFont['glyf']  # pyright: ignore[reportAssignmentType]
+	listGlyphs: list[Glyph] = []
+	listCoordinates: list[NDArray[numpy.float64]] = []
+	listAddends: list[int] = []
+	for glyphName in ttFont.getGlyphOrder():
+		glyph: Glyph = glyf[glyphName]
+		addend = dictionaryAddends.get(glyphName, 0)
+		if glyph.isComposite():
+			for component in glyph.components:
+				if not hasattr(component, 'firstPt'):
+					component.x = otRound(component.x * scaleFactor) + addend - dictionaryAddends.get(component.glyphName, 0)
+					component.y = otRound(component.y * scaleFactor)
+			glyph.xMin, glyph.xMax = otRound(glyph.xMin * scaleFactor) + addend, otRound(glyph.xMax * scaleFactor) + addend
+			glyph.yMin, glyph.yMax = otRound(glyph.yMin * scaleFactor), otRound(glyph.yMax * scaleFactor)
+		elif glyph.numberOfContours > 0:
+			listGlyphs.append(glyph)
+			listCoordinates.append(numpy.frombuffer(glyph.coordinates.array, numpy.float64))
+			listAddends.append(addend)
+	if not listGlyphs:
+		return
+
+	countsPoints: NDArray[numpy.intp] = numpy.fromiter(map(len, listCoordinates), numpy.intp, len(listCoordinates)) // 2
+	indicesStart: NDArray[numpy.intp] = numpy.concatenate(([0], numpy.cumsum(countsPoints)[:-1]))
+	coordinates: NDArray[numpy.float64] = numpy.floor(numpy.concatenate(listCoordinates).reshape(-1, 2) * scaleFactor + 0.5)
+	coordinates[:, 0] += numpy.repeat(numpy.array(listAddends, numpy.float64), countsPoints)
+	boundsMinimum: NDArray[numpy.float64] = numpy.minimum.reduceat(coordinates, indicesStart)
+	boundsMaximum: NDArray[numpy.float64] = numpy.maximum.reduceat(coordinates, indicesStart)
+
+	coordinatesFlat: NDArray[numpy.float64] = coordinates.ravel()
+	for index, glyph in enumerate(listGlyphs):
+		indexStart: int = int(indicesStart[index]) * 2
+		listCoordinates[index][:] = coordinatesFlat[indexStart:indexStart + listCoordinates[index].size]
+		glyph.xMin, glyph.yMin = map(int, boundsMinimum[index])
+		glyph.xMax, glyph.yMax = map(int, boundsMaximum[index])
+
+def machinistCompressesWOFF2(pathFilename: Path, pathFilenameWrite: Path) -> Path:
+	"""Compress a font file to a WOFF2 web font.
+
+	(AI generated docstring)
+
+	You can use this function to make a web font that a server can send without compressing the font again for each request. The
+	function writes `pathFilename` in the WOFF2 format [1] with `fontTools.ttLib.woff2.compress` [2], which applies the WOFF2
+	preprocessing transform to the `glyf` and `loca` tables and then compresses every table with Brotli [3]. The function does not
+	recalculate bounding boxes or the modification time, so the WOFF2 font decodes to the same tables as `pathFilename`.
+
+	Parameters
+	----------
+	pathFilename : Path
+		Path to the TrueType or OpenType font file to compress.
+	pathFilenameWrite : Path
+		Path to the WOFF2 font file to write, usually with the `.woff2` extension.
+
+	Returns
+	-------
+	pathFilenameWrite : Path
+		Path to the written WOFF2 font file.
+
+	References
+	----------
+	[1] WOFF File Format 2.0 - W3C
+		https://www.w3.org/TR/WOFF2/
+	[2] fontTools.ttLib.woff2
+		https://fonttools.readthedocs.io/en/latest/ttLib/woff2.html
+	[3] Brotli - Google
+		https://github.com/google/brotli
+	"""
+	pathFilenameWrite.parent.mkdir(parents=True, exist_ok=True)
+	woff2.compress(str(pathFilename), str(pathFilenameWrite))
+	return pathFilenameWrite
+
+def machinistConvertsToTrueType(ttFont: TTFont, maxErr: float = MAX_ERR, *, workersMaximum: int = 1) -> None:
+	"""Convert the CFF outlines of a font to TrueType outlines and reuse each outline that an earlier conversion converted.
+
+	(AI generated docstring)
+
+	You can use this function instead of `afdko.otf2ttf.otf_to_ttf` [1], which makes the same `glyf`, `loca`, `maxp`, `post`, and
+	`hmtx` tables. `otf_to_ttf` converts the cubic curves of every glyph to quadratic curves with `Cu2QuPen` [2] in one thread,
+	but most Han glyphs are the same in every locale of a weight, so the assembly line would convert the same outline once for
+	each locale and again in each run. This function draws each glyph into a `RecordingPen` [3] and keys the glyph with the digest
+	of the drawing, `maxErr`, and the versions in `storekeeperMakesKey` [4]. The key depends on the outline, not on the
+	charstring, because the subsetter renumbers subroutines, so the charstring of one glyph differs between locales. The function
+	reads the compiled glyph of each key from the build cache with `storekeeperRetrievesRecords` [5], converts only the outlines
+	that the build cache does not have, and writes them with `storekeeperStoresRecords` [6]. If `workersMaximum` is larger than
+	1, worker processes convert the missing outlines in chunks of glyphs. Each compiled glyph has its bounding box, so the
+	function reads the left side bearing from the glyph header and does not decompile the glyph.
+
+	Parameters
+	----------
+	ttFont : fontTools.ttLib.TTFont
+		Font with a `CFF ` table to convert in place.
+	maxErr : float = MAX_ERR
+		Largest distance, in font units, between a cubic curve and its quadratic approximation.
+	workersMaximum : int = 1
+		Number of worker processes that convert outlines that the build cache does not have.
+
+	Raises
+	------
+	ValueError
+		If `ttFont` does not have CFF outlines.
+
+	References
+	----------
+	[1] afdko.otf2ttf.otf_to_ttf
+		https://adobe-type-tools.github.io/afdko/
+	[2] fontTools.pens.cu2quPen.Cu2QuPen
+		https://fonttools.readthedocs.io/en/latest/pens/cu2quPen.html
+	[3] fontTools.pens.recordingPen.RecordingPen
+		https://fonttools.readthedocs.io/en/latest/pens/recordingPen.html
+	[4] Integrated_Code_Fire.stockroom.storekeeperMakesKey
+		Internal package reference.
+	[5] Integrated_Code_Fire.stockroom.storekeeperRetrievesRecords
+		Internal package reference.
+	[6] Integrated_Code_Fire.stockroom.storekeeperStoresRecords
+		Internal package reference.
+	"""
+	if ttFont.sfntVersion != 'OTTO' or 'CFF ' not in ttFont:
+		message: str = f"I received a font with sfntVersion {ttFont.sfntVersion!r}, but I need a font with a 'CFF ' table."
+		raise ValueError(message)
+
+	glyphOrder: list[str] = ttFont.getGlyphOrder()
+	glyphSet = ttFont.getGlyphSet()
+	prefixKey: bytes = storekeeperMakesKey('machinistConvertsToTrueType', maxErr, REVERSE_DIRECTION, versionStage=1).encode()
+	dictionaryKeys: dict[str, bytes] = {}
+	dictionaryOutlines: dict[bytes, list[tuple[str, tuple[Any, ...]]]] = {}
+	for glyphName in glyphOrder:
+		pen = RecordingPen()
+		glyphSet[glyphName].draw(pen)
+		key: bytes = hashlib.sha256(prefixKey + repr(pen.value).encode()).digest()
+		dictionaryKeys[glyphName] = key
+		dictionaryOutlines[key] = pen.value
+
+	dictionaryData: dict[bytes, bytes] = storekeeperRetrievesRecords('machinistConvertsToTrueType', dictionaryOutlines)
+	listKeysMissing: list[bytes] = [key for key in dictionaryOutlines if key not in dictionaryData]
+	if listKeysMissing:
+		listOutlines: list[list[tuple[str, tuple[Any, ...]]]] = [dictionaryOutlines[key] for key in listKeysMissing]
+		if workersMaximum > 1:
+			sizeChunk: int = ceil(len(listOutlines) / (workersMaximum * 4))
+			with ProcessPoolExecutor(workersMaximum) as concurrencyManager:
+				listData: list[bytes] = [data for listDataChunk in concurrencyManager.map(partial(_convertOutlines, maxErr=maxErr), batched(listOutlines, sizeChunk, strict=False))
+					for data in listDataChunk]
+		else:
+			listData = _convertOutlines(listOutlines, maxErr)
+		dictionaryDataMissing: dict[bytes, bytes] = dict(zip(listKeysMissing, listData, strict=True))
+		storekeeperStoresRecords('machinistConvertsToTrueType', dictionaryDataMissing)
+		dictionaryData.update(dictionaryDataMissing)
+
+	glyf: table__g_l_y_f = newTable('glyf')  # pyright: ignore[reportAssignmentType]
+	glyf.glyphOrder = glyphOrder
+	glyf.glyphs = {}
+	tableHmtx = ttFont['hmtx']
+	for glyphName in glyphOrder:
+		data: bytes = dictionaryData[dictionaryKeys[glyphName]]
+		glyf.glyphs[glyphName] = Glyph(data)
+		if data:
+			tableHmtx[glyphName] = (tableHmtx[glyphName][0], struct.unpack_from('>h', data, 2)[0])
+	ttFont['loca'] = newTable('loca')
+	ttFont['glyf'] = glyf
+	del ttFont['CFF ']
+	if 'VORG' in ttFont:
+		del ttFont['VORG']
+
+	maxp = newTable('maxp')
+	maxp.tableVersion = 0x00010000
+	maxp.maxZones = 1
+	maxp.maxTwilightPoints = 0
+	maxp.maxStorage = 0
+	maxp.maxFunctionDefs = 0
+	maxp.maxInstructionDefs = 0
+	maxp.maxStackElements = 0
+	maxp.maxSizeOfInstructions = 0
+	maxp.maxComponentElements = 0
+	ttFont['maxp'] = maxp
+	maxp.compile(ttFont)
+
+	post = ttFont['post']
+	post.formatType = 2.0  # ty:ignore[unresolved-attribute]
+	post.extraNames = []  # ty:ignore[unresolved-attribute]
+	post.mapping = {}  # ty:ignore[unresolved-attribute]
+	post.glyphOrder = glyphOrder  # ty:ignore[unresolved-attribute]
+	try:
+		post.compile(ttFont)
+	except OverflowError:
+		post.formatType = 3  # ty:ignore[unresolved-attribute]
+
+	ttFont.sfntVersion = '\x00\x01\x00\x00'
+
+def machinistMakesCollection(listPathFilenames: Sequence[Path], pathFilenameWrite: Path) -> Path:
+	"""Write one font collection that stores the glyphs and tables that its fonts share only one time.
+
+	(AI generated docstring)
+
+	You can use this function to put the fonts of one style and weight, one font per locale, into one TrueType Collection [1].
+	The fonts repeat every western glyph and thousands of Han glyphs, but each font subsets a different set of Han glyphs, so
+	their `glyf` tables are not identical, and `TTCollection.save` [2] alone could not share them.
+
+	The function makes one glyph set for the collection: each glyph whose outline, instructions, and horizontal metrics are
+	identical in two fonts is stored one time, no matter which glyph ID or glyph name the glyph has in each font. The fonts of the
+	collection share one `glyf`, `loca`, `hmtx`, `hhea`, `maxp`, and `post` table for that glyph set. Every other table of each
+	font, such as `cmap`, `GSUB`, `GPOS`, and `GDEF`, is recompiled with the glyph IDs of the collection glyph set, and
+	`TTCollection.save` stores identical tables, such as `head` and `gasp`, one time. The `name` and `OS/2` tables of each font are
+	not changed. The function drops `DSIG`, `hdmx`, `LTSH`, `VDMX`, `vhea`, and `vmtx`, because those tables hold one record per
+	glyph of the original font.
+
+	When the fonts do not have `glyf` tables, the function writes the fonts unchanged, and the collection shares only the tables
+	that are already identical, the same as the AFDKO `otf2otc` tool.
+
+	Parameters
+	----------
+	listPathFilenames : Sequence[Path]
+		Paths to the fonts of the collection, in the order of the fonts in the collection.
+	pathFilenameWrite : Path
+		Path to the collection file to write, usually with the `.ttc` extension.
+
+	Returns
+	-------
+	pathFilenameWrite : Path
+		Path to the written collection file.
+
+	References
+	----------
+	[1] Font Collections - OpenType specification
+		https://learn.microsoft.com/en-us/typography/opentype/spec/otff#font-collections
+	[2] fontTools.ttLib.ttCollection.TTCollection
+		https://fonttools.readthedocs.io/en/latest/ttLib/ttCollection.html
+	"""
+	listFonts: list[TTFont] = [TTFont(pathFilename) for pathFilename in listPathFilenames]
+	ttCollection = TTCollection()
+	if all('glyf' in ttFont for ttFont in listFonts):
+		ttCollection.fonts = _shareGlyphs(listFonts)
+	else:
+		ttCollection.fonts = listFonts
 
-		glyph.draw(TransformPen(T2CharStringPen(glyph.width + (addend * 2), glyphSet), (1, 0, 0, 1, addend, 0))) # ty:ignore[invalid-argument-type] https://github.com/astral-sh/ty/issues/2799
+	pathFilenameWrite.parent.mkdir(parents=True, exist_ok=True)
+	ttCollection.save(pathFilenameWrite, shareTables=True)
+	for ttFont in listFonts:
+		ttFont.close()
+	return pathFilenameWrite
 
-def machinistMergesTTFFonts(*pathFilenamesFonts: Path) -> TTFont:
-	"""Merge multiple TrueType font files into one `TTFont` instance.
+def machinistMergesTTFFonts(*fonts: Path | bytes) -> TTFont:
+	"""Merge multiple TrueType fonts into one `TTFont` instance.
 
-	You can use this function to merge multiple TrueType font files with `fontTools.merge.Merger` [1]. The assembly line calls
+	You can use this function to merge multiple TrueType fonts with `fontTools.merge.Merger` [1]. The assembly line calls
 	`machinistMergesTTFFonts` after CID fonts have already been converted away from CID-keyed outlines, because direct merging of
-	CID-keyed fonts is not viable for the western and Han sources used here.
+	CID-keyed fonts is not viable for the western and Han sources used here. Each element of `fonts` is either a font file path or
+	a serialized `TTFont` from `machinistSerializesTTFont` [2], so a font that is merged many times is decompiled only once.
 
 	Parameters
 	----------
-	*pathFilenamesFonts : Path
-		Input font file paths passed to `fontTools.merge.Merger` [1].
+	*fonts : Path | bytes
+		Input font file paths or serialized `TTFont` instances passed to `fontTools.merge.Merger` [1].
 
 	Returns
 	-------
@@ -133,5 +532,843 @@ def machinistMergesTTFFonts(*pathFilenamesFonts: Path) -> TTFont:
 	----------
 	[1] fontTools.merge.Merger
 		https://fonttools.readthedocs.io/en/latest/merge.html
+	[2] Integrated_Code_Fire.machineShop.machinistSerializesTTFont
+		Internal package reference.
+	"""
+	return _MergerSerialized().merge(fonts)
+
+def machinistMergesWesternHan(fontWestern: Path | bytes, pathFilenameHan: Path) -> TTFont:
+	"""Merge one western TrueType font and one Han TrueType font without the generic `Merger` passes.
+
+	(AI generated docstring)
+
+	You can use this function instead of `machinistMergesTTFFonts` [1] when the inputs are exactly one western font and one Han
+	font whose character maps do not overlap, which is always true in the Integrated Code 火 assembly line. The function makes the
+	same merged font as `fontTools.merge.Merger` [2] for those inputs, but the function does much less work.
+
+	- The glyph order is the western glyph order followed by the Han glyph order. A Han glyph name that is already in the western
+		glyph order receives the `Merger` suffix, such as `.notdef.1`.
+	- The Han `glyf` records are spliced into the western `glyf` table as compiled bytes, so simple Han glyphs are never
+		decompiled. `loca` is rebuilt when the font is compiled.
+	- `hmtx` and `cmap` are dictionary unions. When a code point is in both character maps, the western glyph wins, and the
+		function does not synthesize the `locl` lookup that `Merger` would synthesize.
+	- The Han `GSUB` and `GPOS` lookups and features are appended after the western lookups and features, and the Han lookup,
+		feature, and mark-filtering-set indices are offset to match. Scripts and language systems with the same tag are joined.
+	- `head`, `hhea`, `maxp`, `OS/2`, and `post` receive the same field merges as `Merger`, computed from the two tables instead
+		of from every glyph.
+
+	The returned font has `recalcBBoxes` set to `False`, because the bounding boxes of both inputs are already correct, and
+	recalculating them would decompile every glyph when the font is saved.
+
+	Parameters
+	----------
+	fontWestern : Path | bytes
+		Path to the western font file or a serialized `TTFont` from `machinistSerializesTTFont` [3].
+	pathFilenameHan : Path
+		Path to the Han font file.
+
+	Returns
+	-------
+	ttFont : TTFont
+		Merged font instance.
+
+	References
+	----------
+	[1] Integrated_Code_Fire.machineShop.machinistMergesTTFFonts
+		Internal package reference.
+	[2] fontTools.merge.Merger
+		https://fonttools.readthedocs.io/en/latest/merge.html
+	[3] Integrated_Code_Fire.machineShop.machinistSerializesTTFont
+		Internal package reference.
+	"""
+	if isinstance(fontWestern, bytes):
+		ttFont: TTFont = pickle.loads(fontWestern)  # noqa: S301
+	else:
+		# NOTE Decompile the tables that the merge changes before the glyph order changes; other tables are copied as raw data.
+		ttFont = TTFont(fontWestern)
+		for tableTag in ('head', 'hhea', 'maxp', 'OS/2', 'post', 'cmap', 'hmtx', 'glyf', 'GDEF', 'GSUB', 'GPOS'):
+			if tableTag in ttFont and hasattr(table := ttFont[tableTag], 'ensureDecompiled'):
+				table.ensureDecompiled()
+
+	glyphOrderWestern: list[str] = ttFont.getGlyphOrder()
+	glyphNamesWestern: set[str] = set(glyphOrderWestern)
+
+	# NOTE `TTFont.getGlyphOrder` may decompile 'post' or 'cmap' with the original glyph names, so I open the Han font a second time
+	# and set the new glyph names before any table is decompiled. `Merger.merge` uses the same technique.
+	glyphOrderHan: list[str] = []
+	with TTFont(pathFilenameHan) as fontHanGlyphOrder:
+		for glyphName in fontHanGlyphOrder.getGlyphOrder():
+			glyphNameHan: str = glyphName
+			suffix: int = 1
+			while glyphNameHan in glyphNamesWestern:
+				glyphNameHan = f"{glyphName}.{suffix}"
+				suffix += 1
+			glyphOrderHan.append(glyphNameHan)
+
+	fontHan: TTFont = TTFont(pathFilenameHan)
+	fontHan.setGlyphOrder(glyphOrderHan)
+
+	glyphOrder: list[str] = glyphOrderWestern + glyphOrderHan
+	ttFont.setGlyphOrder(glyphOrder)
+
+	glyfWestern: table__g_l_y_f = ttFont['glyf']  # pyright: ignore[reportAssignmentType]
+	glyfHan: table__g_l_y_f = fontHan['glyf']  # pyright: ignore[reportAssignmentType]
+	for glyph in glyfHan.glyphs.values():
+		if glyph.isComposite():
+			glyph.expand(glyfHan)
+	glyfWestern.glyphs.update(glyfHan.glyphs)
+	glyfWestern.setGlyphOrder(glyphOrder)
+
+	ttFont['hmtx'].metrics.update(fontHan['hmtx'].metrics)  # ty:ignore[unresolved-attribute]
+
+	_mergeCmap(ttFont, fontHan)
+	_mergeMetricsTables(ttFont, fontHan)
+
+	gdefWestern: otTables.GDEF | None = ttFont['GDEF'].table if 'GDEF' in ttFont else None  # ty:ignore[unresolved-attribute]
+	gdefHan: otTables.GDEF | None = fontHan['GDEF'].table if 'GDEF' in fontHan else None  # ty:ignore[unresolved-attribute]
+	markFilteringSetOffset: int = 0
+	if gdefWestern is not None and getattr(gdefWestern, 'MarkGlyphSetsDef', None):
+		markFilteringSetOffset = len(gdefWestern.MarkGlyphSetsDef.Coverage)
+
+	for tableTag in ('GSUB', 'GPOS'):
+		if tableTag not in fontHan:
+			continue
+		if tableTag not in ttFont:
+			ttFont[tableTag] = fontHan[tableTag]
+			continue
+		_appendLayout(ttFont[tableTag].table, fontHan[tableTag].table, markFilteringSetOffset)  # ty:ignore[unresolved-attribute]
+
+	if gdefHan is not None:
+		if gdefWestern is None:
+			ttFont['GDEF'] = fontHan['GDEF']
+		else:
+			_mergeGDEF(gdefWestern, gdefHan)
+
+	for tableTag in ('BASE', 'cvt ', 'fpgm', 'gasp', 'prep'):
+		if tableTag in fontHan and tableTag not in ttFont:
+			ttFont[tableTag] = fontHan[tableTag]
+
+	ttFont['OS/2'].recalcAvgCharWidth(ttFont)  # ty:ignore[unresolved-attribute]
+	ttFont.recalcBBoxes = False
+	fontHan.close()
+	return ttFont
+
+def machinistReplacesTables(pathFilename: Path, dictionaryTables: Mapping[str, bytes]) -> Path:
+	"""Replace the data of some tables in a font file without decompiling or rewriting the other tables.
+
+	(AI generated docstring)
+
+	You can use this function to change small tables, such as `name`, `head`, or `OS/2`, in a large font without the cost of
+	`TTFont.save`, which compiles every table again. The function reads only the table directory [1] of `pathFilename`, writes
+	the data in `dictionaryTables`, and updates the checksum and length of each replaced table in the table directory. If the
+	length of each replaced table, padded to a multiple of 4 bytes, is the same as the padded length of the old table, the function
+	writes the new data over the old data, so the function reads and writes only the replaced tables. Otherwise, the function
+	copies the font to a new file in the same table order and replaces `pathFilename`. In both cases, the bytes of every other
+	table, such as `glyf`, `CFF `, or `GSUB`, do not change.
+
+	The function then writes `checkSumAdjustment` in the `head` table [2] from the table directory, as `fontTools.ttLib.sfnt` [3]
+	does, so a font that the function changes has valid checksums. If `dictionaryTables` has a `head` table, the function ignores
+	the `checkSumAdjustment` of the new `head` table.
+
+	Parameters
+	----------
+	pathFilename : Path
+		Path to the TrueType or OpenType font file to change.
+	dictionaryTables : Mapping[str, bytes]
+		Mapping from the tag of each table to replace to the compiled data of the table.
+
+	Returns
+	-------
+	pathFilename : Path
+		Path to the changed font file, identical to the input `pathFilename`.
+
+	Raises
+	------
+	ValueError
+		If `pathFilename` is not a TrueType or OpenType font, such as a font collection or a WOFF font, or if the font does not
+		have a table in `dictionaryTables`.
+
+	References
+	----------
+	[1] Table Directory - OpenType specification
+		https://learn.microsoft.com/en-us/typography/opentype/spec/otff#table-directory
+	[2] head - Font Header Table - OpenType specification
+		https://learn.microsoft.com/en-us/typography/opentype/spec/head
+	[3] fontTools.ttLib.sfnt
+		https://fonttools.readthedocs.io/en/latest/ttLib/sfnt.html
+	"""
+	with pathFilename.open('rb') as readStream:
+		header: bytes = readStream.read(12)
+		sfntVersion, numTables = struct.unpack_from('>4sH', header)
+		if sfntVersion not in (b'\x00\x01\x00\x00', b'OTTO', b'true'):
+			message: str = f"I received `{pathFilename = }`, but I can only replace tables in a TrueType or OpenType font, and its signature is {sfntVersion!r}."
+			raise ValueError(message)
+		listEntries: list[list[Any]] = [[tag.decode('latin-1'), checkSum, offset, length]
+			for tag, checkSum, offset, length in struct.iter_unpack('>4sIII', readStream.read(16 * numTables))]
+
+	dictionaryEntries: dict[str, list[Any]] = {entry[0]: entry for entry in listEntries}
+	if tagsMissing := sorted(set(dictionaryTables).difference(dictionaryEntries)):
+		message = f"I received `{pathFilename = }`, but the font does not have the tables {tagsMissing}."
+		raise ValueError(message)
+
+	dictionaryData: dict[str, bytes] = {tag: data[:8] + bytes(4) + data[12:] if tag == 'head' else data for tag, data in dictionaryTables.items()}
+
+	if all(_padTable(len(data)) == _padTable(dictionaryEntries[tag][3]) for tag, data in dictionaryData.items()):
+		with pathFilename.open('r+b') as writeStream:
+			for tag, data in dictionaryData.items():
+				entry: list[Any] = dictionaryEntries[tag]
+				entry[1], entry[3] = calcChecksum(data), len(data)
+				writeStream.seek(entry[2])
+				writeStream.write(data.ljust(_padTable(len(data)), b'\0'))
+	else:
+		pathFilenameTemporary: Path = pathFilename.with_name(f"{pathFilename.name}.{os.getpid()}.tmp")
+		with pathFilename.open('rb') as readStream, pathFilenameTemporary.open('wb') as writeStream:
+			offset: int = 12 + 16 * numTables
+			writeStream.write(header.ljust(offset, b'\0'))
+			for entry in sorted(listEntries, key=lambda entry: entry[2]):
+				if entry[0] in dictionaryData:
+					data = dictionaryData[entry[0]]
+					entry[1] = calcChecksum(data)
+				else:
+					readStream.seek(entry[2])
+					data = readStream.read(entry[3])
+				entry[2], entry[3] = offset, len(data)
+				writeStream.write(data.ljust(_padTable(len(data)), b'\0'))
+				offset += _padTable(len(data))
+		pathFilenameTemporary.replace(pathFilename)
+
+	tableDirectory: bytes = b''.join(struct.pack('>4sIII', tag.encode('latin-1'), checkSum, offset, length)
+		for tag, checkSum, offset, length in sorted(listEntries))
+	with pathFilename.open('r+b') as writeStream:
+		writeStream.seek(12)
+		writeStream.write(tableDirectory)
+		if 'head' in dictionaryEntries:
+			checkSumAdjustment: int = (0xB1B0AFBA - calcChecksum(header + tableDirectory) - sum(entry[1] for entry in listEntries)) & 0xFFFFFFFF
+			writeStream.seek(dictionaryEntries['head'][2] + 8)
+			writeStream.write(struct.pack('>I', checkSumAdjustment))
+	return pathFilename
+
+def machinistSavesTTFont(ttFont: TTFont, pathFilenameWrite: Path) -> Path:
+	"""Write a font directly to a file and release each table as soon as no other table needs the table.
+
+	(AI generated docstring)
+
+	You can use this function instead of `TTFont.save` [1] when memory is scarcer than time. `TTFont.save` compiles every table
+	into an in-memory buffer, may copy the buffer again to reorder the tables, and keeps every decompiled table until the font
+	is closed. This function writes each compiled table directly to a temporary file next to `pathFilenameWrite`, in the order
+	that satisfies the table dependencies, and deletes each table from `ttFont` as soon as every table that reads the table has
+	been written. Tables that were never decompiled are copied as raw data. Then the function closes `ttFont` and replaces
+	`pathFilenameWrite` with the temporary file, so `pathFilenameWrite` may be the file that `ttFont` was read from.
+
+	The table directory is sorted by tag, as the OpenType specification requires, but the table data keeps the order in which
+	the tables were written.
+
+	Parameters
+	----------
+	ttFont : TTFont
+		Font to write. The function empties and closes `ttFont`.
+	pathFilenameWrite : Path
+		Path to the font file to write.
+
+	Returns
+	-------
+	pathFilenameWrite : Path
+		Path to the written font file.
+
+	References
+	----------
+	[1] fontTools.ttLib.TTFont.save
+		https://fonttools.readthedocs.io/en/latest/ttLib/ttFont.html
+	"""
+	# NOTE `table_O_S_2f_2.compile` reads 'cmap' and `table__m_a_x_p.recalc` reads 'hmtx', but neither table class declares it.
+	dependenciesUndeclared: dict[str, tuple[str, ...]] = {'OS/2': ('cmap',), 'maxp': ('hmtx',)}
+
+	tableTags: list[str] = [tableTag for tableTag in ttFont.keys() if tableTag != 'GlyphOrder']  # noqa: SIM118 `TTFont` has `keys` but no `__iter__`.
+	dependencies: dict[str, list[str]] = {tableTag: [tableTagMaster for tableTagMaster in (*getTableClass(tableTag).dependencies, *dependenciesUndeclared.get(tableTag, ()))
+		if tableTagMaster in tableTags] for tableTag in tableTags}
+	dependents: dict[str, set[str]] = {tableTag: set() for tableTag in tableTags}
+	for tableTag, tableTagsMaster in dependencies.items():
+		for tableTagMaster in tableTagsMaster:
+			dependents[tableTagMaster].add(tableTag)
+
+	if ttFont.recalcTimestamp:
+		# NOTE `table__h_e_a_d.compile` sets the `modified` timestamp only if 'head' is decompiled, so I load 'head' as `TTFont.save` does.
+		ttFont.get('head')
+
+	pathFilenameWrite.parent.mkdir(parents=True, exist_ok=True)
+	pathFilenameTemporary: Path = pathFilenameWrite.with_name(f"{pathFilenameWrite.name}.{os.getpid()}.tmp")
+	with pathFilenameTemporary.open('wb') as writeStream:
+		writer = SFNTWriter(writeStream, len(tableTags), ttFont.sfntVersion, ttFont.flavor, ttFont.flavorData)
+		tableTagsWritten: set[str] = set()
+
+		def writeTable(tableTag: str) -> None:
+			if tableTag in tableTagsWritten:
+				return
+			for tableTagMaster in dependencies[tableTag]:
+				writeTable(tableTagMaster)
+			writer[tableTag] = ttFont.getTableData(tableTag)
+			tableTagsWritten.add(tableTag)
+			for tableTagRelease in (tableTag, *dependencies[tableTag]):
+				if tableTagRelease in ttFont and dependents[tableTagRelease] <= tableTagsWritten:
+					del ttFont[tableTagRelease]
+
+		for tableTag in tableTags:
+			writeTable(tableTag)
+		writer.close()
+
+	ttFont.close()
+	pathFilenameTemporary.replace(pathFilenameWrite)
+	return pathFilenameWrite
+
+def machinistSerializesTTFont(pathFilename: Path) -> bytes:
+	"""Decompile every table of a font file once and serialize the decompiled `TTFont`.
+
+	(AI generated docstring)
+
+	You can use this function to pay the cost of decompiling a font one time when the same font is an input to many merges. The
+	function loads `pathFilename`, decompiles every table with `TTFont.ensureDecompiled` [1], and pickles the result [2].
+	Unpickling the returned `bytes` rebuilds an independent, fully decompiled `TTFont` much faster than decompiling the binary
+	tables again, and each unpickled instance may be modified without affecting the others.
+
+	Parameters
+	----------
+	pathFilename : Path
+		Path to the font file to decompile.
+
+	Returns
+	-------
+	fontSerialized : bytes
+		Pickled, fully decompiled `TTFont` instance accepted by `machinistMergesTTFFonts` [3].
+
+	References
+	----------
+	[1] fontTools.ttLib.TTFont.ensureDecompiled
+		https://fonttools.readthedocs.io/en/latest/ttLib/ttFont.html
+	[2] pickle - Python Standard Library
+		https://docs.python.org/3/library/pickle.html
+	[3] Integrated_Code_Fire.machineShop.machinistMergesTTFFonts
+		Internal package reference.
+	"""
+	with TTFont(pathFilename) as ttFont:
+		ttFont.ensureDecompiled()
+		return pickle.dumps(ttFont, protocol=pickle.HIGHEST_PROTOCOL)
+
+class _MergerSerialized(Merger):
+	"""I use this `Merger` subclass so `machinistMergesTTFFonts` can merge serialized `TTFont` instances.
+
+	(AI generated docstring)
+
+	`fontTools.merge.Merger.merge` opens every input twice, and `Merger._openFonts` is the only place where inputs become `TTFont`
+	instances. I override `_openFonts` to unpickle `bytes` inputs from `machinistSerializesTTFont` and to load every other input
+	from disk, so each call returns fresh instances that the merge may mutate.
+	"""
+
+	def _openFonts(self, fontfiles: Sequence[Path | bytes]) -> list[TTFont]:
+		fonts: list[TTFont] = [pickle.loads(fontfile) if isinstance(fontfile, bytes) else TTFont(fontfile) for fontfile in fontfiles]  # noqa: S301
+		for font, fontfile in zip(fonts, fontfiles, strict=True):
+			font._merger__fontfile = fontfile  # pyright: ignore[reportAttributeAccessIssue]  # noqa: SLF001
+			font._merger__name = font['name'].getDebugName(4)  # pyright: ignore[reportAttributeAccessIssue]  # noqa: SLF001
+		return fonts
+
+class _SubsetterReusesClosure(subset.Subsetter):
+	"""I use this `Subsetter` subclass so `machinistSubsetsCID` computes the glyph closure of a subset one time for all weights.
+
+	(AI generated docstring)
+
+	`Subsetter._closure_glyphs` closes the requested glyphs over `cmap`, `MATH`, `GSUB`, `COLR`, `bsln`, `VARC`, `glyf`, and
+	`CFF `, and stores the closure in attributes that the table subsetters read later. A CID-keyed `CFF ` table has no `seac`
+	accents, so in a CID-keyed font without `glyf`, the closure depends only on the request, the options, the glyph order, and
+	the layout tables. I key the attributes by those inputs, so every weight with the same glyphs and layout gets the attributes
+	that the first weight stored with `storekeeperStoresArtifact`, and no weight computes the closure again. For any other font,
+	I compute the closure as `Subsetter` does.
+	"""
+
+	def _closure_glyphs(self, font: TTFont) -> None:
+		if font.reader is None or 'glyf' in font or 'CFF ' not in font or not hasattr(font['CFF '].cff.topDictIndex[0], 'ROS'):  # ty:ignore[unresolved-attribute]
+			super()._closure_glyphs(font)
+			return
+
+		keyCache: str = storekeeperMakesKey('_SubsetterReusesClosure', self.glyph_ids_requested, self.glyph_names_requested
+			, self.unicodes_requested, self.options, font.getGlyphOrder()
+			, {tag: font.reader[tag] for tag in ('cmap', 'MATH', 'GSUB', 'COLR', 'bsln', 'VARC') if tag in font.reader}, versionStage=1)
+		with tempfile.TemporaryDirectory(prefix='closure') as pathTemporary:
+			pathFilenameClosure: Path = Path(pathTemporary) / f"{keyCache}.pickle"
+			if storekeeperRetrievesArtifact(keyCache, pathFilenameClosure):
+				vars(self).update(pickle.loads(pathFilenameClosure.read_bytes()))  # noqa: S301
+				return
+
+			attributesBefore: dict[str, Any] = dict(vars(self))
+			super()._closure_glyphs(font)
+			pathFilenameClosure.write_bytes(pickle.dumps({name: value for name, value in vars(self).items()
+				if name not in attributesBefore or attributesBefore[name] is not value}, protocol=pickle.HIGHEST_PROTOCOL))
+			storekeeperStoresArtifact(keyCache, pathFilenameClosure)
+
+def _appendLayout(tableWestern: otTables.GSUB | otTables.GPOS, tableHan: otTables.GSUB | otTables.GPOS, markFilteringSetOffset: int) -> None:
+	"""I use this to append the Han lookups, features, and scripts of one layout table to the western layout table.
+
+	(AI generated docstring)
+
+	`machinistMergesWesternHan` calls me once for `GSUB` and once for `GPOS`. I offset every Han lookup index, including the
+	indices inside contextual and chaining lookup records, by the number of western lookups, and I offset every Han feature index
+	by the number of western features. When a western language system and a Han language system have the same script tag and
+	language tag, I join them, and, like `Merger`, I join their features that have the same tag into one new feature. Finally, I
+	remove features that no language system uses, and I sort the features by tag, as the OpenType specification requires.
+	"""
+	lookupsWestern: list[otTables.Lookup] = tableWestern.LookupList.Lookup if tableWestern.LookupList else []
+	lookupsHan: list[otTables.Lookup] = tableHan.LookupList.Lookup if tableHan.LookupList else []
+	lookupMap: dict[int, int] = {index: index + len(lookupsWestern) for index in range(len(lookupsHan))}
+
+	if tableHan.LookupList:
+		tableHan.LookupList.mapLookups(lookupMap)  # ty:ignore[unresolved-attribute]
+		if markFilteringSetOffset:
+			for lookup in lookupsHan:
+				if lookup.LookupFlag & 0x0010:
+					lookup.MarkFilteringSet += markFilteringSetOffset
+	if tableHan.FeatureList:
+		tableHan.FeatureList.mapLookups(lookupMap)  # ty:ignore[unresolved-attribute]
+
+	if tableWestern.LookupList is None:
+		tableWestern.LookupList = otTables.LookupList()
+	tableWestern.LookupList.Lookup = lookupsWestern + lookupsHan
+	tableWestern.LookupList.LookupCount = len(tableWestern.LookupList.Lookup)
+
+	featureRecordsWestern: list[otTables.FeatureRecord] = tableWestern.FeatureList.FeatureRecord if tableWestern.FeatureList else []
+	featureRecordsHan: list[otTables.FeatureRecord] = tableHan.FeatureList.FeatureRecord if tableHan.FeatureList else []
+	if tableHan.ScriptList:
+		tableHan.ScriptList.mapFeatures({index: index + len(featureRecordsWestern) for index in range(len(featureRecordsHan))})  # ty:ignore[unresolved-attribute]
+	featureRecords: list[otTables.FeatureRecord] = featureRecordsWestern + featureRecordsHan
+	featuresJoined: dict[tuple[int, ...], int] = {}
+
+	if tableWestern.ScriptList is None:
+		tableWestern.ScriptList = otTables.ScriptList()
+		tableWestern.ScriptList.ScriptRecord = []
+	scriptRecords: dict[str, otTables.ScriptRecord] = {scriptRecord.ScriptTag: scriptRecord for scriptRecord in tableWestern.ScriptList.ScriptRecord}
+	for scriptRecordHan in (tableHan.ScriptList.ScriptRecord if tableHan.ScriptList else []):
+		if scriptRecordHan.ScriptTag not in scriptRecords:
+			scriptRecords[scriptRecordHan.ScriptTag] = scriptRecordHan
+			continue
+		scriptWestern: otTables.Script = scriptRecords[scriptRecordHan.ScriptTag].Script
+		scriptHan: otTables.Script = scriptRecordHan.Script
+		if scriptHan.DefaultLangSys is not None:
+			if scriptWestern.DefaultLangSys is None:
+				scriptWestern.DefaultLangSys = scriptHan.DefaultLangSys
+			else:
+				scriptWestern.DefaultLangSys = _joinLangSys(scriptWestern.DefaultLangSys, scriptHan.DefaultLangSys, featureRecords, featuresJoined)
+		langSysRecords: dict[str, otTables.LangSysRecord] = {langSysRecord.LangSysTag: langSysRecord for langSysRecord in scriptWestern.LangSysRecord}
+		for langSysRecordHan in scriptHan.LangSysRecord:
+			if langSysRecordHan.LangSysTag in langSysRecords:
+				langSysRecord: otTables.LangSysRecord = langSysRecords[langSysRecordHan.LangSysTag]
+				langSysRecord.LangSys = _joinLangSys(langSysRecord.LangSys, langSysRecordHan.LangSys, featureRecords, featuresJoined)
+			else:
+				langSysRecords[langSysRecordHan.LangSysTag] = langSysRecordHan
+		scriptWestern.LangSysRecord = [langSysRecords[langSysTag] for langSysTag in sorted(langSysRecords)]
+		scriptWestern.LangSysCount = len(scriptWestern.LangSysRecord)
+
+	tableWestern.ScriptList.ScriptRecord = [scriptRecords[scriptTag] for scriptTag in sorted(scriptRecords)]
+	tableWestern.ScriptList.ScriptCount = len(tableWestern.ScriptList.ScriptRecord)
+
+	featureIndicesUsed: set[int] = set()
+	tableWestern.ScriptList.mapFeatures(_FeatureAttendance(featureIndicesUsed))  # ty:ignore[unresolved-attribute]
+	featureIndicesSorted: list[int] = sorted(featureIndicesUsed, key=lambda index: (featureRecords[index].FeatureTag, index))
+	tableWestern.ScriptList.mapFeatures({indexOld: indexNew for indexNew, indexOld in enumerate(featureIndicesSorted)})  # ty:ignore[unresolved-attribute]
+
+	if tableWestern.FeatureList is None:
+		tableWestern.FeatureList = otTables.FeatureList()
+	tableWestern.FeatureList.FeatureRecord = [featureRecords[index] for index in featureIndicesSorted]
+	tableWestern.FeatureList.FeatureCount = len(tableWestern.FeatureList.FeatureRecord)
+
+def _convertOutlines(listOutlines: Sequence[list[tuple[str, tuple[Any, ...]]]], maxErr: float) -> list[bytes]:
+	"""I use this worker to convert recorded cubic outlines to compiled TrueType glyphs, as `afdko.otf2ttf.otf_to_ttf` does."""
+	listData: list[bytes] = []
+	for outline in listOutlines:
+		pen = TTGlyphPen(None)
+		replayRecording(outline, Cu2QuPen(pen, maxErr, reverse_direction=REVERSE_DIRECTION))
+		listData.append(pen.glyph().compile(None))
+	return listData
+
+class _FeatureAttendance(dict[int, int]):
+	"""I record each feature index that `ScriptList.mapFeatures` visits, and I map each index to itself."""
+
+	def __init__(self, featureIndicesUsed: set[int]) -> None:
+		super().__init__()
+		self.featureIndicesUsed: set[int] = featureIndicesUsed
+
+	def __getitem__(self, featureIndex: int) -> int:
+		self.featureIndicesUsed.add(featureIndex)
+		return featureIndex
+
+def _joinLangSys(langSysWestern: otTables.LangSys, langSysHan: otTables.LangSys, featureRecords: list[otTables.FeatureRecord], featuresJoined: dict[tuple[int, ...], int]) -> otTables.LangSys:
+	"""I use this to join a western language system and a Han language system that have the same tag.
+
+	(AI generated docstring)
+
+	When both language systems use features with the same tag, I append one new feature record to `featureRecords` that has the
+	lookups of each feature, in order. `featuresJoined` remembers the new feature records, so language systems that use the same
+	features share one new feature record.
+	"""
+	featureIndicesByTag: dict[str, list[int]] = {}
+	for featureIndex in (*langSysWestern.FeatureIndex, *langSysHan.FeatureIndex):
+		featureIndices: list[int] = featureIndicesByTag.setdefault(featureRecords[featureIndex].FeatureTag, [])
+		if featureIndex not in featureIndices:
+			featureIndices.append(featureIndex)
+
+	langSys = otTables.LangSys()
+	langSys.LookupOrder = None
+	langSys.ReqFeatureIndex = langSysWestern.ReqFeatureIndex if langSysWestern.ReqFeatureIndex != 0xFFFF else langSysHan.ReqFeatureIndex
+	langSys.FeatureIndex = []
+	for featureTag, featureIndices in sorted(featureIndicesByTag.items()):
+		if len(featureIndices) == 1:
+			langSys.FeatureIndex.append(featureIndices[0])
+			continue
+		if tuple(featureIndices) not in featuresJoined:
+			feature = otTables.Feature()
+			feature.FeatureParams = next((featureRecords[index].Feature.FeatureParams for index in featureIndices if featureRecords[index].Feature.FeatureParams), None)
+			feature.LookupListIndex = list(dict.fromkeys(lookupIndex for index in featureIndices for lookupIndex in featureRecords[index].Feature.LookupListIndex))
+			feature.LookupCount = len(feature.LookupListIndex)
+			featureRecord = otTables.FeatureRecord()
+			featureRecord.FeatureTag = featureTag
+			featureRecord.Feature = feature
+			featuresJoined[tuple(featureIndices)] = len(featureRecords)
+			featureRecords.append(featureRecord)
+		langSys.FeatureIndex.append(featuresJoined[tuple(featureIndices)])
+	langSys.FeatureCount = len(langSys.FeatureIndex)
+	return langSys
+
+def _mergeCmap(ttFont: TTFont, fontHan: TTFont) -> None:
+	"""I use this to replace the `cmap` of the merged font with the same subtables that `Merger` makes.
+
+	(AI generated docstring)
+
+	I choose the format 12 subtable of each font, or the format 4 subtable when a font has no format 12 subtable, and the format
+	14 subtable for Unicode variation sequences. Then I write a format 4 subtable, a format 12 subtable when any code point is
+	outside the Basic Multilingual Plane, and a format 14 subtable when either font has variation sequences.
+	"""
+	cmap: dict[int, str] = {}
+	uvsDict: dict[int, dict[int, str | None]] = {}
+	for font in (ttFont, fontHan):
+		subtableBest: CmapSubtable | None = None
+		for subtable in font['cmap'].tables:  # ty:ignore[unresolved-attribute]
+			properties: tuple[int, int, int] = (subtable.format, subtable.platformID, subtable.platEncID)
+			if properties in {(12, 3, 10), (12, 0, 4), (12, 0, 6)} or (
+					properties in {(4, 3, 1), (4, 0, 3), (4, 0, 4), (4, 0, 6)} and (subtableBest is None or subtableBest.format != 12)):
+				subtableBest = subtable
+			elif properties == (14, 0, 5):
+				for variationSelector, listUVS in subtable.uvsDict.items():
+					for unicode, glyphName in listUVS:
+						uvsDict.setdefault(variationSelector, {}).setdefault(unicode, glyphName)
+		if subtableBest is not None:
+			for unicode, glyphName in subtableBest.cmap.items():
+				cmap.setdefault(unicode, glyphName)
+
+	cmapTable = newTable('cmap')
+	cmapTable.tableVersion = 0
+	cmapTable.tables = []
+	if uvsDict:
+		subtable = cmap_classes[14](14)
+		subtable.platformID, subtable.platEncID, subtable.language = 0, 5, 0
+		subtable.cmap = {}
+		subtable.uvsDict = {variationSelector: [(unicode, None if cmap.get(unicode) == glyphName else glyphName) for unicode, glyphName in dictionaryUVS.items()]
+			for variationSelector, dictionaryUVS in uvsDict.items()}
+		cmapTable.tables.append(subtable)
+	subtable = cmap_classes[4](4)
+	subtable.platformID, subtable.platEncID, subtable.language = 3, 1, 0
+	subtable.cmap = {unicode: glyphName for unicode, glyphName in cmap.items() if unicode <= 0xFFFF}
+	cmapTable.tables.append(subtable)
+	if len(subtable.cmap) != len(cmap):
+		subtable = cmap_classes[12](12)
+		subtable.platformID, subtable.platEncID, subtable.language = 3, 10, 0
+		subtable.cmap = cmap
+		cmapTable.tables.append(subtable)
+	ttFont['cmap'] = cmapTable
+
+def _mergeGDEF(gdefWestern: otTables.GDEF, gdefHan: otTables.GDEF) -> None:
+	"""I use this to add the Han glyph classes, attachment points, ligature carets, and mark glyph sets to the western `GDEF`."""
+	for attributeClassDef in ('GlyphClassDef', 'MarkAttachClassDef'):
+		classDefHan: otTables.ClassDef | None = getattr(gdefHan, attributeClassDef, None)
+		if classDefHan is None:
+			continue
+		if getattr(gdefWestern, attributeClassDef, None) is None:
+			setattr(gdefWestern, attributeClassDef, classDefHan)
+		else:
+			getattr(gdefWestern, attributeClassDef).classDefs.update(classDefHan.classDefs)
+
+	for attributeList, attributeCount, attributeItems in (('AttachList', 'GlyphCount', 'AttachPoint'), ('LigCaretList', 'LigGlyphCount', 'LigGlyph')):
+		listHan = getattr(gdefHan, attributeList, None)
+		if listHan is None:
+			continue
+		listWestern = getattr(gdefWestern, attributeList, None)
+		if listWestern is None:
+			setattr(gdefWestern, attributeList, listHan)
+			continue
+		listWestern.Coverage.glyphs = listWestern.Coverage.glyphs + listHan.Coverage.glyphs
+		setattr(listWestern, attributeItems, getattr(listWestern, attributeItems) + getattr(listHan, attributeItems))
+		setattr(listWestern, attributeCount, len(getattr(listWestern, attributeItems)))
+
+	markGlyphSetsDefHan: otTables.MarkGlyphSetsDef | None = getattr(gdefHan, 'MarkGlyphSetsDef', None)
+	if markGlyphSetsDefHan is not None:
+		if getattr(gdefWestern, 'MarkGlyphSetsDef', None) is None:
+			gdefWestern.MarkGlyphSetsDef = markGlyphSetsDefHan
+		else:
+			gdefWestern.MarkGlyphSetsDef.Coverage = gdefWestern.MarkGlyphSetsDef.Coverage + markGlyphSetsDefHan.Coverage
+			gdefWestern.MarkGlyphSetsDef.MarkSetCount = len(gdefWestern.MarkGlyphSetsDef.Coverage)
+	gdefWestern.Version = max(gdefWestern.Version, gdefHan.Version)
+
+def _mergeMetricsTables(ttFont: TTFont, fontHan: TTFont) -> None:
+	"""I use this to merge the `head`, `hhea`, `maxp`, `OS/2`, and `post` fields the way `Merger` merges them.
+
+	(AI generated docstring)
+
+	`Merger` and `TTFont.save` recalculate bounding boxes and `maxp` limits from every glyph. The western and Han tables already
+	hold correct values for their own glyphs, so the minimum or maximum of the two values is the value for the merged font.
+	"""
+	head, headHan = ttFont['head'], fontHan['head']
+	head.xMin, head.yMin = min(head.xMin, headHan.xMin), min(head.yMin, headHan.yMin)  # ty:ignore[unresolved-attribute]
+	head.xMax, head.yMax = max(head.xMax, headHan.xMax), max(head.yMax, headHan.yMax)  # ty:ignore[unresolved-attribute]
+	head.lowestRecPPEM = max(head.lowestRecPPEM, headHan.lowestRecPPEM)  # ty:ignore[unresolved-attribute]
+
+	hhea, hheaHan = ttFont['hhea'], fontHan['hhea']
+	for attribute in ('ascent', 'lineGap', 'advanceWidthMax', 'xMaxExtent'):
+		setattr(hhea, attribute, max(getattr(hhea, attribute), getattr(hheaHan, attribute)))
+	for attribute in ('descent', 'minLeftSideBearing', 'minRightSideBearing'):
+		setattr(hhea, attribute, min(getattr(hhea, attribute), getattr(hheaHan, attribute)))
+
+	maxp, maxpHan = ttFont['maxp'], fontHan['maxp']
+	for attribute in ('maxPoints', 'maxContours', 'maxCompositePoints', 'maxCompositeContours', 'maxZones', 'maxTwilightPoints'
+					, 'maxStackElements', 'maxSizeOfInstructions', 'maxComponentElements', 'maxComponentDepth'):
+		if hasattr(maxp, attribute) and hasattr(maxpHan, attribute):
+			setattr(maxp, attribute, max(getattr(maxp, attribute), getattr(maxpHan, attribute)))
+	maxp.numGlyphs = len(ttFont.getGlyphOrder())  # ty:ignore[unresolved-attribute]
+
+	os2, os2Han = ttFont['OS/2'], fontHan['OS/2']
+	for attribute in ('ulUnicodeRange1', 'ulUnicodeRange2', 'ulUnicodeRange3', 'ulUnicodeRange4', 'ulCodePageRange1', 'ulCodePageRange2'):
+		if hasattr(os2, attribute) and hasattr(os2Han, attribute):
+			setattr(os2, attribute, getattr(os2, attribute) | getattr(os2Han, attribute))
+	for attribute in ('sTypoAscender', 'sTypoLineGap', 'usWinAscent', 'usWinDescent', 'sxHeight', 'sCapHeight', 'usMaxContext', 'usLastCharIndex'):
+		if hasattr(os2, attribute) and hasattr(os2Han, attribute):
+			setattr(os2, attribute, max(getattr(os2, attribute), getattr(os2Han, attribute)))
+	for attribute in ('sTypoDescender', 'usFirstCharIndex'):
+		setattr(os2, attribute, min(getattr(os2, attribute), getattr(os2Han, attribute)))
+	os2.version = max(os2.version, os2Han.version)  # ty:ignore[unresolved-attribute]
+
+	post, postHan = ttFont['post'], fontHan['post']
+	post.formatType = max(post.formatType, postHan.formatType)  # ty:ignore[unresolved-attribute]
+	post.isFixedPitch = min(post.isFixedPitch, postHan.isFixedPitch)  # ty:ignore[unresolved-attribute]
+	post.extraNames = []  # ty:ignore[unresolved-attribute]
+	post.mapping = {}  # ty:ignore[unresolved-attribute]
+
+class _GlyphCollection(NamedTuple):
+	"""I hold one glyph of the collection glyph set of `_shareGlyphs` and the font that the glyph came from."""
+
+	glyphName: str
+	keyGlyph: tuple[object, ...]
+	glyph: Glyph
+	metrics: tuple[int, int]
+	ttFont: TTFont
+
+class _GlyphIDZero:
+	"""I give every component glyph ID 0, so `_keyGlyph` can compile a composite glyph without the glyph IDs of one font."""
+
+	def getGlyphID(self, glyphName: str) -> int:  # noqa: ARG002
+		return 0
+
+def _keyGlyph(glyphName: str, ttFont: TTFont, keysGlyph: dict[str, tuple[object, ...]]) -> tuple[object, ...]:
+	"""I use this to identify a glyph by its outline, instructions, and horizontal metrics instead of by its name or glyph ID.
+
+	(AI generated docstring)
+
+	The key of a simple glyph is the compiled glyph data. The key of a composite glyph is the compiled glyph data with every
+	component glyph ID set to 0, together with the keys of the components, so the key does not depend on the glyph order of
+	`ttFont`. I memoize the keys of `ttFont` in `keysGlyph`.
+	"""
+	if glyphName not in keysGlyph:
+		glyf: table__g_l_y_f = ttFont['glyf']  # pyright: ignore[reportAssignmentType]
+		glyph: Glyph = glyf.glyphs[glyphName]
+		keyComponents: tuple[object, ...] = ()
+		if glyph.isComposite():
+			glyph.expand(glyf)
+			keyComponents = tuple(_keyGlyph(component.glyphName, ttFont, keysGlyph) for component in glyph.components)
+		keysGlyph[glyphName] = (glyph.compile(_GlyphIDZero(), recalcBBoxes=False), ttFont['hmtx'][glyphName], keyComponents)  # pyright: ignore[reportArgumentType]
+	return keysGlyph[glyphName]
+
+def _padTable(length: int) -> int:
+	"""I use this to measure the bytes that a table of `length` bytes occupies in a font file, which pads each table to 4 bytes."""
+	return (length + 3) & ~3
+
+def _shareGlyphs(listFonts: list[TTFont]) -> list[TTFont]:
+	"""I use this to rebuild the fonts of `machinistMakesCollection` on one glyph set that has every glyph of every font one time.
+
+	(AI generated docstring)
+
+	I align the glyph order of each font with the collection glyph order: I walk the glyphs of the font in order, and I match each
+	glyph to the next glyph of the collection glyph set that has the same key from `_keyGlyph`; a glyph without a match is
+	inserted after the previous match. The matches only move forward, so the glyphs of every font keep their relative order, and
+	the coverage tables of `GSUB` and `GPOS` stay sorted by glyph ID. Each new glyph of the collection glyph set has the name of
+	the glyph in the first font that has the glyph.
+
+	Then, for each font, I decompile every table that refers to glyphs, set the glyph order of the font to a glyph order that
+	has the glyph name of the font at the collection glyph ID of each glyph, and compile the table. The compiled tables are stored
+	as `DefaultTable` instances in a new `TTFont` whose glyph order is the collection glyph order.
 	"""
-	return Merger().merge(pathFilenamesFonts)
+	tablesShared: frozenset[str] = frozenset(['glyf', 'loca', 'hmtx', 'hhea', 'maxp', 'post'])
+	tablesUnchanged: frozenset[str] = frozenset(['head', 'name', 'OS/2'])
+	tablesDropped: frozenset[str] = frozenset(['DSIG', 'hdmx', 'LTSH', 'VDMX', 'vhea', 'vmtx'])
+
+	listGlyphsCollection: list[_GlyphCollection] = []
+	listGlyphsCollectionFont: list[dict[str, _GlyphCollection]] = []
+	glyphNamesUsed: set[str] = set()
+	for ttFont in listFonts:
+		keysGlyph: dict[str, tuple[object, ...]] = {}
+		indicesByKey: dict[tuple[object, ...], list[int]] = {}
+		for index, glyphCollection in enumerate(listGlyphsCollection):
+			indicesByKey.setdefault(glyphCollection.keyGlyph, []).append(index)
+
+		glyfFont: table__g_l_y_f = ttFont['glyf']  # pyright: ignore[reportAssignmentType]
+		glyphsCollectionFont: dict[str, _GlyphCollection] = {}
+		glyphsInserted: dict[int, list[_GlyphCollection]] = {}
+		indexPrevious: int = -1
+		for glyphName in ttFont.getGlyphOrder():
+			keyGlyph: tuple[object, ...] = _keyGlyph(glyphName, ttFont, keysGlyph)
+			indices: list[int] = indicesByKey.get(keyGlyph, [])
+			indexMatch: int = bisect.bisect_right(indices, indexPrevious)
+			if indexMatch < len(indices):
+				indexPrevious = indices[indexMatch]
+				glyphsCollectionFont[glyphName] = listGlyphsCollection[indexPrevious]
+				continue
+			glyphNameCollection: str = glyphName
+			suffix: int = 1
+			while glyphNameCollection in glyphNamesUsed:
+				glyphNameCollection = f"{glyphName}.{suffix}"
+				suffix += 1
+			glyphNamesUsed.add(glyphNameCollection)
+			glyphCollection = _GlyphCollection(glyphNameCollection, keyGlyph, glyfFont.glyphs[glyphName], ttFont['hmtx'][glyphName], ttFont)  # pyright: ignore[reportIndexIssue]
+			glyphsInserted.setdefault(indexPrevious, []).append(glyphCollection)
+			glyphsCollectionFont[glyphName] = glyphCollection
+
+		listGlyphsCollectionAligned: list[_GlyphCollection] = glyphsInserted.get(-1, [])
+		for index, glyphCollection in enumerate(listGlyphsCollection):
+			listGlyphsCollectionAligned.append(glyphCollection)
+			listGlyphsCollectionAligned.extend(glyphsInserted.get(index, []))
+		listGlyphsCollection = listGlyphsCollectionAligned
+		listGlyphsCollectionFont.append(glyphsCollectionFont)
+
+	glyphOrder: list[str] = [glyphCollection.glyphName for glyphCollection in listGlyphsCollection]
+	glyphIDs: dict[str, int] = {glyphName: glyphID for glyphID, glyphName in enumerate(glyphOrder)}
+	listGlyphIDsFont: list[dict[str, int]] = [{glyphName: glyphIDs[glyphCollection.glyphName] for glyphName, glyphCollection in glyphsCollectionFont.items()}
+		for glyphsCollectionFont in listGlyphsCollectionFont]
+
+	glyf: table__g_l_y_f = newTable('glyf')  # pyright: ignore[reportAssignmentType]
+	glyf.glyphs = {}
+	hmtx = newTable('hmtx')
+	hmtx.metrics = {}
+	for glyphCollection in listGlyphsCollection:
+		glyph: Glyph = glyphCollection.glyph
+		if glyph.isComposite():
+			glyphsCollectionFont = listGlyphsCollectionFont[listFonts.index(glyphCollection.ttFont)]
+			glyph = copy.deepcopy(glyph)
+			for component in glyph.components:
+				component.glyphName = glyphsCollectionFont[component.glyphName].glyphName
+		glyf.glyphs[glyphCollection.glyphName] = glyph
+		hmtx.metrics[glyphCollection.glyphName] = glyphCollection.metrics
+	glyf.setGlyphOrder(glyphOrder)
+
+	fontFirst: TTFont = listFonts[0]
+	hhea = copy.deepcopy(fontFirst['hhea'])
+	maxp = copy.deepcopy(fontFirst['maxp'])
+	post = copy.deepcopy(fontFirst['post'])
+	post.extraNames = []  # ty:ignore[unresolved-attribute]
+	post.mapping = {}  # ty:ignore[unresolved-attribute]
+	bounds: list[int] = [fontFirst['head'].xMin, fontFirst['head'].yMin, fontFirst['head'].xMax, fontFirst['head'].yMax]  # ty:ignore[unresolved-attribute]
+	for ttFont in listFonts[1:]:
+		for attribute in ('ascent', 'lineGap', 'advanceWidthMax', 'xMaxExtent'):
+			setattr(hhea, attribute, max(getattr(hhea, attribute), getattr(ttFont['hhea'], attribute)))
+		for attribute in ('descent', 'minLeftSideBearing', 'minRightSideBearing'):
+			setattr(hhea, attribute, min(getattr(hhea, attribute), getattr(ttFont['hhea'], attribute)))
+		for attribute in ('maxPoints', 'maxContours', 'maxCompositePoints', 'maxCompositeContours', 'maxZones', 'maxTwilightPoints'
+						, 'maxStorage', 'maxFunctionDefs', 'maxInstructionDefs', 'maxStackElements', 'maxSizeOfInstructions'
+						, 'maxComponentElements', 'maxComponentDepth'):
+			if hasattr(maxp, attribute):
+				setattr(maxp, attribute, max(getattr(maxp, attribute), getattr(ttFont['maxp'], attribute)))
+		bounds = [min(bounds[0], ttFont['head'].xMin), min(bounds[1], ttFont['head'].yMin)  # ty:ignore[unresolved-attribute]
+			, max(bounds[2], ttFont['head'].xMax), max(bounds[3], ttFont['head'].yMax)]  # ty:ignore[unresolved-attribute]
+
+	listFontsCollection: list[TTFont] = []
+	for ttFont, glyphIDsFont in zip(listFonts, listGlyphIDsFont, strict=True):
+		tableTagsRemapped: list[str] = [tableTag for tableTag in ttFont.keys()  # noqa: SIM118 `TTFont` has `keys` but no `__iter__`.
+			if tableTag not in tablesShared | tablesUnchanged | tablesDropped and tableTag != 'GlyphOrder']
+		ttFont.ensureDecompiled()
+
+		# NOTE The placeholder names start with U+0000, so they cannot match a glyph name of the font.
+		glyphOrderFont: list[str] = [f"\u0000{glyphID}" for glyphID in range(len(glyphOrder))]
+		for glyphName, glyphID in glyphIDsFont.items():
+			glyphOrderFont[glyphID] = glyphName
+		ttFont.setGlyphOrder(glyphOrderFont)
+
+		fontCollection = TTFont(recalcBBoxes=False)
+		fontCollection.setGlyphOrder(glyphOrder)
+		for tableTag in tableTagsRemapped:
+			tableRemapped = DefaultTable(tableTag)
+			tableRemapped.data = ttFont[tableTag].compile(ttFont)
+			fontCollection[tableTag] = tableRemapped
+		for tableTag in tablesUnchanged:
+			fontCollection[tableTag] = ttFont[tableTag]
+		fontCollection['head'].xMin, fontCollection['head'].yMin, fontCollection['head'].xMax, fontCollection['head'].yMax = bounds  # ty:ignore[unresolved-attribute]
+		fontCollection['glyf'] = glyf
+		fontCollection['loca'] = newTable('loca')
+		fontCollection['hmtx'] = hmtx
+		fontCollection['hhea'] = hhea
+		fontCollection['maxp'] = maxp
+		fontCollection['post'] = post
+		listFontsCollection.append(fontCollection)
+	return listFontsCollection
+
+def _shiftCharString(charString: T2CharString, addend: int) -> None:
+	"""I use this to move the outline of one Type 2 charstring `addend` units to the right and to widen the charstring by `2 * addend`.
+
+	(AI generated docstring)
+
+	The first operator that clears the stack has one extra operand, the width, if its count of operands has the wrong parity
+	[1]. If the charstring has no width, the width is `defaultWidthX` of the Private DICT, so I insert the new width. The operands
+	of `vstem`, `vstemhm`, and the implicit `vstemhm` before the first `hintmask` start from 0 in each operator. I stop at the first
+	moveto, because every later operand is relative. `vmoveto` has no x operand, so I replace it with `rmoveto`.
+
+	References
+	----------
+	[1] The Type 2 Charstring Format - Adobe Technical Note #5177
+		https://adobe-type-tools.github.io/font-tech-notes/pdfs/5177.Type2.pdf
+	"""
+	charString.decompile()
+	program: list[Any] = charString.program
+	hasWidth: bool | None = None
+	indexOperands: int = 0
+	index: int = 0
+	while index < len(program):
+		item: Any = program[index]
+		index += 1
+		if not isinstance(item, str):
+			continue
+
+		indexFirst: int = indexOperands
+		if hasWidth is None:
+			hasWidth = bool((index - 1 - indexOperands) % 2) ^ (item in {'hmoveto', 'vmoveto'})
+			if hasWidth:
+				program[indexOperands] += addend * 2
+				indexFirst += 1
+
+		if item in {'vstem', 'vstemhm'} or (item in {'hintmask', 'cntrmask'} and indexFirst < index - 1):
+			program[indexFirst] += addend
+		elif item in {'hmoveto', 'rmoveto'}:
+			program[indexFirst] += addend
+			break
+		elif item == 'vmoveto':
+			program[index - 1] = 'rmoveto'
+			program.insert(indexFirst, addend)
+			break
+		elif item == 'endchar':
+			break
+
+		if item in {'hintmask', 'cntrmask'}:
+			index += 1
+		indexOperands = index
+
+	if not hasWidth:
+		program.insert(0, charString.private.defaultWidthX + addend * 2 - charString.private.nominalWidthX)
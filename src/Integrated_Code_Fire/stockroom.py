@@ -0,0 +1,373 @@
+"""Store and retrieve assembly-line artifacts in a content-addressed build cache.
+
+(AI generated docstring)
+
+You can use this module to skip assembly-line work whose inputs have not changed since an earlier run. Each stage computes a key
+with `storekeeperMakesKey` from the contents of the stage inputs, such as source files, `.gids` and `.unicodes` data,
+`fontTools.subset.Options` [1], relevant `PackageSettings` fields, and the versions of the tools that make the artifact. When
+`storekeeperRetrievesArtifact` finds an artifact for the key, the stage copies the artifact instead of recomputing it. After a
+stage makes a new artifact, `storekeeperStoresArtifact` copies the artifact into `settingsPackage.pathCache` and removes the least
+recently used artifacts and records when the build cache exceeds `cacheBytesMaximumDEFAULT`. If the environment variable named by
+`identifierEnvironmentCacheBypass` is set to a non-empty value, the build cache never has an artifact and stores nothing, so
+benchmarks measure the work of every stage.
+
+Contents
+--------
+Variables
+	identifierEnvironmentCacheBypass
+		Name of the environment variable that turns the build cache off.
+
+Functions
+	storekeeperMakesKey
+		Make a content-addressed cache key from a stage identifier and the stage inputs.
+	storekeeperRetrievesArtifact
+		Copy a cached artifact to `pathFilenameWrite` if the build cache has an artifact for `key`.
+	storekeeperRetrievesRecords
+		Read the cached records of a stage for each key that the build cache has.
+	storekeeperStoresArtifact
+		Copy an artifact into the build cache and remove least recently used artifacts and records.
+	storekeeperStoresRecords
+		Write records of a stage into the build cache and remove least recently used artifacts and records.
+
+References
+----------
+[1] fontTools.subset.Options
+	https://fonttools.readthedocs.io/en/latest/subset/index.html
+[2] hashlib - Python Standard Library
+	https://docs.python.org/3/library/hashlib.html
+[3] importlib.metadata - Python Standard Library
+	https://docs.python.org/3/library/importlib.metadata.html
+[4] sqlite3 - Python Standard Library
+	https://docs.python.org/3/library/sqlite3.html
+
+"""
+from collections.abc import Mapping
+from contextlib import closing
+from fontTools import subset
+from functools import cache
+from importlib.metadata import PackageNotFoundError, version
+from Integrated_Code_Fire import cacheBytesMaximumDEFAULT, settingsPackage
+from pathlib import Path, PurePath
+from typing import TYPE_CHECKING
+import dataclasses
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+
+if TYPE_CHECKING:
+	from collections.abc import Iterable
+	from hashlib import _Hash
+
+toolsVersioned: tuple[str, ...] = ('afdko', 'fontmake', 'fonttools', 'glyphsLib', 'Integrated_Code_Fire')
+"""Distribution names whose installed versions are part of every cache key."""
+
+identifierEnvironmentCacheBypass: str = 'INTEGRATED_CODE_FIRE_CACHE_BYPASS'
+"""Name of the environment variable that, when set to a non-empty value, turns the build cache off.
+
+Worker processes inherit the environment variable, so setting the variable in a `ProcessPoolExecutor` initializer turns the build
+cache off in every task of the pool.
+"""
+
+_pathFilenameRecords: Path = settingsPackage.pathCache / 'records.sqlite3'
+"""I use this database for records that are too small and too many to store as one artifact file each."""
+
+_countKeysPerQuery: int = 500
+"""I use this many keys in each query, far below the SQLite limit on the number of parameters of one statement."""
+
+_versionRecords: int = 1
+"""I use this `user_version` of the records database to recognize the layout of the `records` table."""
+
+def storekeeperMakesKey(stage: str, *keyInputs: object, versionStage: int) -> str:
+	"""Make a content-addressed cache key from a stage identifier and the stage inputs.
+
+	(AI generated docstring)
+
+	You can use this function to identify an artifact by everything that determines the artifact. The function hashes `stage`,
+	`versionStage`, the Python version, the installed versions of `toolsVersioned`, and each value in `keyInputs`. A `Path` to a
+	file contributes the digest of the file contents, not the path, so a renamed or re-copied file with the same bytes has the same
+	key. Mappings, sets, sequences, dataclasses, and `fontTools.subset.Options` [1] contribute their contents.
+
+	The version of this package is part of every key, but an unreleased change to the code of a stage does not change that
+	version. Increment `versionStage` in every change that changes the artifact of the stage, so the build cache never returns an
+	artifact that the old code made.
+
+	Parameters
+	----------
+	stage : str
+		Identifier of the assembly-line stage that makes the artifact.
+	*keyInputs : object
+		Every input that determines the artifact.
+	versionStage : int
+		Version of the code of the stage; increment `versionStage` when the artifact of the stage changes.
+
+	Returns
+	-------
+	key : str
+		Hexadecimal SHA-256 digest [2] that identifies the artifact.
+
+	References
+	----------
+	[1] fontTools.subset.Options
+		https://fonttools.readthedocs.io/en/latest/subset/index.html
+	[2] hashlib - Python Standard Library
+		https://docs.python.org/3/library/hashlib.html
+	"""
+	hasher: _Hash = hashlib.sha256()
+	_digestKeyInput(hasher, (stage, versionStage, sys.version_info[0:2], _getToolVersions(), keyInputs))
+	return hasher.hexdigest()
+
+def storekeeperRetrievesArtifact(key: str, pathFilenameWrite: Path) -> bool:
+	"""Copy a cached artifact to `pathFilenameWrite` if the build cache has an artifact for `key`.
+
+	(AI generated docstring)
+
+	You can use this function at the start of a stage to skip the stage when the inputs have not changed. When the build cache has
+	an artifact for `key`, the function marks the artifact as recently used, copies the artifact to `pathFilenameWrite`, and
+	returns `True`. The caller may modify `pathFilenameWrite` without affecting the cached artifact.
+
+	Parameters
+	----------
+	key : str
+		Cache key from `storekeeperMakesKey`.
+	pathFilenameWrite : Path
+		Destination path for the cached artifact.
+
+	Returns
+	-------
+	isRetrieved : bool
+		`True` when the function copied a cached artifact to `pathFilenameWrite`, `False` otherwise.
+	"""
+	if os.environ.get(identifierEnvironmentCacheBypass):
+		return False
+
+	pathFilenameCache: Path = _getPathFilenameCache(key)
+	try:
+		os.utime(pathFilenameCache)
+		pathFilenameWrite.parent.mkdir(parents=True, exist_ok=True)
+		pathFilenameCache.copy(pathFilenameWrite)
+	except FileNotFoundError:
+		return False
+	return True
+
+def storekeeperRetrievesRecords(stage: str, keys: Iterable[bytes]) -> dict[bytes, bytes]:
+	"""Read the cached records of a stage for each key that the build cache has.
+
+	(AI generated docstring)
+
+	You can use this function instead of `storekeeperRetrievesArtifact` when a stage makes many small results, such as one
+	converted outline for each glyph, and storing each result as one artifact file would cost more than making the result. The
+	records of every stage live in one SQLite database [1] in `settingsPackage.pathCache`, and each record belongs to `stage`, so
+	stages cannot read the records of other stages. The function marks each record that it reads as recently used, and records
+	count toward the size limit of the build cache, so `storekeeperStoresArtifact` and `storekeeperStoresRecords` remove the least
+	recently used records as they remove the least recently used artifacts.
+
+	Parameters
+	----------
+	stage : str
+		Identifier of the assembly-line stage that made the records.
+	keys : Iterable[bytes]
+		Keys of the records to read, usually digests of everything that determines each record.
+
+	Returns
+	-------
+	dictionaryRecords : dict[bytes, bytes]
+		Mapping from each key that the build cache has to the record of the key. Keys that the build cache does not have are
+		absent.
+
+	References
+	----------
+	[1] sqlite3 - Python Standard Library
+		https://docs.python.org/3/library/sqlite3.html
+	"""
+	dictionaryRecords: dict[bytes, bytes] = {}
+	if os.environ.get(identifierEnvironmentCacheBypass) or not _pathFilenameRecords.exists():
+		return dictionaryRecords
+
+	listKeys: list[bytes] = list(keys)
+	timeUsed: float = time.time()
+	with closing(_connectRecords()) as connection, connection:
+		for index in range(0, len(listKeys), _countKeysPerQuery):
+			keysQuery: list[bytes] = listKeys[index:index + _countKeysPerQuery]
+			placeholders: str = ', '.join('?' * len(keysQuery))
+			# NOTE The statements interpolate only `?` placeholders; every value is a bound parameter.
+			dictionaryRecords.update(connection.execute(
+				f"SELECT key, value FROM records WHERE stage = ? AND key IN ({placeholders})", (stage, *keysQuery)))  # noqa: S608
+			connection.execute(f"UPDATE records SET used = ? WHERE stage = ? AND key IN ({placeholders})", (timeUsed, stage, *keysQuery))  # noqa: S608
+	return dictionaryRecords
+
+def storekeeperStoresArtifact(key: str, pathFilename: Path, cacheBytesMaximum: int = cacheBytesMaximumDEFAULT) -> Path:
+	"""Copy an artifact into the build cache and remove least recently used artifacts and records.
+
+	(AI generated docstring)
+
+	You can use this function at the end of a stage to make the new artifact available to later runs. The function copies
+	`pathFilename` into `settingsPackage.pathCache` with an atomic rename, so concurrent workers never read a partial artifact.
+	Then, while the total size of the artifacts and the records of the build cache exceeds `cacheBytesMaximum`, the function
+	removes the artifact or the records that were least recently used, except the artifact that the function just stored.
+
+	Parameters
+	----------
+	key : str
+		Cache key from `storekeeperMakesKey`.
+	pathFilename : Path
+		Path to the artifact made by the stage.
+	cacheBytesMaximum : int = cacheBytesMaximumDEFAULT
+		Size limit, in bytes, of the build cache.
+
+	Returns
+	-------
+	pathFilename : Path
+		Path to the artifact, identical to the input `pathFilename`.
+	"""
+	if os.environ.get(identifierEnvironmentCacheBypass):
+		return pathFilename
+
+	pathFilenameCache: Path = _getPathFilenameCache(key)
+	pathFilenameCache.parent.mkdir(parents=True, exist_ok=True)
+	pathFilenameTemporary: Path = pathFilenameCache.with_name(f"{key}.{os.getpid()}.tmp")
+	pathFilename.copy(pathFilenameTemporary)
+	pathFilenameTemporary.replace(pathFilenameCache)
+
+	_evictLeastRecentlyUsed(cacheBytesMaximum, pathFilenameCache)
+	return pathFilename
+
+def storekeeperStoresRecords(stage: str, dictionaryRecords: Mapping[bytes, bytes], cacheBytesMaximum: int = cacheBytesMaximumDEFAULT) -> None:
+	"""Write records of a stage into the build cache and remove least recently used artifacts and records.
+
+	(AI generated docstring)
+
+	You can use this function at the end of a stage to make each new record available to `storekeeperRetrievesRecords` in later
+	tasks and later runs. The function writes every record in one SQLite transaction [1], so concurrent workers never read a
+	partial record, and a worker that writes at the same time as another worker waits for the other worker. Then, while the total
+	size of the artifacts and the records of the build cache exceeds `cacheBytesMaximum`, the function removes the artifact or the
+	records that were least recently used.
+
+	Parameters
+	----------
+	stage : str
+		Identifier of the assembly-line stage that made the records.
+	dictionaryRecords : Mapping[bytes, bytes]
+		Mapping from the key of each record to the record.
+	cacheBytesMaximum : int = cacheBytesMaximumDEFAULT
+		Size limit, in bytes, of the build cache.
+
+	References
+	----------
+	[1] sqlite3 - Python Standard Library
+		https://docs.python.org/3/library/sqlite3.html
+	"""
+	if os.environ.get(identifierEnvironmentCacheBypass) or not dictionaryRecords:
+		return
+
+	timeUsed: float = time.time()
+	with closing(_connectRecords()) as connection, connection:
+		connection.executemany("INSERT OR REPLACE INTO records (stage, key, value, used) VALUES (?, ?, ?, ?)"
+			, ((stage, key, value, timeUsed) for key, value in dictionaryRecords.items()))
+
+	_evictLeastRecentlyUsed(cacheBytesMaximum, None)
+
+def _connectRecords() -> sqlite3.Connection:
+	"""I use this to open the records database in write-ahead-log mode, so readers never wait for a writer, and to replace a database of an earlier layout."""
+	settingsPackage.pathCache.mkdir(parents=True, exist_ok=True)
+	connection: sqlite3.Connection = sqlite3.connect(_pathFilenameRecords, timeout=60)
+	connection.execute("PRAGMA journal_mode = WAL")
+	if connection.execute("PRAGMA user_version").fetchone()[0] != _versionRecords:
+		with connection:
+			connection.execute("DROP TABLE IF EXISTS records")
+			connection.execute("CREATE TABLE records (stage TEXT NOT NULL, key BLOB NOT NULL, value BLOB NOT NULL, used REAL NOT NULL"
+				", PRIMARY KEY (stage, key)) WITHOUT ROWID")
+			connection.execute("CREATE INDEX recordsUsed ON records (used)")
+			connection.execute(f"PRAGMA user_version = {_versionRecords}")
+	return connection
+
+def _digestKeyInput(hasher: _Hash, keyInput: object) -> None:
+	"""I use this recursive subroutine of `storekeeperMakesKey` to feed one key input into `hasher` without ambiguity."""
+	hasher.update(f"<{type(keyInput).__name__}>".encode())
+	match keyInput:
+		case PurePath() if Path(keyInput).is_file():
+			hasher.update(_digestFile(Path(keyInput), *_getStatistics(Path(keyInput))))
+		case bytes() | bytearray() | memoryview():
+			hasher.update(keyInput)
+		case Mapping():
+			for aKey, value in sorted(keyInput.items(), key=lambda item: repr(item[0])):
+				_digestKeyInput(hasher, aKey)
+				_digestKeyInput(hasher, value)
+		case set() | frozenset():
+			for element in sorted(keyInput, key=repr):
+				_digestKeyInput(hasher, element)
+		case list() | tuple():
+			for element in keyInput:
+				_digestKeyInput(hasher, element)
+		case subset.Options():
+			_digestKeyInput(hasher, vars(keyInput))
+		case _ if dataclasses.is_dataclass(keyInput) and not isinstance(keyInput, type):
+			_digestKeyInput(hasher, {field.name: getattr(keyInput, field.name) for field in dataclasses.fields(keyInput)})
+		case _:
+			hasher.update(repr(keyInput).encode())
+	hasher.update(b'</>')
+
+@cache
+def _digestFile(pathFilename: Path, sizeBytes: int, modifiedNanoseconds: int) -> bytes:  # noqa: ARG001
+	"""I use this to hash each file one time per process; `sizeBytes` and `modifiedNanoseconds` invalidate the memo."""
+	with pathFilename.open('rb') as readStream:
+		return hashlib.file_digest(readStream, 'sha256').digest()
+
+def _getStatistics(pathFilename: Path) -> tuple[int, int]:
+	"""I use this to give `_digestFile` the size and modification time of `pathFilename`."""
+	statistics: os.stat_result = pathFilename.stat()
+	return (statistics.st_size, statistics.st_mtime_ns)
+
+@cache
+def _getToolVersions() -> dict[str, str | None]:
+	"""I use this to add the installed version of each distribution in `toolsVersioned` to every cache key."""
+	dictionaryVersions: dict[str, str | None] = {}
+	for distribution in toolsVersioned:
+		try:
+			dictionaryVersions[distribution] = version(distribution)
+		except PackageNotFoundError:
+			dictionaryVersions[distribution] = None
+	return dictionaryVersions
+
+def _getPathFilenameCache(key: str) -> Path:
+	"""I use this to map a cache key to the artifact path inside `settingsPackage.pathCache`."""
+	return settingsPackage.pathCache / key[0:2] / key
+
+def _evictLeastRecentlyUsed(cacheBytesMaximum: int, pathFilenameKeep: Path | None) -> None:
+	"""I use this after `storekeeperStoresArtifact` adds `pathFilenameKeep`, or after `storekeeperStoresRecords` adds records, to keep the build cache within `cacheBytesMaximum`."""
+	listArtifacts: list[tuple[float, int, Path | None]] = []
+	for pathFilename in settingsPackage.pathCache.glob('*/*'):
+		if pathFilename.suffix == '.tmp' or pathFilename == pathFilenameKeep:
+			continue
+		try:
+			statistics: os.stat_result = pathFilename.stat()
+		except FileNotFoundError:
+			continue
+		listArtifacts.append((statistics.st_mtime, statistics.st_size, pathFilename))
+
+	cacheBytes: int = (pathFilenameKeep.stat().st_size if pathFilenameKeep else 0) + sum(sizeBytes for _timeUsed, sizeBytes, _pathFilename in listArtifacts)
+	listGroupsRecords: list[tuple[float, int, Path | None]] = []
+	if _pathFilenameRecords.exists():
+		with closing(_connectRecords()) as connection:
+			# NOTE The pages in use bound the size of the records from above, so I read the records only when the bound exceeds the limit.
+			countPages, countPagesFree, sizePage = (connection.execute(f"PRAGMA {pragma}").fetchone()[0] for pragma in ('page_count', 'freelist_count', 'page_size'))
+			if cacheBytes + (countPages - countPagesFree) * sizePage > cacheBytesMaximum:
+				# NOTE Each call of `storekeeperRetrievesRecords` or `storekeeperStoresRecords` marks its records with one time, so each group holds the records of one call.
+				listGroupsRecords = [(timeUsed, int(sizeBytes), None) for timeUsed, sizeBytes in connection.execute(
+					"SELECT used, total(length(stage) + length(key) + length(value)) FROM records GROUP BY used")]
+	cacheBytes += sum(sizeBytes for _timeUsed, sizeBytes, _pathFilename in listGroupsRecords)
+
+	timeUsedRecordsEvicted: float | None = None
+	for timeUsed, sizeBytes, pathFilename in sorted([*listArtifacts, *listGroupsRecords], key=lambda entry: entry[0]):
+		if cacheBytes <= cacheBytesMaximum:
+			break
+		if pathFilename is None:
+			timeUsedRecordsEvicted = timeUsed
+		else:
+			pathFilename.unlink(missing_ok=True)
+		cacheBytes -= sizeBytes
+
+	if timeUsedRecordsEvicted is not None:
+		with closing(_connectRecords()) as connection, connection:
+			connection.execute("DELETE FROM records WHERE used <= ?", (timeUsedRecordsEvicted,))
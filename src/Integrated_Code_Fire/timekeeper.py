@@ -0,0 +1,664 @@
+"""Measure the speed and memory of assembly-line stages.
+
+(AI generated docstring)
+
+You can use this module to compare implementations of an assembly-line stage on the same input files. Each benchmark runs every
+implementation several times, including the work needed to write the artifact, and reports the median wall-clock time from
+`time.perf_counter` [1]. You can also use this module to measure the peak resident memory of each task in a worker process
+[2][3] and to report the peak memory of a stage.
+
+`timekeeperBenchmarksStages` times each assembly-line stage on fixed inputs at several numbers of workers and writes the results
+to a JSON file, and `timekeeperComparesBenchmarks` compares two results files, for example from two commits. The suite runs
+without network access: the inputs are the fonts in `settingsPackage.pathWarehouse / 'western'`, the subset data in
+`dataCenter`, and stand-ins for the compiled Source Han Mono fonts that the suite generates from the western fonts.
+
+Contents
+--------
+Functions
+	timekeeperBenchmarksMerge
+		Compare `machinistMergesTTFFonts` and `machinistMergesWesternHan` on one western font and one Han font.
+	timekeeperBenchmarksStages
+		Time each assembly-line stage at several numbers of workers and write the results to a JSON file.
+	timekeeperBenchmarksTransform
+		Compare scaling and widening a TrueType font in two passes and in one pass with `machinistTransformsGlyphs`.
+	timekeeperComparesBenchmarks
+		Write the change of each measurement between two results files of `timekeeperBenchmarksStages`.
+	timekeeperGetsMemoryAvailable
+		Get the memory that new processes can use without swapping.
+	timekeeperGetsPeakMemory
+		Get the peak resident memory of the current process.
+	timekeeperReportsCompression
+		Write the compression ratio and time of each compressed font and of all compressed fonts.
+	timekeeperReportsPeakMemory
+		Write a one-line summary of the peak resident memory of the tasks of a stage.
+	timekeeperResetsPeakMemory
+		Reset the peak resident memory of the current process, if the operating system allows it.
+
+References
+----------
+[1] time.perf_counter - Python Standard Library
+	https://docs.python.org/3/library/time.html#time.perf_counter
+[2] proc_pid_status(5) - Linux manual page
+	https://man7.org/linux/man-pages/man5/proc_pid_status.5.html
+[3] resource.getrusage - Python Standard Library
+	https://docs.python.org/3/library/resource.html#resource.getrusage
+
+"""
+from afdko.otf2ttf import otf_to_ttf
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.t2CharStringPen import T2CharStringPen
+from fontTools.pens.transformPen import TransformPen
+from fontTools.ttLib import scaleUpem, TTFont
+from importlib.metadata import version
+from Integrated_Code_Fire import (
+	incrementHARDCODED, LocaleIn, settingsPackage, subsetOptionsDEFAULT, WeightIn, widthHalfSourceHanMonoHARDCODED)
+from Integrated_Code_Fire.archivist import (
+	archivistGetsLocales, archivistGetsSubsetCharacters, archivistGetsWeights, archivistMakesFilenameStem,
+	archivistMakesNameIDMetadata, archivistUpdatesMetadata)
+from Integrated_Code_Fire.logistics import packerMakesAssetsLocale, valetGetsWesternFontPathFilename
+from Integrated_Code_Fire.machineShop import (
+	machinistMergesTTFFonts, machinistMergesWesternHan, machinistModifiesSideBearings, machinistSerializesTTFont,
+	machinistSubsetsCID, machinistTransformsGlyphs)
+from Integrated_Code_Fire.stockroom import identifierEnvironmentCacheBypass
+from io import BytesIO
+from itertools import chain, product as CartesianProduct
+from pathlib import Path
+from statistics import median
+from typing import Any, NamedTuple, TYPE_CHECKING
+import json
+import os
+import pickle
+import platform
+import shutil
+import subprocess
+import sys
+import time
+
+if TYPE_CHECKING:
+	from collections.abc import Callable, Iterable
+	from fontTools.misc.psCharStrings import T2CharString
+	from hunterMakesPy import identifierDotAttribute
+
+fontFamilyCID: str = 'SourceHanMono'
+"""I use this CID font family to find the subset data that the stand-ins serve."""
+
+_pathBenchmark: Path = settingsPackage.pathWarehouse / 'benchmark'
+"""I use this directory for the generated stand-ins, the outputs of the benchmarked stages, and the results files."""
+
+class _Stage(NamedTuple):
+	"""I use this to describe one benchmarked stage: the task function and the arguments of each task.
+
+	If `workersInTask` is `True`, the stage function makes its own process pool, so I run one task in a pool of one worker and
+	pass the number of workers to the task as the last argument.
+	"""
+
+	identifier: str
+	functionTask: Callable[..., int]
+	listArguments: list[tuple[Any, ...]]
+	workersInTask: bool = False
+
+def timekeeperBenchmarksMerge(pathFilenameWestern: Path, pathFilenameHan: Path, repetitions: int = 5) -> dict[str, float]:
+	"""Compare `machinistMergesTTFFonts` and `machinistMergesWesternHan` on one western font and one Han font.
+
+	(AI generated docstring)
+
+	You can use this function to measure the speed of the specialized western and Han merge, `machinistMergesWesternHan` [1],
+	against the generic `fontTools.merge.Merger` merge, `machinistMergesTTFFonts` [2]. Both merges receive the western font
+	serialized by `machinistSerializesTTFont` [3], the same way `goMerge` [4] gives the western font to each worker, and each
+	measurement includes compiling the merged font, because `TTFont.save` is where most of the deferred work happens.
+
+	Parameters
+	----------
+	pathFilenameWestern : Path
+		Path to the western font file.
+	pathFilenameHan : Path
+		Path to the Han font file.
+	repetitions : int = 5
+		Number of times to run each merge.
+
+	Returns
+	-------
+	dictionarySeconds : dict[str, float]
+		Mapping from the name of each merge function to the median number of seconds for one merge.
+
+	References
+	----------
+	[1] Integrated_Code_Fire.machineShop.machinistMergesWesternHan
+		Internal package reference.
+	[2] Integrated_Code_Fire.machineShop.machinistMergesTTFFonts
+		Internal package reference.
+	[3] Integrated_Code_Fire.machineShop.machinistSerializesTTFont
+		Internal package reference.
+	[4] Integrated_Code_Fire.go.goMerge
+		Internal package reference.
+	"""
+	fontWestern: bytes = machinistSerializesTTFont(pathFilenameWestern)
+
+	dictionarySeconds: dict[str, float] = {}
+	merger: Callable[[bytes, Path], TTFont]
+	for merger in (machinistMergesTTFFonts, machinistMergesWesternHan):
+		listSeconds: list[float] = []
+		for _repetition in range(repetitions):
+			timeStart: float = time.perf_counter()
+			ttFont: TTFont = merger(fontWestern, pathFilenameHan)
+			ttFont.save(BytesIO())
+			ttFont.close()
+			listSeconds.append(time.perf_counter() - timeStart)
+		dictionarySeconds[merger.__name__] = median(listSeconds)
+	return dictionarySeconds
+
+def timekeeperBenchmarksStages(workersCounts: Iterable[int] | None = None, pathFilenameResults: Path | None = None) -> Path:
+	"""Time each assembly-line stage at several numbers of workers and write the results to a JSON file.
+
+	(AI generated docstring)
+
+	You can use this function to measure how each stage function scales with the number of worker processes and to record a
+	baseline that `timekeeperComparesBenchmarks` can compare with the results of a later commit. The stages are
+	`machinistSubsetsCID`, `machinistModifiesSideBearings`, `machinistMergesTTFFonts`, `archivistGetsSubsetCharacters`,
+	`archivistUpdatesMetadata`, `packerMakesAssetsLocale`, and `prepareGlyphs`. As in the assembly line, each stage has one
+	task for each configured locale and style, and also for each weight if the stage depends on the weight. Each task
+	includes serializing the artifact of the task. `prepareGlyphs` makes its own process pool, so the function passes the
+	number of workers to `prepareGlyphs` instead.
+
+	For each stage and each number of workers, the function runs the tasks in a new `ProcessPoolExecutor` [1] with the build
+	cache turned off through `identifierEnvironmentCacheBypass` [2]. It records the wall-clock time of the stage, the processor
+	time of all tasks, the largest peak resident memory of one task [3], and the size of the artifacts. The first run makes the
+	stand-ins in `settingsPackage.pathWarehouse / 'benchmark'`, and later runs reuse them.
+
+	Parameters
+	----------
+	workersCounts : Iterable[int] | None = None
+		Numbers of workers, or `None` for 1, 2, 4, and the number of processors available to the process.
+	pathFilenameResults : Path | None = None
+		Path to the results file, or `None` to name the results file after the current commit in
+		`settingsPackage.pathWarehouse / 'benchmark'`.
+
+	Returns
+	-------
+	pathFilenameResults : Path
+		Path to the written results file.
+
+	References
+	----------
+	[1] concurrent.futures.ProcessPoolExecutor - Python Standard Library
+		https://docs.python.org/3/library/concurrent.futures.html#concurrent.futures.ProcessPoolExecutor
+	[2] Integrated_Code_Fire.stockroom.identifierEnvironmentCacheBypass
+		Internal package reference.
+	[3] Integrated_Code_Fire.timekeeper.timekeeperGetsPeakMemory
+		Internal package reference.
+	"""
+	if workersCounts is None:
+		workersCounts = (1, 2, 4, os.process_cpu_count() or 1)
+
+	metadata: dict[str, object] = {
+		'commit': _getCommit(),
+		'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+		'python': platform.python_version(),
+		'platform': platform.platform(),
+		'processors': os.process_cpu_count(),
+		'fonttools': version('fonttools'),
+	}
+	if pathFilenameResults is None:
+		pathFilenameResults = _pathBenchmark / f"results_{metadata['commit'] or time.strftime('%Y%m%dT%H%M%S')}.json"
+
+	listResults: list[dict[str, object]] = []
+	for stage in _makeStages():
+		for workers in sorted(set(workersCounts)):
+			result: dict[str, object] = _measureStage(stage, workers)
+			listResults.append(result)
+			sys.stdout.write(f"{stage.identifier} with {workers} workers: {result['secondsWall']:.2f} seconds.\n")
+
+	pathFilenameResults.parent.mkdir(parents=True, exist_ok=True)
+	pathFilenameResults.write_text(json.dumps({'metadata': metadata, 'results': listResults}, indent=1), encoding='utf-8')
+	return pathFilenameResults
+
+def timekeeperBenchmarksTransform(pathFilename: Path, unitsPerEm: int | None = None, modifyPerSide: int = incrementHARDCODED, repetitions: int = 5) -> dict[str, float]:
+	"""Compare scaling and widening a TrueType font in two passes and in one pass with `machinistTransformsGlyphs`.
+
+	(AI generated docstring)
+
+	You can use this function to measure the speed of the one-pass NumPy transform, `machinistTransformsGlyphs` [1], against
+	`fontTools.ttLib.scaleUpem.scale_upem` [2] followed by `machinistModifiesSideBearings` [3]. Each measurement loads
+	`pathFilename` again and includes compiling the transformed font, because `TTFont.save` also recalculates the bounding boxes.
+	A TrueType Han font before scaling, such as the output of `otf_to_ttf` for a subset Source Han Mono font, is the input that
+	`machinistSubsetsCID` [4] transforms.
+
+	Parameters
+	----------
+	pathFilename : Path
+		Path to a TrueType font file.
+	unitsPerEm : int | None = None
+		New units-per-em value, or `None` for `settingsPackage.unitsPerEm`.
+	modifyPerSide : int = incrementHARDCODED
+		The amount to add to each side bearing.
+	repetitions : int = 5
+		Number of times to run each implementation.
+
+	Returns
+	-------
+	dictionarySeconds : dict[str, float]
+		Mapping from the name of each implementation to the median number of seconds for one font.
+
+	References
+	----------
+	[1] Integrated_Code_Fire.machineShop.machinistTransformsGlyphs
+		Internal package reference.
+	[2] fontTools.ttLib.scaleUpem
+		https://fonttools.readthedocs.io/en/latest/ttLib/scaleUpem.html
+	[3] Integrated_Code_Fire.machineShop.machinistModifiesSideBearings
+		Internal package reference.
+	[4] Integrated_Code_Fire.machineShop.machinistSubsetsCID
+		Internal package reference.
+	"""
+	if unitsPerEm is None:
+		unitsPerEm = settingsPackage.unitsPerEm
+
+	def transformTwoPasses(ttFont: TTFont) -> None:
+		scaleUpem.scale_upem(ttFont, unitsPerEm)
+		machinistModifiesSideBearings(ttFont, modifyPerSide)
+
+	def transformOnePass(ttFont: TTFont) -> None:
+		machinistTransformsGlyphs(ttFont, unitsPerEm, modifyPerSide)
+
+	dictionarySeconds: dict[str, float] = {}
+	for identifier, transform in (('scale_upem + machinistModifiesSideBearings', transformTwoPasses), ('machinistTransformsGlyphs', transformOnePass)):
+		listSeconds: list[float] = []
+		for _repetition in range(repetitions):
+			ttFont = TTFont(pathFilename)
+			timeStart: float = time.perf_counter()
+			transform(ttFont)
+			ttFont.save(BytesIO())
+			listSeconds.append(time.perf_counter() - timeStart)
+			ttFont.close()
+		dictionarySeconds[identifier] = median(listSeconds)
+	return dictionarySeconds
+
+def timekeeperComparesBenchmarks(pathFilenameBaseline: Path, pathFilenameCurrent: Path) -> None:
+	"""Write the change of each measurement between two results files of `timekeeperBenchmarksStages`.
+
+	(AI generated docstring)
+
+	For each stage and number of workers in both results files, the function writes one line with the wall-clock time, the
+	processor time, the peak memory, and the output size of the current results as a ratio of the baseline results. A ratio
+	smaller than 1 means the current results are smaller.
+
+	Parameters
+	----------
+	pathFilenameBaseline : Path
+		Path to the results file to compare with.
+	pathFilenameCurrent : Path
+		Path to the results file to compare.
+	"""
+	def keyResult(result: dict[str, Any]) -> tuple[str, int]:
+		return (result['stage'], result['workers'])
+
+	dictionaryBaseline: dict[tuple[str, int], dict[str, Any]] = {keyResult(result): result
+		for result in json.loads(pathFilenameBaseline.read_text(encoding='utf-8'))['results']}
+	for result in json.loads(pathFilenameCurrent.read_text(encoding='utf-8'))['results']:
+		resultBaseline: dict[str, Any] | None = dictionaryBaseline.get(keyResult(result))
+		if resultBaseline is None:
+			continue
+		listRatios: list[str] = [f"{measurement} {result[measurement] / resultBaseline[measurement]:.2f}x"
+			for measurement in ('secondsWall', 'secondsCPU', 'bytesPeak', 'bytesOutput') if result[measurement] and resultBaseline[measurement]]
+		sys.stdout.write(f"{result['stage']} with {result['workers']} workers: {', '.join(listRatios)}\n")
+
+def timekeeperGetsMemoryAvailable() -> int | None:
+	"""Get the memory that new processes can use without swapping.
+
+	(AI generated docstring)
+
+	You can use this function to choose the memory budget of `dispatcherRunsTaskGraph` [1] on any machine. On Linux, the function
+	reads `MemAvailable` from '/proc/meminfo' [2], which includes the page cache that the kernel can reclaim. On other POSIX
+	systems, the function multiplies the available pages by the page size from `os.sysconf` [3].
+
+	Returns
+	-------
+	bytesAvailable : int | None
+		Available memory in bytes, or `None` if the operating system does not report it.
+
+	References
+	----------
+	[1] Integrated_Code_Fire.dispatch.dispatcherRunsTaskGraph
+		Internal package reference.
+	[2] proc_meminfo(5) - Linux manual page
+		https://man7.org/linux/man-pages/man5/proc_meminfo.5.html
+	[3] os.sysconf - Python Standard Library
+		https://docs.python.org/3/library/os.html#os.sysconf
+	"""
+	try:
+		for line in Path('/proc/meminfo').read_text().splitlines():
+			if line.startswith('MemAvailable:'):
+				return int(line.split()[1]) * 1024
+	except OSError:
+		pass
+
+	try:
+		return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+	except (AttributeError, OSError, ValueError):
+		return None
+
+def timekeeperGetsPeakMemory() -> int | None:
+	"""Get the peak resident memory of the current process.
+
+	(AI generated docstring)
+
+	On Linux, the function reads `VmHWM` from '/proc/self/status' [1], which `timekeeperResetsPeakMemory` can reset, so the value
+	measures one task in a worker process that runs many tasks. On other POSIX systems, the function reads `ru_maxrss` from
+	`resource.getrusage` [2], which is the peak since the process started.
+
+	Returns
+	-------
+	bytesPeak : int | None
+		Peak resident memory in bytes, or `None` if the operating system does not report it.
+
+	References
+	----------
+	[1] proc_pid_status(5) - Linux manual page
+		https://man7.org/linux/man-pages/man5/proc_pid_status.5.html
+	[2] resource.getrusage - Python Standard Library
+		https://docs.python.org/3/library/resource.html#resource.getrusage
+	"""
+	try:
+		for line in Path('/proc/self/status').read_text().splitlines():
+			if line.startswith('VmHWM:'):
+				return int(line.split()[1]) * 1024
+	except OSError:
+		pass
+
+	if sys.platform == 'win32':
+		return None
+
+	import resource  # noqa: PLC0415
+	bytesPeak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	if sys.platform != 'darwin':
+		bytesPeak *= 1024
+	return bytesPeak
+
+def timekeeperReportsCompression(description: str, listCompressions: list[tuple[Path, int, int, float]]) -> None:
+	"""Write the compression ratio and time of each compressed font and of all compressed fonts.
+
+	(AI generated docstring)
+
+	Parameters
+	----------
+	description : str
+		Name of the compressed format.
+	listCompressions : list[tuple[Path, int, int, float]]
+		For each compressed font, the path to the compressed font, the size before compression, the size after compression, and
+		the seconds that the compression took.
+	"""
+	if not listCompressions:
+		return
+	for pathFilename, bytesFont, bytesCompressed, seconds in sorted(listCompressions):
+		sys.stdout.write(f"{pathFilename.name}: {bytesFont / 2**20:.2f} MiB to {bytesCompressed / 2**20:.2f} MiB, {bytesCompressed / bytesFont:.1%}, in {seconds:.2f} seconds.\n")
+	bytesFontTotal: int = sum(bytesFont for _pathFilename, bytesFont, _bytesCompressed, _seconds in listCompressions)
+	bytesCompressedTotal: int = sum(bytesCompressed for _pathFilename, _bytesFont, bytesCompressed, _seconds in listCompressions)
+	secondsTotal: float = sum(seconds for _pathFilename, _bytesFont, _bytesCompressed, seconds in listCompressions)
+	sys.stdout.write(f"{description}: {len(listCompressions)} fonts, {bytesCompressedTotal / bytesFontTotal:.1%} of the original size, {secondsTotal:.2f} seconds of work.\n")
+
+def timekeeperReportsPeakMemory(description: str, listBytesPeak: list[int | None]) -> None:
+	"""Write a one-line summary of the peak resident memory of the tasks of a stage.
+
+	(AI generated docstring)
+
+	Parameters
+	----------
+	description : str
+		Name of the stage.
+	listBytesPeak : list[int | None]
+		Peak resident memory of each task from `timekeeperGetsPeakMemory`.
+	"""
+	listBytes: list[int] = [bytesPeak for bytesPeak in listBytesPeak if bytesPeak is not None]
+	if not listBytes:
+		return
+	sys.stdout.write(f"{description}: peak memory per task {max(listBytes) / 2**20:.0f} MiB maximum, {median(listBytes) / 2**20:.0f} MiB median.\n")
+
+def timekeeperResetsPeakMemory() -> None:
+	"""Reset the peak resident memory of the current process, if the operating system allows it.
+
+	(AI generated docstring)
+
+	On Linux, writing '5' to '/proc/self/clear_refs' [1] resets `VmHWM` to the current resident memory. On other systems, the
+	function does nothing, and `timekeeperGetsPeakMemory` reports the peak since the process started.
+
+	References
+	----------
+	[1] proc(5) - Linux manual page
+		https://man7.org/linux/man-pages/man5/proc.5.html
+	"""
+	with suppress(OSError):
+		Path('/proc/self/clear_refs').write_text('5')
+
+def _getCommit() -> str | None:
+	"""I use this to name a results file after the commit of the working tree, if git can tell me the commit."""
+	pathFilenameGit: str | None = shutil.which('git')
+	if pathFilenameGit is None:
+		return None
+	try:
+		return subprocess.run([pathFilenameGit, 'rev-parse', '--short', 'HEAD'], capture_output=True, check=True, cwd=settingsPackage.pathRoot, text=True).stdout.strip() or None
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+def _getSecondsCPU() -> float:
+	"""I use this to count the processor time of the current process and of its finished child processes."""
+	secondsCPU: float = time.process_time()
+	if sys.platform != 'win32':
+		import resource  # noqa: PLC0415
+		usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+		secondsCPU += usage.ru_utime + usage.ru_stime
+	return secondsCPU
+
+def _initializeWorker() -> None:
+	"""I use this `ProcessPoolExecutor` initializer to turn the build cache off in every benchmark task."""
+	os.environ[identifierEnvironmentCacheBypass] = '1'
+
+def _makeStages() -> list[_Stage]:
+	"""I use this to make the stand-ins that are missing and to describe the tasks of every benchmarked stage.
+
+	(AI generated docstring)
+
+	The stand-ins in `_pathBenchmark` are the stand-in CID font from `_makeStandInCID`, the subset of the stand-in for each
+	locale and style in CFF and TrueType outlines, copies of the western fonts named like the output of `fontmake`, and the
+	merged font for each locale, style, and weight.
+	"""
+	dictionaryLocales: dict[str, LocaleIn] = archivistGetsLocales()
+	dictionaryWeights: dict[str, WeightIn] = archivistGetsWeights()
+	dictionaryPathFilenamesWestern: dict[str, Path] = valetGetsWesternFontPathFilename('ttf')
+	subsetCharacters: dict[identifierDotAttribute, dict[str, tuple[range, ...]]] = archivistGetsSubsetCharacters(fontFamilyCID, settingsPackage.theLocales, settingsPackage.theStyles)
+
+	pathFilenameCID: Path = _pathBenchmark / f"{fontFamilyCID}.otf"
+	if not pathFilenameCID.exists():
+		_makeStandInCID(next(iter(dictionaryPathFilenamesWestern.values()))
+			, max(characters['gids'][-1][-1] for characters in subsetCharacters.values()) + 1
+			, sorted({unicode for characters in subsetCharacters.values() for unicode in chain.from_iterable(characters['unicodes'])})
+			, pathFilenameCID)
+
+	pathCID: Path = _pathBenchmark / 'CID'
+	pathCID.mkdir(parents=True, exist_ok=True)
+	listArgumentsSubset: list[tuple[Any, ...]] = []
+	listArgumentsSideBearings: list[tuple[Any, ...]] = []
+	listArgumentsSubsetCharacters: list[tuple[Any, ...]] = []
+	dictionaryPathFilenamesHan: dict[tuple[str, str | None], Path] = {}
+	for locale, style in CartesianProduct(sorted(settingsPackage.theLocales), sorted(settingsPackage.theStyles, key=str)):
+		lookupIDs: identifierDotAttribute = archivistMakesFilenameStem(fontFamilyCID, dictionaryLocales[locale].ascii, style)
+		listArgumentsSubset.append((pathFilenameCID, subsetCharacters[lookupIDs]['gids'], subsetCharacters[lookupIDs]['unicodes']))
+		listArgumentsSubsetCharacters.append((locale, style))
+
+		pathFilenameSubset: Path = pathCID / f"{lookupIDs}.otf"
+		pathFilenameHan: Path = pathCID / f"{lookupIDs}.ttf"
+		if not pathFilenameHan.exists():
+			ttFont: TTFont = machinistSubsetsCID(pathFilenameCID, chain.from_iterable(subsetCharacters[lookupIDs]['gids'])
+				, chain.from_iterable(subsetCharacters[lookupIDs]['unicodes']), subsetOptionsDEFAULT)
+			ttFont.save(pathFilenameSubset)
+			otf_to_ttf(ttFont)
+			ttFont.save(pathFilenameHan)
+			ttFont.close()
+		listArgumentsSideBearings.append((pathFilenameSubset,))
+		dictionaryPathFilenamesHan[(locale, style)] = pathFilenameHan
+
+	pathFiraCode: Path = _pathBenchmark / 'FiraCode'
+	pathFiraCode.mkdir(parents=True, exist_ok=True)
+	listPathFilenamesFiraCode: list[Path] = []
+	for pathFilenameWestern in dictionaryPathFilenamesWestern.values():
+		pathFilenameFiraCode: Path = pathFiraCode / f"{pathFiraCode.name}-{pathFilenameWestern.name}"
+		if not pathFilenameFiraCode.exists():
+			shutil.copyfile(pathFilenameWestern, pathFilenameFiraCode)
+		listPathFilenamesFiraCode.append(pathFilenameFiraCode)
+
+	pathMerged: Path = _pathBenchmark / 'merged'
+	pathMerged.mkdir(parents=True, exist_ok=True)
+	listArgumentsMerge: list[tuple[Any, ...]] = []
+	listArgumentsMetadata: list[tuple[Any, ...]] = []
+	listPathFilenamesMerged: list[Path] = []
+	for locale, style, weight in CartesianProduct(sorted(settingsPackage.theLocales), sorted(settingsPackage.theStyles, key=str), sorted(settingsPackage.theWeights)):
+		localeIn: LocaleIn = dictionaryLocales[locale]
+		weightIn: WeightIn = dictionaryWeights[weight]
+		fontFamily: str = archivistMakesFilenameStem(settingsPackage.fontFamily, localeIn.IntegratedCode火, separator=' ')
+		nameIDmetadata: dict[int, str] = archivistMakesNameIDMetadata(weightIn.IntegratedCode火, fontFamily.replace(' ', ''), fontFamily)
+		pathFilenameWestern: Path = dictionaryPathFilenamesWestern[weightIn.fontFamilyWestern]
+		pathFilenameMerged: Path = pathMerged / f"{archivistMakesFilenameStem(settingsPackage.fontFamily.replace(' ', ''), localeIn.IntegratedCode火, style, weightIn.IntegratedCode火, '')}.ttf"
+		if not pathFilenameMerged.exists():
+			ttFont = machinistMergesWesternHan(pathFilenameWestern, dictionaryPathFilenamesHan[(locale, style)])
+			archivistUpdatesMetadata(ttFont, nameIDmetadata)
+			ttFont.save(pathFilenameMerged)
+			ttFont.close()
+		listArgumentsMerge.append((pathFilenameWestern, dictionaryPathFilenamesHan[(locale, style)]))
+		listArgumentsMetadata.append((pathFilenameMerged, nameIDmetadata))
+		listPathFilenamesMerged.append(pathFilenameMerged)
+
+	listArgumentsAssets: list[tuple[Any, ...]] = [(listPathFilenamesMerged
+		, _pathBenchmark / 'assets' / f"{settingsPackage.fontFamilyASCII.replace(' ', '')}_{dictionaryLocales[locale].ascii}.zip"
+		, dictionaryLocales[locale]) for locale in sorted(settingsPackage.theLocales)]
+
+	return [
+		_Stage('machinistSubsetsCID', _taskSubsetsCID, listArgumentsSubset),
+		_Stage('machinistModifiesSideBearings', _taskModifiesSideBearings, listArgumentsSideBearings),
+		_Stage('machinistMergesTTFFonts', _taskMergesTTFFonts, listArgumentsMerge),
+		_Stage('archivistGetsSubsetCharacters', _taskGetsSubsetCharacters, listArgumentsSubsetCharacters),
+		_Stage('archivistUpdatesMetadata', _taskUpdatesMetadata, listArgumentsMetadata),
+		_Stage('packerMakesAssetsLocale', _taskMakesAssetsLocale, listArgumentsAssets),
+		_Stage('prepareGlyphs', _taskPrepareGlyphs, [(listPathFilenamesFiraCode, _pathBenchmark / 'western')], workersInTask=True),
+	]
+
+def _makeStandInCID(pathFilenameWestern: Path, glyphsTotal: int, unicodes: list[int], pathFilenameWrite: Path) -> Path:
+	"""I use this to make a CFF font that stands in for a compiled Source Han Mono font.
+
+	(AI generated docstring)
+
+	The stand-in has `glyphsTotal` glyphs, named like the glyphs of a CID-keyed font, at 1000 units per em. The glyphs draw the
+	outlines of the western font in a cycle, so the stand-in has realistic charstrings. The first cycle of glyphs is half width
+	and the other glyphs are full width, so `machinistModifiesSideBearings` takes both branches. The cmap maps each code point
+	in `unicodes`, in order, to the next glyph. The stand-in has no layout tables.
+	"""
+	fontWestern = TTFont(pathFilenameWestern)
+	glyphSetWestern = fontWestern.getGlyphSet()
+	glyphOrderWestern: list[str] = fontWestern.getGlyphOrder()
+	scale: float = 1000 / fontWestern['head'].unitsPerEm
+
+	glyphOrder: list[str] = ['.notdef', *(f"cid{glyphID:05d}" for glyphID in range(1, glyphsTotal))]
+	charStrings: dict[str, T2CharString] = {}
+	metrics: dict[str, tuple[int, int]] = {}
+	cacheCharStrings: dict[tuple[str, int], T2CharString] = {}
+	for glyphID, glyphName in enumerate(glyphOrder):
+		glyphNameWestern: str = glyphOrderWestern[glyphID % len(glyphOrderWestern)]
+		width: int = widthHalfSourceHanMonoHARDCODED if glyphID < len(glyphOrderWestern) else 1000
+		if (glyphNameWestern, width) not in cacheCharStrings:
+			pen = T2CharStringPen(width, glyphSetWestern)
+			glyphSetWestern[glyphNameWestern].draw(TransformPen(pen, (scale, 0, 0, scale, 0, 0)))
+			cacheCharStrings[(glyphNameWestern, width)] = pen.getCharString()
+		charStrings[glyphName] = cacheCharStrings[(glyphNameWestern, width)]
+		metrics[glyphName] = (width, round(fontWestern['hmtx'][glyphNameWestern][1] * scale))
+	fontWestern.close()
+
+	fontBuilder = FontBuilder(1000, isTTF=False)
+	fontBuilder.setupGlyphOrder(glyphOrder)
+	fontBuilder.setupCharacterMap({unicode: glyphOrder[1 + index % (glyphsTotal - 1)] for index, unicode in enumerate(unicodes)})
+	fontBuilder.setupCFF(f"{fontFamilyCID}-StandIn", {'FullName': f"{fontFamilyCID} Stand-In"}, charStrings, {})
+	fontBuilder.setupHorizontalMetrics(metrics)
+	fontBuilder.setupHorizontalHeader(ascent=880, descent=-120)
+	fontBuilder.setupNameTable({'familyName': f"{fontFamilyCID} Stand-In", 'styleName': 'Regular'})
+	fontBuilder.setupOS2(sTypoAscender=880, sTypoDescender=-120, usWinAscent=880, usWinDescent=120)
+	fontBuilder.setupPost()
+
+	pathFilenameWrite.parent.mkdir(parents=True, exist_ok=True)
+	fontBuilder.save(pathFilenameWrite)
+	return pathFilenameWrite
+
+def _measureStage(stage: _Stage, workers: int) -> dict[str, object]:
+	"""I use this to run every task of `stage` in a new process pool and to combine the measurements of the tasks."""
+	listMeasurements: list[tuple[int, float, int | None]] = []
+	timeStart: float = time.perf_counter()
+	with ProcessPoolExecutor(1 if stage.workersInTask else workers, initializer=_initializeWorker) as concurrencyManager:
+		listClaimTickets = [concurrencyManager.submit(_measureTask, stage.functionTask, *arguments, *((workers,) if stage.workersInTask else ()))
+			for arguments in stage.listArguments]
+		listMeasurements = [claimTicket.result() for claimTicket in listClaimTickets]
+	secondsWall: float = time.perf_counter() - timeStart
+
+	listBytesPeak: list[int] = [bytesPeak for _bytesOutput, _secondsCPU, bytesPeak in listMeasurements if bytesPeak is not None]
+	return {
+		'stage': stage.identifier,
+		'workers': workers,
+		'tasks': len(listMeasurements),
+		'secondsWall': secondsWall,
+		'secondsCPU': sum(secondsCPU for _bytesOutput, secondsCPU, _bytesPeak in listMeasurements),
+		'bytesPeak': max(listBytesPeak, default=None),
+		'bytesOutput': sum(bytesOutput for bytesOutput, _secondsCPU, _bytesPeak in listMeasurements),
+	}
+
+def _measureTask(functionTask: Callable[..., int], *arguments: Any) -> tuple[int, float, int | None]:
+	"""I use this worker to run one benchmark task and to measure the output size, the processor time, and the peak memory."""
+	timekeeperResetsPeakMemory()
+	secondsCPUStart: float = _getSecondsCPU()
+	bytesOutput: int = functionTask(*arguments)
+	return bytesOutput, _getSecondsCPU() - secondsCPUStart, timekeeperGetsPeakMemory()
+
+def _serializeFont(ttFont: TTFont) -> int:
+	"""I use this to compile a font the way the assembly line saves it and to return the size of the compiled font."""
+	bytesIO = BytesIO()
+	ttFont.save(bytesIO)
+	ttFont.close()
+	return bytesIO.tell()
+
+def _taskGetsSubsetCharacters(locale: str, style: str | None) -> int:
+	"""I use this task to benchmark `archivistGetsSubsetCharacters` for one locale and style."""
+	return len(pickle.dumps(archivistGetsSubsetCharacters(fontFamilyCID, [locale], [style])))
+
+def _taskMakesAssetsLocale(listPathFilenames: list[Path], pathFilenameZIP: Path, localeIn: LocaleIn) -> int:
+	"""I use this task to benchmark `packerMakesAssetsLocale` for one locale."""
+	pathFilenameZIP.parent.mkdir(parents=True, exist_ok=True)
+	return sum(pathFilename.stat().st_size for pathFilename in packerMakesAssetsLocale(listPathFilenames, pathFilenameZIP, localeIn))
+
+def _taskMergesTTFFonts(pathFilenameWestern: Path, pathFilenameHan: Path) -> int:
+	"""I use this task to benchmark `machinistMergesTTFFonts` for one western font and one Han font."""
+	return _serializeFont(machinistMergesTTFFonts(pathFilenameWestern, pathFilenameHan))
+
+def _taskModifiesSideBearings(pathFilename: Path) -> int:
+	"""I use this task to benchmark `machinistModifiesSideBearings` for one subset CID font."""
+	ttFont = TTFont(pathFilename)
+	machinistModifiesSideBearings(ttFont, incrementHARDCODED)
+	return _serializeFont(ttFont)
+
+def _taskPrepareGlyphs(listPathFilenamesTTFont: list[Path], pathWrite: Path, workers: int) -> int:
+	"""I use this task to benchmark `prepareGlyphs` for every western font with `workers` workers."""
+	from Integrated_Code_Fire.chopShop import prepareGlyphs  # noqa: PLC0415
+	return sum(pathFilename.stat().st_size for pathFilename in prepareGlyphs(listPathFilenamesTTFont, CPUlimit=workers, pathWrite=pathWrite))
+
+def _taskSubsetsCID(pathFilenameCID: Path, gids: tuple[range, ...], unicodes: tuple[range, ...]) -> int:
+	"""I use this task to benchmark `machinistSubsetsCID` for one locale and style."""
+	return _serializeFont(machinistSubsetsCID(pathFilenameCID, chain.from_iterable(gids), chain.from_iterable(unicodes), subsetOptionsDEFAULT))
+
+def _taskUpdatesMetadata(pathFilename: Path, nameIDmetadata: dict[int, str]) -> int:
+	"""I use this task to benchmark `archivistUpdatesMetadata` for one merged font."""
+	ttFont = TTFont(pathFilename)
+	archivistUpdatesMetadata(ttFont, nameIDmetadata)
+	return _serializeFont(ttFont)
+
+if __name__ == '__main__':
+	pathFilenameBaseline: Path | None = None
+
+	pathFilenameResults: Path = timekeeperBenchmarksStages()
+	sys.stdout.write(f"Results written to {pathFilenameResults}\n")
+	if pathFilenameBaseline is not None:
+		timekeeperComparesBenchmarks(pathFilenameBaseline, pathFilenameResults)